@@ -0,0 +1,224 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from history import HistoryStore, KIND_CODES, MODE_CODES, local_day_hour
+
+
+ROLLUP_VERSION = 1
+
+HEAT_CHARS = " .:-=+*#%@"
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def load_events(conn, start=None, end=None, user=None):
+    conditions = []
+    params = []
+    if start is not None:
+        conditions.append("ts >= ?")
+        params.append(int(start))
+    if end is not None:
+        conditions.append("ts < ?")
+        params.append(int(end))
+    if user is not None:
+        conditions.append("user = ?")
+        params.append(user)
+    sql = "SELECT ts, user, mode, kind, seconds FROM events"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    rows = conn.execute(sql, params).fetchall()
+    table = np.array(rows, dtype=np.int64).reshape(-1, 5)
+    return {name: table[:, i] for i, name in enumerate(("ts", "user", "mode", "kind", "seconds"))}
+
+
+def local_offsets(ts):
+    # UTC offsets only change on the hour, so look up each distinct hour once.
+    hours, inverse = np.unique(ts // 3600, return_inverse=True)
+    offsets = np.array([time.localtime(int(hour) * 3600).tm_gmtoff for hour in hours], dtype=np.int64)
+    return offsets[inverse.reshape(-1)]
+
+
+def rebuild_rollups(conn):
+    events = load_events(conn)
+    ts, user, mode, kind, seconds = (events[name] for name in ("ts", "user", "mode", "kind", "seconds"))
+    local = ts + local_offsets(ts)
+    day = local // 86400
+
+    work = mode == MODE_CODES["work"]
+    started = work & (kind == KIND_CODES["start"])
+    finished = work & (kind == KIND_CODES["finish"])
+    breaks = ~work & (kind == KIND_CODES["finish"])
+    counted = started | finished | breaks
+
+    keys, inverse = np.unique(user[counted] * (1 << 32) + day[counted], return_inverse=True)
+    inverse = inverse.reshape(-1)
+    daily = np.column_stack((
+        keys >> 32,
+        keys & 0xFFFFFFFF,
+        np.bincount(inverse, weights=np.where(finished, seconds, 0)[counted]),
+        np.bincount(inverse, weights=started[counted]),
+        np.bincount(inverse, weights=finished[counted]),
+        np.bincount(inverse, weights=breaks[counted]),
+    )).astype(np.int64)
+
+    began = local[finished] - seconds[finished]
+    slots = user[finished] * 168 + (began // 86400 + 3) % 7 * 24 + began % 86400 // 3600
+    slot_keys, slot_inverse = np.unique(slots, return_inverse=True)
+    focus = np.bincount(slot_inverse.reshape(-1), weights=seconds[finished]).astype(np.int64)
+    hourly = np.column_stack((slot_keys // 168, slot_keys % 168 // 24, slot_keys % 24, focus))
+
+    with conn:
+        conn.execute("DELETE FROM daily_rollup")
+        conn.execute("DELETE FROM hourly_rollup")
+        conn.executemany("INSERT INTO daily_rollup VALUES (?, ?, ?, ?, ?, ?)", daily.tolist())
+        conn.executemany("INSERT INTO hourly_rollup VALUES (?, ?, ?, ?)", hourly.tolist())
+        conn.execute(f"PRAGMA user_version = {ROLLUP_VERSION}")
+    return len(ts)
+
+
+def streaks(active_days, today):
+    if not len(active_days):
+        return 0, 0
+    breaks = np.flatnonzero(np.diff(active_days) != 1)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [len(active_days) - 1]))
+    lengths = ends - starts + 1
+    current = int(lengths[-1]) if active_days[-1] >= today - 1 else 0
+    return current, int(lengths.max())
+
+
+class Analytics:
+    def __init__(self, path=None):
+        self.store = HistoryStore(path)
+        self.conn = self.store.conn
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < ROLLUP_VERSION:
+            rebuild_rollups(self.conn)
+
+    def close(self):
+        self.store.close()
+
+    def users(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT user FROM daily_rollup ORDER BY user")]
+
+    def daily(self, user=0, first_day=None, last_day=None):
+        sql = ("SELECT day, focus_seconds, work_started, work_finished, breaks_finished "
+               "FROM daily_rollup WHERE user = ?")
+        params = [user]
+        if first_day is not None:
+            sql += " AND day >= ?"
+            params.append(int(first_day))
+        if last_day is not None:
+            sql += " AND day <= ?"
+            params.append(int(last_day))
+        table = np.array(self.conn.execute(sql, params).fetchall(), dtype=np.int64).reshape(-1, 5)
+        names = ("day", "focus_seconds", "work_started", "work_finished", "breaks_finished")
+        return {name: table[:, i] for i, name in enumerate(names)}
+
+    def heatmap(self, user=0):
+        grid = np.zeros((7, 24), dtype=np.int64)
+        rows = self.conn.execute(
+            "SELECT weekday, hour, focus_seconds FROM hourly_rollup WHERE user = ?", (user,)).fetchall()
+        if rows:
+            table = np.array(rows, dtype=np.int64)
+            grid[table[:, 0], table[:, 1]] = table[:, 2]
+        return grid
+
+    def summary(self, user=0, days=28, now=None):
+        today = local_day_hour(int(time.time() if now is None else now))[0]
+        first_day = today - days + 1
+        rollup = self.daily(user)
+
+        window = (rollup["day"] >= first_day) & (rollup["day"] <= today)
+        index = rollup["day"][window] - first_day
+        focus = np.zeros(days, dtype=np.int64)
+        focus[index] = rollup["focus_seconds"][window]
+        finished = np.zeros(days, dtype=np.int64)
+        finished[index] = rollup["work_finished"][window]
+        started = rollup["work_started"][window].sum()
+
+        week_of = (np.arange(first_day, today + 1) + 3) // 7
+        weeks, week_index = np.unique(week_of, return_inverse=True)
+        weekly = np.bincount(week_index.reshape(-1), weights=focus).astype(np.int64)
+
+        current, longest = streaks(rollup["day"][rollup["work_finished"] > 0], today)
+        return {
+            "user": user,
+            "first_day": first_day,
+            "today": today,
+            "daily_focus": focus,
+            "daily_finished": finished,
+            "week_starts": weeks * 7 - 3,
+            "weekly_focus": weekly,
+            "completion_ratio": float(finished.sum() / started) if started else 0.0,
+            "current_streak": current,
+            "longest_streak": longest,
+            "heatmap": self.heatmap(user),
+        }
+
+
+def format_duration(seconds):
+    minutes = int(seconds) // 60
+    return f"{minutes // 60}h{minutes % 60:02d}m"
+
+
+def format_day(day):
+    return time.strftime("%a %Y-%m-%d", time.gmtime(int(day) * 86400))
+
+
+def render_report(summary, daily_rows=14):
+    lines = [f"Pomodora report for user {summary['user']}"]
+    lines.append(f"  completion ratio  {summary['completion_ratio'] * 100:5.1f}%")
+    lines.append(f"  current streak    {summary['current_streak']} day(s)")
+    lines.append(f"  longest streak    {summary['longest_streak']} day(s)")
+
+    lines.append("")
+    lines.append("Daily focus")
+    focus = summary["daily_focus"]
+    for offset in range(max(0, len(focus) - daily_rows), len(focus)):
+        day = summary["first_day"] + offset
+        lines.append(f"  {format_day(day)}  {format_duration(focus[offset]):>7}  "
+                     f"{summary['daily_finished'][offset]:3d} sessions")
+
+    lines.append("")
+    lines.append("Weekly focus")
+    for start, total in zip(summary["week_starts"], summary["weekly_focus"]):
+        lines.append(f"  week of {format_day(start)}  {format_duration(total):>7}")
+
+    lines.append("")
+    lines.append("Focus by hour of day")
+    heat = summary["heatmap"]
+    peak = heat.max()
+    lines.append("       " + "".join(f"{hour:<3d}" for hour in range(0, 24, 3)))
+    for weekday, row in enumerate(heat):
+        levels = (row * (len(HEAT_CHARS) - 1) // peak) if peak else row
+        lines.append(f"  {WEEKDAYS[weekday]}  " + "".join(HEAT_CHARS[level] for level in levels))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Productivity analytics from the Pomodora history.")
+    parser.add_argument("--db", default=None, help="history database path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report = subparsers.add_parser("report", help="print focus totals, streaks and a heatmap")
+    report.add_argument("--user", type=int, default=0)
+    report.add_argument("--days", type=int, default=28)
+    subparsers.add_parser("rebuild", help="recompute the rollup tables from the raw history")
+    args = parser.parse_args(argv)
+
+    analytics = Analytics(args.db)
+    try:
+        if args.command == "rebuild":
+            started = time.perf_counter()
+            count = rebuild_rollups(analytics.conn)
+            print(f"rebuilt rollups from {count} events in {time.perf_counter() - started:.2f} s")
+        else:
+            print(render_report(analytics.summary(args.user, args.days)))
+    finally:
+        analytics.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from checkpoint import RECORD, Checkpointer, read_checkpoint
+from engine import MODES, TimerEngine
+
+
+DEADLINE_TOLERANCE = 0.05
+
+
+def child(path, log_path, seed):
+    # Drive random transitions and log each state only once its checkpoint
+    # write has returned, so the log holds exactly the committed states.
+    rng = random.Random(seed)
+    engine = TimerEngine()
+    checkpoint = Checkpointer(path)
+    log = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+
+    def logged(event, engine):
+        remaining = engine.countdown.time_remaining()
+        os.write(log, (json.dumps({
+            "seq": checkpoint.seq,
+            "mode": engine.current_mode,
+            "running": engine.is_running,
+            "remaining": remaining,
+            "deadline": time.time() + remaining if engine.is_running else 0.0,
+        }) + "\n").encode())
+
+    engine.add_listener(checkpoint.on_engine_event)
+    engine.add_listener(logged)
+    actions = (engine.start, engine.pause, engine.reset,
+               lambda: engine.change_mode(rng.choice(MODES)))
+    while True:
+        rng.choice(actions)()
+        time.sleep(rng.random() * 0.002)
+
+
+def committed(log_path):
+    with open(log_path) as f:
+        lines = f.read().split("\n")
+    # The final element is empty unless the kill landed mid-line.
+    return [json.loads(line) for line in lines[:-1]]
+
+
+def matches(state, entry):
+    if state["mode"] != entry["mode"] or state["running"] != entry["running"]:
+        return False
+    if state["running"]:
+        return abs(state["deadline"] - entry["deadline"]) <= DEADLINE_TOLERANCE
+    return state["remaining"] == entry["remaining"]
+
+
+def check(path, log_path):
+    entries = committed(log_path)
+    state = read_checkpoint(path)
+    if not entries:
+        # Killed before the first write returned: nothing, or that write.
+        return state is None or state["seq"] == 1, "before first write"
+    last = entries[-1]
+    if state is None:
+        return False, f"no checkpoint after {len(entries)} committed writes"
+    if state["seq"] == last["seq"] + 1:
+        return True, "in-flight write landed"
+    if state["seq"] != last["seq"]:
+        return False, f"restored seq {state['seq']}, last committed {last['seq']}"
+    if not matches(state, last):
+        return False, f"restored {state} does not match committed {last}"
+
+    engine = TimerEngine()
+    Checkpointer(path).restore(engine)
+    if engine.current_mode != last["mode"] or engine.is_running != last["running"]:
+        return False, "engine restored into a different state"
+
+    # A torn write hits the newest slot; the other slot must still hold the
+    # previous committed state.
+    if len(entries) >= 2:
+        torn = path + ".torn"
+        shutil.copyfile(path, torn)
+        offset = (state["seq"] % 2) * RECORD.size + random.randrange(RECORD.size)
+        with open(torn, "r+b") as f:
+            f.seek(offset)
+            byte = f.read(1)
+            f.seek(offset)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        fallback = read_checkpoint(torn)
+        if fallback is None or fallback["seq"] != entries[-2]["seq"] or not matches(fallback, entries[-2]):
+            return False, f"torn newest slot fell back to {fallback}"
+    return True, "restored last committed state"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kill a checkpointing process at random points and "
+                                                 "check that the restored state is consistent.")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--max-lifetime", type=float, default=0.3,
+                        help="longest time a child runs before it is killed, in seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--child", nargs=3, metavar=("PATH", "LOG", "SEED"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], args.child[1], int(args.child[2]))
+        return 0
+
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="pomodora-ckpt-")
+    failures = 0
+    outcomes = {}
+    writes = 0
+    for run in range(args.runs):
+        path = os.path.join(workdir, f"{run}.ckpt")
+        log_path = os.path.join(workdir, f"{run}.log")
+        proc = subprocess.Popen([sys.executable, "-m", "benchmarks.checkpoint_faults",
+                                 "--child", path, log_path, str(rng.randrange(1 << 30))])
+        # Interpreter start-up takes a while; wait for the first write so the
+        # kill lands somewhere in the transition loop most of the time.
+        started = time.perf_counter()
+        while not os.path.exists(log_path) and time.perf_counter() - started < 5:
+            time.sleep(0.001)
+        time.sleep(rng.random() * args.max_lifetime)
+        proc.send_signal(signal.SIGKILL)
+        proc.wait()
+
+        ok, outcome = check(path, log_path) if os.path.exists(log_path) else (True, "before first write")
+        if os.path.exists(log_path):
+            writes += len(committed(log_path))
+        outcomes[outcome if ok else "FAILED"] = outcomes.get(outcome if ok else "FAILED", 0) + 1
+        if not ok:
+            failures += 1
+            print(f"run {run}: {outcome}")
+
+    shutil.rmtree(workdir)
+    print(f"{args.runs} kills, {writes} committed checkpoint writes")
+    for outcome, count in sorted(outcomes.items()):
+        print(f"  {outcome:<32} {count}")
+    print("consistent" if not failures else f"{failures} inconsistent restore(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from config import ConfigStore, DEFAULTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure settings load time and write coalescing.")
+    parser.add_argument("--loads", type=int, default=2000)
+    parser.add_argument("--changes", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="pomodora-bench-"), "settings.json")
+    with open(path, "w") as f:
+        json.dump(DEFAULTS, f)
+
+    timings = []
+    for _ in range(args.loads):
+        started = time.perf_counter()
+        ConfigStore(path).load()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"load: median {statistics.median(timings) * 1e6:.1f} us, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.1f} us")
+
+    store = ConfigStore(path, delay=args.delay)
+    store.load()
+    update_timings = []
+    for i in range(args.changes):
+        started = time.perf_counter()
+        store.update(theme="light" if i % 2 else "dark")
+        update_timings.append(time.perf_counter() - started)
+    time.sleep(args.delay * 3)
+    print(f"{args.changes} rapid theme changes: {store.writes} write(s) after the debounce, "
+          f"update() median {statistics.median(update_timings) * 1e6:.1f} us on the caller")
+    store.flush()
+    with open(path) as f:
+        print(f"stored theme: {json.load(f)['theme']}")
+
+
+if __name__ == "__main__":
+    main()
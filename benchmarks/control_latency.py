@@ -0,0 +1,69 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.sandbox import use_sandbox
+import control
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return (timings[len(timings) // 2] * 1000, timings[int(len(timings) * 0.99)] * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-trip latency of the single-instance control socket.")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--cli-runs", type=int, default=20)
+    args = parser.parse_args()
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    use_sandbox(env)
+    # This process talks to the instance it starts, not to a real one.
+    os.environ.update(env)
+    path = control.default_socket_path()
+
+    app = subprocess.Popen([sys.executable, "pomodora.py"], cwd=ROOT, env=env,
+                           stderr=subprocess.DEVNULL)
+    try:
+        if control.show_running_instance(attempts=200) is None:
+            print("instance did not come up")
+            return 1
+
+        for op in ("status", "toggle"):
+            timings = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                control.request({"op": op}, path)
+                timings.append(time.perf_counter() - started)
+            p50, p99 = percentiles(timings)
+            print(f"{op:<7} in-process round trip: p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+
+        timings = []
+        for _ in range(args.cli_runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "control.py", "status"], cwd=ROOT, env=env,
+                           stdout=subprocess.DEVNULL, check=True)
+            timings.append(time.perf_counter() - started)
+        p50, p99 = percentiles(timings)
+        print(f"control.py status as a new process: p50 {p50:.1f} ms, p99 {p99:.1f} ms "
+              f"(mostly interpreter start-up)")
+
+        started = time.perf_counter()
+        second = subprocess.run([sys.executable, "pomodora.py"], cwd=ROOT, env=env,
+                                stderr=subprocess.DEVNULL)
+        print(f"second launch exited with {second.returncode} after "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms")
+    finally:
+        app.terminate()
+        app.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
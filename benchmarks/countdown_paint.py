@@ -0,0 +1,112 @@
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QObject, Qt
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget
+
+from countdown_widget import CountdownDisplay
+from themes import stylesheet
+
+
+class PaintMeter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.paints = 0
+        self.pixels = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.paints += 1
+            self.pixels += sum(rect.width() * rect.height() for rect in event.region().rects())
+        return False
+
+
+def host(display):
+    window = QWidget()
+    window.setStyleSheet(stylesheet("dark"))
+    window.setFixedSize(320, 140)
+    layout = QVBoxLayout(window)
+    display.setFont(QFont("Arial", 48, QFont.Bold))
+    layout.addWidget(display)
+    window.show()
+    return window
+
+
+def run(app, display, set_time, seconds):
+    window = host(display)
+    meter = PaintMeter()
+    display.installEventFilter(meter)
+    app.processEvents()
+    meter.paints = meter.pixels = 0
+    timings = []
+    for second in range(seconds, 0, -1):
+        started = time.perf_counter()
+        set_time(second)
+        app.processEvents()
+        timings.append(time.perf_counter() - started)
+    window.close()
+    return timings, meter
+
+
+def report(name, timings, meter):
+    timings.sort()
+    print(f"{name:<26} median {statistics.median(timings) * 1e6:7.1f} us  "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:7.1f} us  "
+          f"{meter.pixels / len(timings):7.0f} px repainted per second")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-second update and paint cost of the countdown "
+                                                 "widget against the old QLabel.")
+    parser.add_argument("--seconds", type=int, default=1500)
+    args = parser.parse_args()
+    app = QApplication([])
+
+    label = QLabel()
+    label.setAlignment(Qt.AlignCenter)
+
+    def label_time(second):
+        minutes, second = divmod(second, 60)
+        label.setText(f"{minutes:02d}:{second:02d}")
+
+    report("QLabel.setText", *run(app, label, label_time, args.seconds))
+
+    display = CountdownDisplay()
+    report("CountdownDisplay", *run(app, display, display.set_time, args.seconds))
+
+    ring = CountdownDisplay()
+    ring.set_ring(True)
+    ring.set_progress(args.seconds, args.seconds, False)
+
+    def ring_time(second):
+        ring.set_time(second)
+        ring.set_progress(second, args.seconds, False)
+
+    report("CountdownDisplay + ring", *run(app, ring, ring_time, args.seconds))
+
+    frames = CountdownDisplay()
+    frames.set_ring(True)
+    window = host(frames)
+    frames.set_progress(args.seconds, args.seconds, False)
+    app.processEvents()
+    timings = []
+    for _ in range(args.seconds):
+        started = time.perf_counter()
+        frames.update_ring()
+        app.processEvents()
+        timings.append(time.perf_counter() - started)
+    frames.set_progress(args.seconds, args.seconds, True)
+    interval = frames.animation.interval()
+    window.close()
+    timings.sort()
+    print(f"{'ring animation frame':<26} median {statistics.median(timings) * 1e6:7.1f} us  "
+          f"(one every {interval} ms for a {args.seconds} s session)")
+
+
+if __name__ == "__main__":
+    main()
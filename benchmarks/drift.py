@@ -0,0 +1,104 @@
+import argparse
+import math
+import random
+
+from countdown import VirtualClock
+from engine import TimerEngine
+
+
+CYCLE = (("work", 25 * 60), ("short_break", 5 * 60))
+
+
+class StallModel:
+    def __init__(self, seed, jitter_ms, stall_rate, stall_max, suspend):
+        self.random = random.Random(seed)
+        self.jitter = jitter_ms / 1000.0
+        self.stall_rate = stall_rate
+        self.stall_max = stall_max
+        self.suspend = suspend
+        self.suspend_at = None
+
+    def latency(self, now):
+        delay = self.random.uniform(0, self.jitter)
+        if self.random.random() < self.stall_rate:
+            delay += self.random.uniform(0.05, self.stall_max)
+        if self.suspend and self.suspend_at is not None and now >= self.suspend_at:
+            delay += self.suspend
+            self.suspend_at = None
+        return delay
+
+
+def run_legacy(sessions, stalls):
+    # One repeating 1000 ms QTimer that decrements time_left per firing.
+    # A late firing is delivered once and the interval restarts from it,
+    # so every stall is lost time, exactly as QTimer behaves.
+    clock = 0.0
+    ends = []
+    for _, duration in sessions:
+        time_left = duration
+        scheduled = clock + 1.0
+        while True:
+            clock = scheduled + stalls.latency(scheduled)
+            scheduled += 1.0
+            if scheduled < clock:
+                scheduled = clock + 1.0
+            if time_left > 0:
+                time_left -= 1
+            else:
+                break
+        ends.append(clock)
+    return ends
+
+
+def run_deadline(sessions, stalls):
+    clock = VirtualClock()
+    engine = TimerEngine(clock=clock, work_time=CYCLE[0][1], short_break_time=CYCLE[1][1],
+                         auto_start_break=True, auto_start_work=True)
+    ends = []
+    engine.add_listener(lambda event, _: event == "finish" and ends.append(clock()))
+    engine.start()
+    while len(ends) < len(sessions):
+        scheduled = clock() + math.ceil(engine.countdown.next_tick_delay() * 1000) / 1000.0
+        clock.advance_to(scheduled + stalls.latency(scheduled))
+        engine.tick()
+    return ends[:len(sessions)]
+
+
+def summarize(name, sessions, ends):
+    ideal = 0.0
+    worst = 0.0
+    for (_, duration), end in zip(sessions, ends):
+        ideal += duration
+        worst = max(worst, end - ideal)
+    final = ends[-1] - ideal
+    print(f"{name:>9}: cumulative error {final:9.3f} s  "
+          f"({final / len(sessions) * 1000:8.2f} ms/session, worst {worst:.3f} s)")
+    return final
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate countdown drift over long work/break chains.")
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=4.0)
+    parser.add_argument("--stall-rate", type=float, default=0.01)
+    parser.add_argument("--stall-max", type=float, default=2.5)
+    parser.add_argument("--suspend", type=float, default=0.0,
+                        help="seconds of one simulated suspend halfway through")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    sessions = list(CYCLE) * args.cycles
+    total = sum(duration for _, duration in sessions)
+    print(f"{len(sessions)} sessions, {total / 3600:.1f} h simulated, "
+          f"jitter {args.jitter_ms} ms, stall rate {args.stall_rate}, max stall {args.stall_max} s")
+
+    results = {}
+    for name, run in (("per-tick", run_legacy), ("deadline", run_deadline)):
+        stalls = StallModel(args.seed, args.jitter_ms, args.stall_rate, args.stall_max, args.suspend)
+        stalls.suspend_at = total / 2
+        results[name] = summarize(name, sessions, run(sessions, stalls))
+    return results
+
+
+if __name__ == "__main__":
+    main()
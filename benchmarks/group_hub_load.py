@@ -0,0 +1,163 @@
+import argparse
+import asyncio
+import random
+import resource
+import sys
+import time
+
+from countdown import monotonic
+from engine import TimerEngine
+from group_hub import LISTEN_BACKLOG, GroupClient, GroupHub, apply_command, encode, snapshot
+
+
+class Relay:
+    # Stand-in for the network between members and the hub: forwards each
+    # connection to the hub, holding every chunk back by a fixed delay.
+    def __init__(self, target_port, delay):
+        self.target_port = target_port
+        self.delay = delay
+        self.active = 0
+
+    async def pipe(self, reader, writer):
+        queue = asyncio.Queue()
+
+        async def deliver():
+            while True:
+                due, data = await queue.get()
+                if data is None:
+                    writer.close()
+                    return
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                writer.write(data)
+
+        task = asyncio.ensure_future(deliver())
+        try:
+            while True:
+                data = await reader.read(65536)
+                await queue.put((time.perf_counter() + self.delay, data or None))
+                if not data:
+                    break
+        except ConnectionError:
+            await queue.put((0, None))
+        await task
+
+    async def handle(self, reader, writer):
+        try:
+            hub_reader, hub_writer = await asyncio.open_connection("127.0.0.1", self.target_port)
+        except OSError:
+            writer.close()
+            return
+        self.active += 1
+        try:
+            await asyncio.gather(self.pipe(reader, hub_writer), self.pipe(hub_reader, writer))
+        finally:
+            self.active -= 1
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def run(args):
+    engine = TimerEngine()
+    hub = GroupHub()
+    hub.publish(snapshot(engine))
+    engine.add_listener(lambda event, engine: hub.publish(snapshot(engine)))
+    hub_server = await asyncio.start_server(hub.handle_member, "127.0.0.1", 0, backlog=LISTEN_BACKLOG)
+    hub_port = hub_server.sockets[0].getsockname()[1]
+    port = hub_port
+    relay = None
+    if args.relay_delay:
+        relay = Relay(hub_port, args.relay_delay / 1000)
+        relay_server = await asyncio.start_server(relay.handle, "127.0.0.1", 0, backlog=LISTEN_BACKLOG)
+        port = relay_server.sockets[0].getsockname()[1]
+
+    received = {}
+    clients = []
+    tasks = []
+    joins = []
+    rng = random.Random(1)
+
+    def follower(client):
+        def on_state(state):
+            received.setdefault(state["v"], []).append(time.perf_counter())
+        return on_state
+
+    async def join(skew):
+        # Each member's clock is off by its own skew, as on separate machines.
+        client = GroupClient(clock=lambda: monotonic() + skew)
+        client.on_state = follower(client)
+        started = time.perf_counter()
+        tasks.append(asyncio.ensure_future(client.run("127.0.0.1", port)))
+        while client.joined is None:
+            await asyncio.sleep(0.001)
+        await client.joined
+        joins.append(time.perf_counter() - started)
+        clients.append((client, skew))
+
+    for first in range(0, args.clients, args.batch):
+        batch = range(first, min(args.clients, first + args.batch))
+        await asyncio.gather(*(join(rng.uniform(-args.skew, args.skew)) for _ in batch))
+    print(f"{len(clients)} members joined through a relay adding {args.relay_delay:g} ms each way: "
+          f"join latency p50 {percentile(joins, 0.5) * 1000:.1f} ms, "
+          f"p99 {percentile(joins, 0.99) * 1000:.1f} ms (batches of {args.batch})")
+
+    errors = [abs(client.offset + skew) for client, skew in clients]
+    print(f"clock offset error: p50 {percentile(errors, 0.5) * 1000:.3f} ms, "
+          f"max {max(errors) * 1000:.3f} ms for skews up to {args.skew:g} s")
+
+    fan_out = []
+    publish = []
+    sizes = []
+    for i in range(args.rounds):
+        before = hub.state
+        started = time.perf_counter()
+        apply_command(engine, "toggle")
+        publish.append(time.perf_counter() - started)
+        version = hub.version
+        delta = {key: value for key, value in hub.state.items() if before.get(key) != value}
+        sizes.append(len(encode(dict(delta, t="d", v=version))))
+        while len(received.get(version, ())) < len(clients):
+            await asyncio.sleep(0.001)
+        fan_out.append(max(received[version]) - started)
+    print(f"broadcast to all members: p50 {percentile(fan_out, 0.5) * 1000:.1f} ms, "
+          f"p99 {percentile(fan_out, 0.99) * 1000:.1f} ms over {args.rounds} transitions")
+    print(f"  of which the hub's own publish (encode once, write to every member): "
+          f"p50 {percentile(publish, 0.5) * 1000:.2f} ms")
+    print(f"message size: up to {max(sizes)} B per delta, {len(hub.full_message())} B for a full state")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # Let the hub and relay notice the hang-ups before the loop goes away.
+    while hub.members or (relay is not None and relay.active):
+        await asyncio.sleep(0.01)
+    hub_server.close()
+    await hub_server.wait_closed()
+    if relay is not None:
+        relay_server.close()
+        await relay_server.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Join latency and fan-out time for the group hub.")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=200, help="members joining at the same time")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--relay-delay", type=float, default=1.0, help="one-way delay in ms, 0 to connect directly")
+    parser.add_argument("--skew", type=float, default=120.0, help="largest member clock skew in seconds")
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = 4 * args.clients + 64
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
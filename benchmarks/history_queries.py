@@ -0,0 +1,101 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from history import HistoryStore, HistoryWriter, KIND_CODES, MODE_CODES
+
+
+DAY = 86400
+
+
+def generate(store, rows, users, start, rng, chunk=200000):
+    # Events arrive in time order, as they do from real use: start, pause,
+    # start, finish for alternating work and break sessions.
+    span = rows // (users * 30) * DAY
+    step = span / rows
+    kinds = (KIND_CODES["start"], KIND_CODES["pause"], KIND_CODES["start"], KIND_CODES["finish"])
+    modes = (MODE_CODES["work"], MODE_CODES["short_break"], MODE_CODES["work"], MODE_CODES["long_break"])
+    batch = []
+    for i in range(rows):
+        batch.append((
+            start + int(i * step) + rng.randrange(60),
+            rng.randrange(users),
+            modes[(i // 4) % 4],
+            kinds[i % 4],
+            rng.choice((300, 900, 1500)),
+        ))
+        if len(batch) >= chunk:
+            store.insert_many(batch)
+            batch = []
+    if batch:
+        store.insert_many(batch)
+    return span
+
+
+def timed_queries(store, count, span, start, length, rng, **filters):
+    timings = []
+    rows = 0
+    for _ in range(count):
+        begin = start + rng.randrange(max(1, span - length))
+        started = time.perf_counter()
+        rows += len(store.query(begin, begin + length, **filters))
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings, rows / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark date-range queries on the session history store.")
+    parser.add_argument("--rows", type=int, default=3000000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    parser.add_argument("--db", default=None, help="reuse or create this database instead of a temporary one")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix="pomodora-bench-"), "history.db")
+    store = HistoryStore(path)
+    start = 1577836800
+    if store.count() < args.rows:
+        started = time.perf_counter()
+        span = generate(store, args.rows - store.count(), args.users, start, rng)
+        print(f"generated {args.rows:,} rows in {time.perf_counter() - started:.1f} s "
+              f"({os.path.getsize(path) / args.rows:.1f} bytes/row on disk)")
+    else:
+        span = args.rows // (args.users * 30) * DAY
+    print(f"{store.count():,} rows over {span / DAY / 365:.1f} years, {args.users} users")
+
+    failed = False
+    cases = (
+        ("1 day", DAY, {}),
+        ("1 day, one user", DAY, {"user": 3}),
+        ("7 days, work only", 7 * DAY, {"mode": "work"}),
+        ("7 days, one user", 7 * DAY, {"user": 3}),
+    )
+    for name, length, filters in cases:
+        timings, rows = timed_queries(store, args.queries, span, start, length, rng, **filters)
+        p50 = timings[len(timings) // 2] * 1000
+        p99 = timings[int(len(timings) * 0.99)] * 1000
+        status = "ok" if p99 < args.budget_ms else "OVER BUDGET"
+        failed = failed or p99 >= args.budget_ms
+        print(f"{name:>20}: {rows:8.0f} rows  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  {status}")
+
+    writer = HistoryWriter(path)
+    writer.start()
+    started = time.perf_counter()
+    for i in range(10000):
+        writer.record("start", "work", 1500)
+    enqueue = (time.perf_counter() - started) / 10000
+    writer.close()
+    print(f"HistoryWriter.record: {enqueue * 1e6:.2f} us per event on the calling thread")
+    store.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from engine import TimerEngine
+from hooks import Hook, HookPool, shell_runner, webhook_runner
+
+
+class StallingHandler(BaseHTTPRequestHandler):
+    # A webhook endpoint that answers far later than the hook's timeout.
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.stall)
+        try:
+            self.send_response(204)
+            self.end_headers()
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the engine through rapid sessions while hooks are "
+                                                 "slow, hung, failing or timing out.")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--session", type=float, default=0.2, help="work length in seconds")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StallingHandler)
+    server.daemon_threads = True
+    server.stall = 3.0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    delivered = []
+    never = threading.Event()
+
+    def flaky(payload):
+        if rng.random() < 0.5:
+            raise RuntimeError("flaky hook failed")
+
+    hooks = [
+        Hook("fast", lambda payload, timeout: delivered.append(payload), events=("start", "finish")),
+        Hook("slow", lambda payload, timeout: time.sleep(2.0), events=("finish",), timeout=5.0),
+        Hook("hung", lambda payload, timeout: never.wait(), events=("finish",), timeout=0.5),
+        Hook("flaky", lambda payload, timeout: flaky(payload), events=("finish",), retries=3),
+        Hook("shell", shell_runner("sleep 30"), events=("finish",), timeout=0.3),
+        Hook("webhook", webhook_runner(f"http://127.0.0.1:{server.server_address[1]}/hook"),
+             events=("finish",), timeout=0.5),
+    ]
+    pool = HookPool(hooks, workers=args.workers)
+    pool.start()
+
+    engine = TimerEngine(work_time=args.session, short_break_time=args.session / 2,
+                         auto_start_break=True, auto_start_work=True)
+    dispatch = []
+
+    def timed_dispatch(event, engine):
+        started = time.perf_counter()
+        pool.on_engine_event(event, engine)
+        dispatch.append(time.perf_counter() - started)
+
+    engine.add_listener(timed_dispatch)
+
+    # Stands in for the GUI thread: sleep to each deadline, then tick.
+    lateness = []
+    threads = 0
+    finished = 0
+    engine.start()
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        deadline = engine.deadline
+        time.sleep(max(0.0, deadline - time.monotonic()))
+        started = time.perf_counter()
+        finished += engine.tick()
+        lateness.append(time.monotonic() - deadline)
+        threads = max(threads, threading.active_count())
+    starts = finished + 1
+
+    print(f"{finished} sessions in {args.seconds:g} s on {args.workers} workers, {len(dispatch)} events dispatched")
+    print(f"dispatch on the ticking thread: p50 {percentile(dispatch, 0.5) * 1e6:.1f} us, "
+          f"p99 {percentile(dispatch, 0.99) * 1e6:.1f} us, max {max(dispatch) * 1e6:.1f} us")
+    print(f"tick lateness: p50 {percentile(lateness, 0.5) * 1000:.2f} ms, "
+          f"p99 {percentile(lateness, 0.99) * 1000:.2f} ms, max {max(lateness) * 1000:.2f} ms")
+    print(f"threads at most: {threads}")
+    # Let the fast hook catch up before counting what it received.
+    time.sleep(0.2)
+    print(f"fast hook received {len(delivered)} of {starts + finished} start/finish events")
+    print(f"{'hook':>8} " + " ".join(f"{name:>8}" for name in ("ok", "failed", "timeouts", "retried",
+                                                               "dropped", "stuck")))
+    for name, counts in pool.stats().items():
+        print(f"{name:>8} " + " ".join(f"{value:>8}" for value in counts.values()))
+
+    started = time.perf_counter()
+    pool.close()
+    print(f"close: {(time.perf_counter() - started) * 1000:.0f} ms")
+    never.set()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
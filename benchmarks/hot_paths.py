@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.sandbox import use_sandbox
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+use_sandbox()
+
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QApplication, QLabel
+
+from pomodora import PomodoroTimer, SettingsDialog
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# A case is flagged when its median is this many times its baseline.
+DEFAULT_THRESHOLD = 1.5
+
+# Calls per part of each calibration.
+CALIBRATION_REPEAT = 300
+
+FIRST_PAINT = re.compile(r"first paint\s+([\d.]+)")
+
+
+def measure(func, repeat, setup=None):
+    timings = []
+    # The first tenth warms caches and is not counted.
+    for i in range(-(repeat // 10), repeat):
+        if setup is not None:
+            setup(i)
+        started = time.perf_counter()
+        func(i)
+        if i >= 0:
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "median_us": round(statistics.median(timings) * 1e6, 2),
+        "p95_us": round(timings[int(len(timings) * 0.95)] * 1e6, 2),
+    }
+
+
+def calibrate(repeat=CALIBRATION_REPEAT):
+    # A fixed set of small calls like the ones the cases make: interpreter
+    # work, a label update and a paint. Cases are compared as multiples of
+    # it, so baselines recorded on one machine still hold on a faster or
+    # slower one. Each part takes the best of a few medians, as the cheap
+    # calls here are the ones most easily disturbed by other processes.
+    label = QLabel("0")
+    label.show()
+    image = QImage(32, 32, QImage.Format_ARGB32_Premultiplied)
+
+    def interpreter(i):
+        value = 0
+        for n in range(30):
+            value = (value * 31 + n) & 0xFFFF
+
+    def paint(i):
+        painter = QPainter(image)
+        painter.fillRect(0, 0, 32, 32, QColor(i & 255, 0, 0))
+        painter.end()
+
+    parts = (interpreter, lambda i: label.setText(str(i)), paint)
+    unit = sum(min(measure(part, repeat)["median_us"] for _ in range(5)) for part in parts)
+    label.close()
+    return unit
+
+
+def cold_start(runs):
+    # First paint of a fresh process, as reported by --startup-timing.
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "pomodora.py", "--startup-timing"],
+                                cwd=ROOT, capture_output=True, text=True)
+        match = FIRST_PAINT.search(result.stdout)
+        if match is None:
+            raise RuntimeError(f"no first paint reported:\n{result.stdout}{result.stderr}")
+        timings.append(float(match.group(1)) * 1000)
+    timings.sort()
+    return {
+        "median_us": round(statistics.median(timings), 2),
+        "p95_us": round(timings[-1], 2),
+    }
+
+
+def run_cases(app, repeat, cold_runs):
+    window = PomodoroTimer()
+    window.show()
+    # Time the layout swap itself rather than the start of a resize animation.
+    window.zen_resize_ms = 0
+    app.processEvents()
+    modes = ("work", "short_break", "long_break")
+    themes = ("dark", "light")
+    results = {}
+    units = []
+
+    def timed(func, repeat, setup=None):
+        # The unit is measured on both sides of each case, so a machine
+        # that speeds up or slows down during the run moves it along.
+        before = calibrate()
+        result = measure(func, repeat, setup)
+        unit = (before + calibrate()) / 2
+        units.append(unit)
+        result["relative"] = round(result["median_us"] / unit, 3)
+        return result
+
+    window.engine.start()
+    results["update_display"] = timed(lambda i: window.update_display(), repeat)
+    results["update_timer"] = timed(lambda i: window.update_timer(), repeat)
+    window.engine.pause()
+
+    results["change_mode"] = timed(lambda i: window.change_mode(modes[i % 3]), repeat)
+    results["reset_timer"] = timed(lambda i: window.reset_timer(), repeat)
+    results["toggle_timer"] = timed(lambda i: window.toggle_timer(), repeat)
+    if window.engine.is_running:
+        window.toggle_timer()
+
+    def set_theme(i):
+        window.theme = themes[i % 2]
+
+    results["apply_theme"] = timed(lambda i: (window.apply_theme(), app.processEvents()),
+                                   repeat // 10 or 1, setup=set_theme)
+
+    def zen_round_trip(i):
+        for _ in range(2):
+            window.zen_btn.setChecked(not window.zen_btn.isChecked())
+            window.toggle_zen_mode()
+            app.processEvents()
+
+    results["toggle_zen_mode"] = timed(zen_round_trip, repeat // 10 or 1)
+
+    def settings_dialog(i):
+        dialog = SettingsDialog(window)
+        dialog.deleteLater()
+
+    results["settings_dialog"] = timed(settings_dialog, repeat // 10 or 1)
+    window.close()
+
+    unit = statistics.mean(units)
+    if cold_runs:
+        result = results["cold_start_first_paint"] = cold_start(cold_runs)
+        result["relative"] = round(result["median_us"] / unit, 3)
+    return results, unit
+
+
+def load_baselines(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"threshold": DEFAULT_THRESHOLD, "cases": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the timer widget's hot paths offscreen "
+                                                 "and compare them with stored baselines.")
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--cold-runs", type=int, default=5, help="fresh processes for cold start, 0 to skip")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baselines instead of comparing")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    results, calibration = run_cases(app, args.repeat, args.cold_runs)
+    baselines = load_baselines(args.baseline)
+
+    if args.update_baseline:
+        thresholds = {name: case["threshold"] for name, case in baselines["cases"].items()
+                      if "threshold" in case}
+        baselines["calibration_us"] = round(calibration, 2)
+        baselines["cases"] = {name: dict(result, **({"threshold": thresholds[name]}
+                                                    if name in thresholds else {}))
+                              for name, result in results.items()}
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baselines written to {args.baseline}")
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+    regressions = 0
+    print(f"calibration unit: {calibration:.1f}us here, "
+          f"{baselines.get('calibration_us', 0):.1f}us when the baselines were recorded")
+    print(f"{'case':<24} {'median':>11} {'p95':>11} {'units':>9} {'baseline':>9} {'ratio':>7}")
+    for name, result in results.items():
+        baseline = baselines["cases"].get(name)
+        line = (f"{name:<24} {result['median_us']:9.1f}us {result['p95_us']:9.1f}us "
+                f"{result['relative']:9.2f}")
+        if baseline is None or "relative" not in baseline:
+            print(line + f" {'-':>9} {'-':>7}")
+            continue
+        ratio = result["relative"] / baseline["relative"]
+        threshold = baseline.get("threshold", baselines.get("threshold", DEFAULT_THRESHOLD))
+        flag = "  REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(line + f" {baseline['relative']:9.2f} {ratio:6.2f}x{flag}")
+
+    if regressions and not args.update_baseline:
+        print(f"\n{regressions} case(s) slower than their baseline threshold")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
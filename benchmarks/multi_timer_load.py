@@ -0,0 +1,104 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from multi_timer import MultiTimerPanel
+
+
+def fill(panel, count, rng):
+    # Short sessions with auto-start, so timers keep expiring during the run.
+    for i in range(count):
+        work = rng.randint(2, 30)
+        panel.model.add(f"task {i}", work_time=work, short_break_time=rng.randint(2, 10),
+                        auto_start_break=True, auto_start_work=True)
+    panel.command("start", rows=range(count))
+
+
+def run_for(app, seconds):
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    started = time.process_time()
+    app.exec_()
+    return (time.process_time() - started) / seconds
+
+
+def shared_tick(app, count, seconds, visible, rng):
+    panel = MultiTimerPanel()
+    if visible:
+        panel.show()
+    fill(panel, count, rng)
+    counts = {"ticks": 0, "rows": 0, "finished": 0}
+    tick = panel.tick
+    refresh = panel.model.refresh
+
+    def counting_tick():
+        counts["ticks"] += 1
+        tick()
+
+    def counting_refresh(first, last):
+        changed = refresh(first, last)
+        counts["rows"] += changed
+        return changed
+
+    panel.timer.timeout.disconnect()
+    panel.timer.timeout.connect(counting_tick)
+    panel.model.refresh = counting_refresh
+    panel.model.finished.connect(lambda name, mode: counts.__setitem__("finished", counts["finished"] + 1))
+    app.processEvents()
+    cpu = run_for(app, seconds)
+    panel.close()
+    panel.deleteLater()
+    return cpu, {name: value / seconds for name, value in counts.items()}
+
+
+def timer_per_row(app, count, seconds, rng):
+    # The alternative: one QTimer per countdown, each repainting its own row
+    # every second whether or not it is on screen.
+    panel = MultiTimerPanel()
+    panel.show()
+    fill(panel, count, rng)
+    panel.timer.timeout.disconnect()
+    timers = []
+    for row in range(count):
+        timer = QTimer()
+        timer.timeout.connect(lambda row=row: panel.model.times_changed(row, row))
+        timer.start(1000)
+        timers.append(timer)
+    app.processEvents()
+    cpu = run_for(app, seconds)
+    for timer in timers:
+        timer.stop()
+    panel.close()
+    panel.deleteLater()
+    return cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU per second of the task timer panel as the timer count grows.")
+    parser.add_argument("--counts", default="10,100,1000,5000")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    app = QApplication(sys.argv[:1])
+    rng = random.Random(args.seed)
+
+    print("CPU time per second of wall time, and per-second counts for the visible panel")
+    print(f"{'timers':>7} {'visible':>16} {'hidden':>16} {'ticks/s':>8} {'rows/s':>7} "
+          f"{'expired/s':>9} {'QTimer per row':>16}")
+    for count in (int(value) for value in args.counts.split(",")):
+        visible, counts = shared_tick(app, count, args.seconds, True, rng)
+        hidden, _ = shared_tick(app, count, args.seconds, False, rng)
+        naive = timer_per_row(app, count, args.seconds, rng)
+        print(f"{count:>7} {visible * 1000:>9.1f} ms CPU {hidden * 1000:>9.1f} ms CPU "
+              f"{counts['ticks']:>8.1f} {counts['rows']:>7.1f} {counts['finished']:>9.1f} "
+              f"{naive * 1000:>9.1f} ms CPU")
+
+
+if __name__ == "__main__":
+    main()
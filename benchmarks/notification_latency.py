@@ -0,0 +1,84 @@
+import argparse
+import os
+import platform
+import statistics
+import sys
+import time
+
+from benchmarks.sandbox import use_sandbox
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+use_sandbox()
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from pomodora import PomodoroTimer
+
+
+LEGACY_COMMAND = "paplay /usr/share/sounds/freedesktop/stereo/complete.oga 2>/dev/null &"
+
+
+def wait_for(app, predicate, timeout):
+    deadline = time.perf_counter() + timeout
+    while not predicate() and time.perf_counter() < deadline:
+        app.processEvents()
+    return predicate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure timer_finished to audible notification latency.")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--sound", default="chime")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    window = PomodoroTimer()
+    window.sound = args.sound
+    window.show()
+    wait_for(app, lambda: window.player is not None, 5.0)
+    if window.tray_icon is None:
+        window.setup_tray()
+
+    player = window.player
+    effect = player.preload(args.sound) if player.available else None
+    if effect is not None:
+        wait_for(app, lambda: effect.status() in (effect.Ready, effect.Error), 5.0)
+    audible = effect is not None and effect.status() == effect.Ready
+    print(f"QtMultimedia available: {player.available}, sound ready: {audible}")
+
+    blocking = []
+    to_audible = []
+    for _ in range(args.runs):
+        if effect is not None:
+            effect.stop()
+            app.processEvents()
+        started = time.perf_counter()
+        window.timer_finished()
+        blocking.append(time.perf_counter() - started)
+        if audible and wait_for(app, effect.isPlaying, 1.0):
+            to_audible.append(time.perf_counter() - started)
+        QTimer.singleShot(0, lambda: None)
+        app.processEvents()
+
+    print(f"timer_finished on the GUI thread: median {statistics.median(blocking) * 1000:.3f} ms, "
+          f"max {max(blocking) * 1000:.3f} ms")
+    if to_audible:
+        print(f"timer_finished to playing state: median {statistics.median(to_audible) * 1000:.3f} ms, "
+              f"max {max(to_audible) * 1000:.3f} ms")
+    else:
+        print("no audio output here; notifications fell back to QApplication.beep()")
+
+    if platform.system() == "Linux":
+        legacy = []
+        for _ in range(min(args.runs, 10)):
+            started = time.perf_counter()
+            os.system(LEGACY_COMMAND)
+            legacy.append(time.perf_counter() - started)
+        print(f"previous os.system('paplay ... &') call alone: median "
+              f"{statistics.median(legacy) * 1000:.3f} ms, max {max(legacy) * 1000:.3f} ms")
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import itertools
+import statistics
+import time
+
+from countdown import VirtualClock
+from engine import TimerEngine
+from planner import MANUAL_GAP, schedule, summarize
+
+
+def step_day(work, short_break, long_break, auto_start_break, auto_start_work, auto_break_type,
+             hours, manual_gap=MANUAL_GAP):
+    # The reference: drive a real engine through the day on a virtual clock,
+    # starting by hand (after manual_gap) whatever it does not auto-start.
+    clock = VirtualClock()
+    engine = TimerEngine(clock=clock, work_time=work, short_break_time=short_break,
+                         long_break_time=long_break, auto_start_break=auto_start_break,
+                         auto_start_work=auto_start_work, auto_break_type=auto_break_type)
+    finished = {"work": 0, "break": 0}
+
+    def count(event, engine):
+        if event == "finish":
+            finished["work" if engine.current_mode == "work" else "break"] += 1
+
+    engine.add_listener(count)
+    end = hours * 3600
+    engine.start()
+    while True:
+        # Run to the end of the chain, or to the end of the day.
+        while engine.is_running and engine.deadline <= end:
+            clock.advance_to(engine.deadline)
+            engine.tick()
+        if engine.is_running or clock() + manual_gap >= end:
+            break
+        clock.advance(manual_gap)
+        if engine.current_mode == "work":
+            engine.change_mode("long_break" if auto_break_type == "long" else "short_break")
+        else:
+            engine.change_mode("work")
+        engine.start()
+    return finished["work"], finished["break"]
+
+
+def timed(function, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Planner cost against stepping the engine, and a "
+                                                 "cross-check of their session counts.")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    checked = 0
+    for work, short_break, long_break, auto_break, auto_work, break_type, hours in itertools.product(
+            (1, 25, 50, 120), (1, 5, 30), (15, 60), (False, True), (False, True),
+            ("short", "long"), (0.25, 8, 24)):
+        options = (work * 60, short_break * 60, long_break * 60, auto_break, auto_work, break_type)
+        plan = summarize(*options, hours=hours)
+        expected = step_day(*options, hours=hours)
+        assert (plan["work_sessions"], plan["breaks"]) == expected, (options, hours, plan, expected)
+        checked += 1
+    print(f"session counts match the stepped engine for {checked} configurations")
+
+    options = (25 * 60, 5 * 60, 15 * 60, True, False, "long")
+    print(f"summarize one day:           {timed(lambda: summarize(*options), args.runs):8.1f} us")
+    print(f"summarize one week:          {timed(lambda: summarize(*options, days=7), args.runs):8.1f} us")
+    print(f"schedule arrays, one week:   {timed(lambda: schedule(*options, days=7), args.runs):8.1f} us")
+    print(f"stepping the engine one day: {timed(lambda: step_day(*options, hours=8), args.runs):8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
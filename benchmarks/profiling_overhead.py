@@ -0,0 +1,59 @@
+import argparse
+import os
+import time
+
+from benchmarks.sandbox import use_sandbox
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+SANDBOX = use_sandbox()
+
+from PyQt5.QtWidgets import QApplication
+
+from pomodora import PomodoroTimer
+from profiling import PROBE_INTERVAL_MS, Profiler
+
+
+def per_call(func, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls
+
+
+def tick_cost(window, calls):
+    window.engine.start()
+    cost = per_call(window.update_timer, calls)
+    window.engine.pause()
+    return cost
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cost of the opt-in profiling layer.")
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    plain = PomodoroTimer()
+    profiler = Profiler(port=0, path=os.path.join(SANDBOX, "profile.log"))
+    profiled = PomodoroTimer(profiler)
+    profiler.start()
+
+    base = tick_cost(plain, args.calls)
+    instrumented = tick_cost(profiled, args.calls)
+    probe = per_call(profiler.on_probe, args.calls)
+    export = per_call(profiler.export, 200)
+    profiler.stop()
+
+    # Per second of wall time: one tick, the lag probes and a share of the
+    # periodic export.
+    added = (instrumented - base) + probe * 1000 / PROBE_INTERVAL_MS + export / 60
+    print(f"update_timer: {base * 1e6:.1f} us plain, {instrumented * 1e6:.1f} us instrumented")
+    print(f"lag probe: {probe * 1e6:.1f} us x {1000 // PROBE_INTERVAL_MS}/s, "
+          f"export: {export * 1e6:.1f} us per minute")
+    print(f"added CPU while profiling: {added * 1e6:.1f} us/s ({added * 100:.4f}% of one core)")
+    print(f"disabled: {'no wrappers installed' if 'update_timer' not in vars(plain) else 'WRAPPED'}")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
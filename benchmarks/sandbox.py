@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+
+XDG_VARIABLES = ("XDG_CONFIG_HOME", "XDG_DATA_HOME", "XDG_CACHE_HOME", "XDG_RUNTIME_DIR")
+
+
+def use_sandbox(environ=os.environ):
+    """Point the XDG directories at a fresh temporary directory.
+
+    Call it before building a window, so the settings, history and
+    checkpoints a benchmark writes stay away from the real ones.
+    """
+    sandbox = tempfile.mkdtemp(prefix="pomodora-bench-")
+    for variable in XDG_VARIABLES:
+        environ[variable] = os.path.join(sandbox, variable.lower())
+        os.makedirs(environ[variable], mode=0o700, exist_ok=True)
+    return sandbox
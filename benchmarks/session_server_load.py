@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from session_server import SessionServer
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def create_sessions(server, count, rng):
+    for i in range(count):
+        server.create(
+            f"user-{i}",
+            work_time=rng.uniform(2, 6),
+            short_break_time=rng.uniform(1, 3),
+            long_break_time=rng.uniform(2, 4),
+            auto_start_break=True,
+            auto_start_work=True,
+            auto_break_type="long" if i % 4 == 0 else "short",
+        )
+
+
+async def measure_round_trips(path, samples, interval):
+    reader, writer = await asyncio.open_unix_connection(path)
+    round_trips = []
+    for i in range(samples):
+        op = "toggle" if i % 2 else "status"
+        started = time.perf_counter()
+        writer.write(json.dumps({"op": op, "id": "user-0"}).encode() + b"\n")
+        await writer.drain()
+        json.loads(await reader.readline())
+        round_trips.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    writer.close()
+    await writer.wait_closed()
+    await asyncio.sleep(0.05)
+    return round_trips
+
+
+async def run(server, seconds, path):
+    unix_server = await asyncio.start_unix_server(server.handle_client, path)
+    expiry = asyncio.ensure_future(server.run_expiry())
+    round_trips = await measure_round_trips(path, int(seconds / 0.02), 0.02)
+    expiry.cancel()
+    unix_server.close()
+    await unix_server.wait_closed()
+    return round_trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the multi-session timer server.")
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--resolution", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    server = SessionServer(resolution=args.resolution)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    create_sessions(server, args.sessions, rng)
+    for session_id in server.sessions:
+        server.command(session_id, "start")
+    per_session = (tracemalloc.get_traced_memory()[0] - before) / args.sessions
+    tracemalloc.stop()
+
+    latencies = []
+    server.on_expire = lambda session_id, deadline, now: latencies.append(now - deadline)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="pomodora-bench-"), "sessions.sock")
+    started = time.perf_counter()
+    round_trips = asyncio.run(run(server, args.seconds, path))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    round_trips.sort()
+    print(f"{args.sessions} sessions, {len(latencies)} expiries in {elapsed:.1f} s "
+          f"({len(latencies) / elapsed:,.0f}/s), wheel resolution {args.resolution * 1000:g} ms")
+    print(f"memory per running session: {per_session:.0f} bytes")
+    print("expiry latency ms: " + "  ".join(
+        f"p{label} {percentile(latencies, q) * 1000:.2f}"
+        for label, q in (("50", 0.5), ("90", 0.9), ("99", 0.99), ("99.9", 0.999))
+    ) + f"  max {latencies[-1] * 1000 if latencies else 0:.2f}")
+    print(f"client round trip ms: p50 {percentile(round_trips, 0.5) * 1000:.2f}  "
+          f"p99 {percentile(round_trips, 0.99) * 1000:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import argparse
+import sys
+import time
+
+from countdown import VirtualClock
+from engine import TimerEngine
+
+
+def simulate_day(days=1.0, break_type="short"):
+    clock = VirtualClock()
+    engine = TimerEngine(clock=clock, auto_start_break=True, auto_start_work=True,
+                         auto_break_type=break_type)
+    engine.start()
+    return engine.run_until(days * 86400)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the headless timer engine on a virtual clock.")
+    parser.add_argument("--days", type=float, default=1.0)
+    parser.add_argument("--engines", type=int, default=1000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    single = simulate_day(args.days)
+    single_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    total = sum(simulate_day(args.days, "long" if i % 2 else "short") for i in range(args.engines))
+    elapsed = time.perf_counter() - started
+
+    print(f"one engine: {single} sessions over {args.days:g} day(s) in {single_elapsed * 1000:.2f} ms")
+    print(f"{args.engines} engines: {total} sessions in {elapsed:.3f} s "
+          f"({total / elapsed:,.0f} sessions/s)")
+    print(f"PyQt5 imported: {'PyQt5' in sys.modules}")
+
+
+if __name__ == "__main__":
+    main()
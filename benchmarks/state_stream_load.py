@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import resource
+import selectors
+import socket
+import sys
+import tempfile
+import time
+
+from state_stream import StateStream
+
+
+def connect(path, slow=False):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    if slow:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+    sock.connect(path)
+    sock.setblocking(False)
+    return sock
+
+
+def wait_for_seq(selector, buffers, seq, timeout=10.0):
+    # Reads every fast subscriber until each has seen a line with this seq.
+    # Returns how many lines arrived in total.
+    waiting = set(buffers)
+    lines = 0
+    deadline = time.perf_counter() + timeout
+    while waiting:
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"{len(waiting)} subscribers never saw seq {seq}")
+        for key, _ in selector.select(0.1):
+            sock = key.fileobj
+            buffers[sock] += sock.recv(65536)
+            *complete, buffers[sock] = buffers[sock].split(b"\n")
+            lines += len(complete)
+            if complete and json.loads(complete[-1])["seq"] >= seq:
+                waiting.discard(sock)
+    return lines
+
+
+def percentile(timings, q):
+    return sorted(timings)[min(len(timings) - 1, int(len(timings) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fan-out load test for the state stream.")
+    parser.add_argument("--subscribers", type=int, default=400)
+    parser.add_argument("--slow", type=int, default=50, help="subscribers that never read")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--burst", type=int, default=100000)
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = 2 * (args.subscribers + args.slow) + 64
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+    path = os.path.join(tempfile.mkdtemp(prefix="pomodora-bench-"), "state.sock")
+    stream = StateStream(path)
+    stream.start()
+    stream.publish("snapshot", "work", False, 1500.0, 1500)
+
+    selector = selectors.DefaultSelector()
+    buffers = {}
+    for _ in range(args.subscribers):
+        sock = connect(path)
+        selector.register(sock, selectors.EVENT_READ)
+        buffers[sock] = b""
+    slow = [connect(path, slow=True) for _ in range(args.slow)]
+    wait_for_seq(selector, buffers, 1)
+
+    fan_out = []
+    for i in range(args.rounds):
+        started = time.perf_counter()
+        stream.publish("pause" if i % 2 else "reset", "work", False, 1500.0 - i, 1500)
+        wait_for_seq(selector, buffers, stream.seq)
+        fan_out.append(time.perf_counter() - started)
+    print(f"{args.subscribers} readers + {args.slow} stalled: fan-out to all readers "
+          f"p50 {percentile(fan_out, 0.5) * 1000:.2f} ms, p99 {percentile(fan_out, 0.99) * 1000:.2f} ms")
+
+    publish = []
+    for i in range(args.burst):
+        started = time.perf_counter()
+        stream.publish("reset", "work", False, float(i), 1500)
+        publish.append(time.perf_counter() - started)
+    lines = wait_for_seq(selector, buffers, stream.seq)
+    print(f"burst of {args.burst} publishes: publish() p50 {percentile(publish, 0.5) * 1e6:.1f} us, "
+          f"p99 {percentile(publish, 0.99) * 1e6:.1f} us on the calling thread")
+    print(f"  coalesced to {lines / args.subscribers:.0f} lines per reader; all readers hold the final state")
+
+    queued = [len(s.out) + len(s.pending or b"") for s in list(stream.subscribers.values())]
+    print(f"  largest backlog held for any subscriber: {max(queued)} B")
+    stream.close()
+    for sock in slow + list(buffers):
+        sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
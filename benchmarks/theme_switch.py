@@ -0,0 +1,94 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.sandbox import use_sandbox
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+use_sandbox()
+
+from PyQt5.QtCore import QEvent, QObject
+from PyQt5.QtWidgets import QApplication, QProxyStyle, QWidget
+
+from pomodora import PomodoroTimer
+
+
+class EventCounter(QObject):
+    WATCHED = {QEvent.StyleChange: "style change", QEvent.Paint: "paint"}
+
+    def __init__(self):
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        self.counts = {"polish": 0, "style change": 0, "paint": 0}
+        self.widgets = set()
+
+    def eventFilter(self, obj, event):
+        name = self.WATCHED.get(event.type())
+        if name is not None:
+            self.counts[name] += 1
+        return False
+
+
+class PolishCountingStyle(QProxyStyle):
+    # Style polish is a direct call rather than an event, so count it here.
+    def __init__(self, counter):
+        super().__init__()
+        self.counter = counter
+
+    def polish(self, target):
+        if isinstance(target, QWidget):
+            self.counter.counts["polish"] += 1
+            self.counter.widgets.add(id(target))
+        return super().polish(target)
+
+
+def measure(app, counter, action, runs):
+    timings = []
+    totals = dict.fromkeys(counter.counts, 0)
+    widgets = 0
+    for i in range(runs):
+        app.processEvents()
+        counter.reset()
+        started = time.perf_counter()
+        action(i)
+        app.processEvents()
+        timings.append(time.perf_counter() - started)
+        for name, count in counter.counts.items():
+            totals[name] += count
+        widgets += len(counter.widgets)
+    counts = ", ".join(f"{name} {total / runs:.1f}" for name, total in totals.items())
+    return statistics.median(timings) * 1000, counts, widgets / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count polish/repaint work for theme switches and start/pause.")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    counter = EventCounter()
+    app.setStyle(PolishCountingStyle(counter))
+    window = PomodoroTimer()
+    window.show()
+    app.processEvents()
+    app.installEventFilter(counter)
+
+    cases = (
+        ("theme switch", lambda i: window.change_theme("light" if i % 2 == 0 else "dark")),
+        ("same theme again", lambda i: window.change_theme(window.theme)),
+        ("start/pause", lambda i: window.toggle_timer()),
+    )
+    for name, action in cases:
+        median_ms, counts, widgets = measure(app, counter, action, args.runs)
+        print(f"{name:>16}: median {median_ms:7.3f} ms  per run: {counts}, widgets polished {widgets:.1f}")
+    if window.engine.is_running:
+        window.toggle_timer()
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
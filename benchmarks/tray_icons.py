@@ -0,0 +1,100 @@
+import argparse
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QGuiApplication
+
+from countdown import VirtualClock
+from engine import TimerEngine
+from tray_icons import CACHE_CAPACITY, TrayCountdown, TrayIconCache, render_icon
+
+
+class FakeTray:
+    def __init__(self):
+        self.icons = 0
+        self.tooltips = 0
+
+    def setIcon(self, icon):
+        self.icons += 1
+
+    def setToolTip(self, text):
+        self.tooltips += 1
+
+
+def session(tray, theme, minutes, hidden, seed):
+    # One session on a virtual clock, waking the way the hidden window does:
+    # coarse wakeups at each icon change, or every second while visible.
+    rng = random.Random(seed)
+    clock = VirtualClock()
+    engine = TimerEngine(clock=clock, work_time=minutes * 60)
+    engine.start()
+    wakeups = 0
+    timings = []
+    while engine.is_running:
+        remaining = engine.countdown.time_remaining()
+        delay, precise = engine.countdown.next_wakeup(not hidden)
+        if not precise:
+            change = tray.next_change(remaining, engine.duration())
+            if change is not None:
+                delay = min(delay, change)
+        jitter = 0.0 if precise else rng.uniform(-0.5, 0.5)
+        clock.advance(max(0.001, delay + jitter))
+        wakeups += 1
+        engine.tick()
+        started = time.perf_counter()
+        tray.update(theme, engine.current_mode, engine.countdown.time_remaining(), engine.duration())
+        timings.append(time.perf_counter() - started)
+    return wakeups, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render and update cost of the live tray icon.")
+    parser.add_argument("--minutes", type=int, default=25)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--renders", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    app = QGuiApplication([])
+
+    timings = []
+    for i in range(args.renders):
+        started = time.perf_counter()
+        render_icon("dark", "work", i % 41)
+        timings.append(time.perf_counter() - started)
+    print(f"render one icon (cache miss): median {statistics.median(timings) * 1e6:7.1f} us")
+
+    cache = TrayIconCache()
+    cache.get(("dark", "work", 0))
+    timings = []
+    for _ in range(args.renders):
+        started = time.perf_counter()
+        cache.get(("dark", "work", 0))
+        timings.append(time.perf_counter() - started)
+    print(f"cached icon (hit):            median {statistics.median(timings) * 1e6:7.1f} us")
+
+    for hidden in (False, True):
+        cache = TrayIconCache()
+        fake = FakeTray()
+        tray = TrayCountdown(fake, cache)
+        wakeups = 0
+        timings = []
+        for i in range(args.sessions):
+            count, spent = session(tray, "dark", args.minutes, hidden, args.seed + i)
+            wakeups += count
+            timings.extend(spent)
+        state = "hidden" if hidden else "visible"
+        print(f"{args.sessions} x {args.minutes} min sessions, window {state}:")
+        print(f"  {wakeups / args.sessions:7.1f} wakeups, {fake.icons / args.sessions:5.1f} icon and "
+              f"{fake.tooltips / args.sessions:5.1f} tooltip changes per session, "
+              f"update median {statistics.median(timings) * 1e6:.1f} us")
+        print(f"  cache: {cache.hits} hits, {cache.misses} misses, {cache.evictions} evictions, "
+              f"{len(cache)}/{CACHE_CAPACITY} icons, {cache.memory_bytes() / 1024:.0f} KiB")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
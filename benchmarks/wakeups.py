@@ -0,0 +1,86 @@
+import argparse
+import os
+import random
+import sys
+
+from benchmarks.sandbox import use_sandbox
+from countdown import VirtualClock
+from engine import TimerEngine
+
+
+def simulate(visible, hours, seed):
+    # Coarse timers may fire up to half a second either side of the request.
+    rng = random.Random(seed)
+    clock = VirtualClock()
+    engine = TimerEngine(clock=clock, auto_start_break=True, auto_start_work=True)
+    engine.start()
+    wakeups = 0
+    display_updates = 0
+    end = hours * 3600
+    while clock() < end:
+        delay, precise = engine.countdown.next_wakeup(visible)
+        jitter = 0.0 if precise else rng.uniform(-0.5, 0.5)
+        clock.advance(max(0.001, delay + jitter))
+        wakeups += 1
+        engine.tick()
+        if visible:
+            display_updates += 1
+    return wakeups / hours, display_updates / hours
+
+
+def live(seconds):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    use_sandbox()
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from pomodora import PomodoroTimer
+
+    app = QApplication(sys.argv[:1])
+    window = PomodoroTimer()
+    window.show()
+    window.toggle_timer()
+    counts = {"wakeups": 0, "display": 0}
+    window.timer.timeout.connect(lambda: counts.__setitem__("wakeups", counts["wakeups"] + 1))
+    update_display = window.update_display
+
+    def counting_update_display():
+        counts["display"] += 1
+        update_display()
+
+    window.update_display = counting_update_display
+
+    results = {}
+    for name, action in (("visible", window.showNormal), ("minimized", window.showMinimized),
+                         ("hidden", window.hide)):
+        action()
+        app.processEvents()
+        counts.update(wakeups=0, display=0)
+        QTimer.singleShot(int(seconds * 1000), app.quit)
+        app.exec_()
+        scale = 3600 / seconds
+        results[name] = (counts["wakeups"] * scale, counts["display"] * scale)
+    window.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count timer wakeups per hour while visible and hidden.")
+    parser.add_argument("--hours", type=float, default=8.0)
+    parser.add_argument("--live", type=float, default=0.0, metavar="SECONDS",
+                        help="also run the real widget for this long in each state")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"simulated {args.hours:g} h of auto-started work/break cycles:")
+    for name, visible in (("visible", True), ("hidden", False)):
+        wakeups, updates = simulate(visible, args.hours, args.seed)
+        print(f"  {name:>9}: {wakeups:8.1f} wakeups/h  {updates:8.1f} display updates/h")
+
+    if args.live:
+        print(f"live widget, {args.live:g} s per state, scaled to one hour:")
+        for name, (wakeups, updates) in live(args.live).items():
+            print(f"  {name:>9}: {wakeups:8.1f} wakeups/h  {updates:8.1f} display updates/h")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.sandbox import use_sandbox
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+use_sandbox()
+
+from PyQt5.QtCore import QEvent, QObject, Qt, qInstallMessageHandler
+from PyQt5.QtWidgets import QApplication
+
+from pomodora import LAYOUT_SIZES, PomodoroTimer
+
+
+class WindowMeter(QObject):
+    # WinIdChange is sent each time the widget gets a new native window.
+    def __init__(self):
+        super().__init__()
+        self.recreated = 0
+        self.paints = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.WinIdChange:
+            self.recreated += 1
+        elif event.type() == QEvent.Paint:
+            self.paints += 1
+        return False
+
+
+def legacy_toggle(window):
+    # The previous implementation: new window flags, widget-by-widget
+    # visibility, then show() to map the re-created window again.
+    zen = window.zen_btn.isChecked()
+    window.zen_mode = zen
+    pos = window.pos()
+    for widget in window.full_only:
+        widget.setVisible(not zen)
+    window.setWindowFlags(Qt.FramelessWindowHint)
+    window.setFixedSize(LAYOUT_SIZES[zen])
+    window.show()
+    window.move(pos)
+
+
+def run(app, toggle, resize_ms, runs):
+    window = PomodoroTimer()
+    window.zen_resize_ms = resize_ms
+    window.show()
+    app.processEvents()
+    meter = WindowMeter()
+    window.installEventFilter(meter)
+    timings = []
+    for _ in range(runs):
+        window.zen_btn.setChecked(not window.zen_btn.isChecked())
+        started = time.perf_counter()
+        toggle(window)
+        app.processEvents()
+        while window.resize_animation.state():
+            app.processEvents()
+        timings.append(time.perf_counter() - started)
+    window.close()
+    return statistics.median(timings) * 1000, meter.recreated / runs, meter.paints / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zen mode toggle latency and native window re-creations.")
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+    app = QApplication(sys.argv[:1])
+    # The offscreen platform warns on every size change.
+    qInstallMessageHandler(lambda *message: None)
+
+    cases = (
+        ("setWindowFlags (old)", legacy_toggle, 0),
+        ("layout swap", PomodoroTimer.toggle_zen_mode, 0),
+        ("layout swap, animated", PomodoroTimer.toggle_zen_mode, 120),
+    )
+    for name, toggle, resize_ms in cases:
+        median_ms, recreated, paints = run(app, toggle, resize_ms, args.runs)
+        print(f"{name:>22}: median {median_ms:7.2f} ms until settled, "
+              f"{recreated:.1f} native window re-creations and {paints:.1f} window paints per toggle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+import struct
+import time
+import zlib
+
+from engine import MODES
+from paths import data_dir
+
+
+# Two fixed-size slots written alternately in place. A write touches one
+# slot and needs a single fdatasync; no rename or directory sync. A torn
+# or half-written slot fails its CRC and the other slot is used instead.
+RECORD = struct.Struct("<QBB2xddI")
+PAYLOAD_SIZE = RECORD.size - 4
+SLOTS = 2
+
+CHECKPOINT_EVENTS = ("start", "pause", "reset", "mode", "finish")
+
+
+def default_path():
+    return os.path.join(data_dir(), "session.ckpt")
+
+
+def encode(seq, mode, running, remaining, deadline):
+    payload = RECORD.pack(seq, MODES.index(mode), running, remaining, deadline, 0)[:PAYLOAD_SIZE]
+    return payload + struct.pack("<I", zlib.crc32(payload))
+
+
+def decode(data):
+    if len(data) != RECORD.size:
+        return None
+    seq, mode, running, remaining, deadline, crc = RECORD.unpack(data)
+    if crc != zlib.crc32(data[:PAYLOAD_SIZE]) or seq == 0 or mode >= len(MODES):
+        return None
+    return {
+        "seq": seq,
+        "mode": MODES[mode],
+        "running": bool(running),
+        "remaining": remaining,
+        "deadline": deadline,
+    }
+
+
+def read_checkpoint(path):
+    try:
+        with open(path, "rb") as f:
+            data = f.read(RECORD.size * SLOTS)
+    except OSError:
+        return None
+    states = [decode(data[i * RECORD.size:(i + 1) * RECORD.size]) for i in range(SLOTS)]
+    states = [state for state in states if state is not None]
+    return max(states, key=lambda state: state["seq"]) if states else None
+
+
+class Checkpointer:
+    def __init__(self, path=None, wall_clock=time.time):
+        self.path = path or default_path()
+        self.wall_clock = wall_clock
+        state = read_checkpoint(self.path)
+        self.seq = state["seq"] if state else 0
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o600)
+        if os.fstat(self.fd).st_size < RECORD.size * SLOTS:
+            os.ftruncate(self.fd, RECORD.size * SLOTS)
+            os.fsync(self.fd)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def load(self):
+        return read_checkpoint(self.path)
+
+    def save(self, mode, running, remaining):
+        self.seq += 1
+        deadline = self.wall_clock() + remaining if running else 0.0
+        record = encode(self.seq, mode, running, remaining, deadline)
+        offset = (self.seq % SLOTS) * RECORD.size
+        if hasattr(os, "pwrite"):
+            os.pwrite(self.fd, record, offset)
+        else:
+            # Windows has neither pwrite nor fdatasync; only this thread
+            # moves the file position, so seek and write is as good.
+            os.lseek(self.fd, offset, os.SEEK_SET)
+            os.write(self.fd, record)
+        getattr(os, "fdatasync", os.fsync)(self.fd)
+        return self.seq
+
+    def on_engine_event(self, event, engine):
+        if event in CHECKPOINT_EVENTS:
+            self.save(engine.current_mode, engine.is_running, engine.countdown.time_remaining())
+
+    def restore(self, engine):
+        state = self.load()
+        if state is None:
+            return None
+        remaining = state["remaining"]
+        if state["running"]:
+            remaining = state["deadline"] - self.wall_clock()
+        engine.restore(state["mode"], remaining, state["running"])
+        return state
@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+import threading
+import time
+
+from paths import config_dir
+
+
+DEFAULTS = {
+    "theme": "dark",
+    "mute": False,
+    "sound": "chime",
+    "work_time_min": 25,
+    "short_break_min": 5,
+    "long_break_min": 15,
+    "auto_start_break": False,
+    "auto_start_work": False,
+    "auto_break_type": "short",
+    "progress_ring": False,
+}
+
+# Values the settings dialog can produce. Anything else in the file is
+# clamped or replaced by its default on load.
+RANGES = {
+    "work_time_min": (1, 120),
+    "short_break_min": (1, 30),
+    "long_break_min": (1, 60),
+}
+
+CHOICES = {
+    "theme": ("dark", "light"),
+    "sound": ("chime", "bell", "digital"),
+    "auto_break_type": ("short", "long"),
+}
+
+
+def default_path():
+    return os.path.join(config_dir(), "settings.json")
+
+
+class ConfigStore:
+    def __init__(self, path=None, delay=0.5):
+        self.path = path or default_path()
+        self.delay = delay
+        self.values = dict(DEFAULTS)
+        self.writes = 0
+        self._due = None
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if isinstance(data, dict):
+            for key, default in DEFAULTS.items():
+                value = data.get(key)
+                if type(value) is not type(default) or value not in CHOICES.get(key, (value,)):
+                    continue
+                if key in RANGES:
+                    low, high = RANGES[key]
+                    value = min(max(value, low), high)
+                self.values[key] = value
+        return self.values
+
+    def update(self, **changes):
+        with self._condition:
+            if all(self.values.get(key) == value for key, value in changes.items()):
+                return
+            self.values.update(changes)
+            # Every change pushes the write back, so a burst of changes
+            # ends up as one write once things go quiet.
+            self._due = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pomodora-config", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self):
+        with self._condition:
+            self._closed = True
+            pending = self._due is not None
+            self._due = None
+            values = dict(self.values)
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._closed = False
+        if pending:
+            self._save(values)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._due is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                wait = self._due - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                self._due = None
+                values = dict(self.values)
+            self._save(values)
+
+    def _save(self, values):
+        # A full or read-only config directory must not end the writer
+        # thread or break closing the window; the next change tries again.
+        try:
+            self._write(values)
+        except OSError as exc:
+            print(f"config: cannot write {self.path}: {exc}", file=sys.stderr)
+
+    def _write(self, values):
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(values, f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        self.writes += 1
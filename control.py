@@ -0,0 +1,107 @@
+import json
+import os
+import socket
+import sys
+
+from paths import runtime_dir
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# Only the standard library is imported here so the command line client
+# starts quickly enough to be bound to hotkeys.
+CONTROL_COMMANDS = ("status", "start", "pause", "toggle", "reset", "mode", "show")
+
+# The lock needs flock and the client a Unix socket. Where either is missing
+# every launch opens its own window, as before single-instance mode.
+SINGLE_INSTANCE = fcntl is not None and hasattr(socket, "AF_UNIX")
+
+USAGE = "usage: control.py [--json] {status,start,pause,toggle,reset,show,mode MODE}"
+
+
+def default_socket_path():
+    return os.path.join(runtime_dir(), "control.sock")
+
+
+def lock_path():
+    return os.path.join(runtime_dir(), "instance.lock")
+
+
+def acquire_instance_lock(path=None):
+    # Held for the life of the running instance; the kernel drops it when
+    # the process exits, however it exits.
+    fd = os.open(path or lock_path(), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def request(payload, path=None, timeout=2.0):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path or default_socket_path())
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def show_running_instance(attempts=40, interval=0.05):
+    # The other instance may hold the lock but still be starting up, so
+    # give its socket a moment to appear.
+    import time
+    for _ in range(attempts):
+        try:
+            return request({"op": "show"})
+        except OSError:
+            time.sleep(interval)
+    return None
+
+
+def format_status(status):
+    minutes, seconds = divmod(status["time_left"], 60)
+    state = "running" if status["running"] else "paused"
+    return f"{status['mode']} {minutes:02d}:{seconds:02d} {state}"
+
+
+def main(argv=None):
+    # Parsed by hand; argparse alone costs more than the round trip.
+    args = list(sys.argv[1:] if argv is None else argv)
+    as_json = "--json" in args
+    if as_json:
+        args.remove("--json")
+    if not args or args[0] not in CONTROL_COMMANDS or len(args) != (2 if args[0] == "mode" else 1):
+        print(USAGE, file=sys.stderr)
+        return 2
+    if not SINGLE_INSTANCE:
+        print("the control socket is not available on this platform", file=sys.stderr)
+        return 1
+    payload = {"op": args[0]}
+    if args[0] == "mode":
+        payload["mode"] = args[1]
+    try:
+        response = request(payload)
+    except OSError:
+        print("pomodora is not running", file=sys.stderr)
+        return 1
+    if as_json:
+        print(json.dumps(response))
+    elif response.get("ok"):
+        print(format_status(response))
+    else:
+        print(response.get("error", "request failed"), file=sys.stderr)
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import json
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtNetwork import QLocalServer
+
+from control import default_socket_path
+
+
+class ControlServer(QObject):
+    def __init__(self, window, path=None):
+        super().__init__(window)
+        self.window = window
+        self.path = path or default_socket_path()
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+
+    def listen(self):
+        # Only called while holding the instance lock, so anything already
+        # at the path was left behind by an instance that died.
+        QLocalServer.removeServer(self.path)
+        return self.server.listen(self.path)
+
+    def close(self):
+        self.server.close()
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(lambda connection=connection: self.on_ready_read(connection))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def on_ready_read(self, connection):
+        while connection.canReadLine():
+            line = bytes(connection.readLine())
+            try:
+                response = self.handle(json.loads(line))
+            except (ValueError, KeyError, TypeError) as exc:
+                response = {"ok": False, "error": str(exc)}
+            connection.write(json.dumps(response).encode() + b"\n")
+            connection.flush()
+
+    def handle(self, request):
+        window = self.window
+        engine = window.engine
+        op = request["op"]
+        if op == "start":
+            window.start_timer()
+        elif op == "pause":
+            window.pause_timer()
+        elif op == "toggle":
+            window.toggle_timer()
+        elif op == "reset":
+            window.reset_timer()
+        elif op == "mode":
+            window.change_mode(request["mode"])
+        elif op == "show":
+            window.showNormal()
+            window.raise_()
+            window.activateWindow()
+        elif op != "status":
+            raise ValueError(f"unknown op: {op}")
+        return {
+            "ok": True,
+            "mode": engine.current_mode,
+            "running": engine.is_running,
+            "time_left": engine.time_left,
+            "duration": engine.duration(),
+        }
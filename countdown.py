@@ -0,0 +1,97 @@
+import math
+import time
+
+
+_BOOTTIME = getattr(time, "CLOCK_BOOTTIME", None)
+
+# Ticks are aimed slightly past each whole second so that rounding the
+# remaining time up lands on the new value rather than the old one.
+TICK_SLACK = 0.002
+
+# While nothing is on screen, one coarse wakeup is aimed this far ahead of
+# the deadline and a precise one finishes the session.
+COARSE_LEAD = 1.0
+
+
+def monotonic():
+    # CLOCK_BOOTTIME keeps counting while the machine is suspended, so a
+    # session that spans a suspend still ends at its real deadline.
+    if _BOOTTIME is not None:
+        return time.clock_gettime(_BOOTTIME)
+    return time.monotonic()
+
+
+class VirtualClock:
+    def __init__(self, start=0.0):
+        self.now = float(start)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+        return self.now
+
+    def advance_to(self, when):
+        if when > self.now:
+            self.now = float(when)
+        return self.now
+
+
+class Countdown:
+    __slots__ = ("clock", "duration", "deadline", "remaining")
+
+    def __init__(self, duration, clock=monotonic):
+        self.clock = clock
+        self.duration = duration
+        self.deadline = None
+        self.remaining = float(duration)
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    def start(self, now=None):
+        if self.deadline is None:
+            if now is None:
+                now = self.clock()
+            self.deadline = now + self.remaining
+        return self.deadline
+
+    def pause(self):
+        if self.deadline is not None:
+            self.remaining = max(0.0, self.deadline - self.clock())
+            self.deadline = None
+        return self.remaining
+
+    def reset(self, duration=None):
+        if duration is not None:
+            self.duration = duration
+        self.deadline = None
+        self.remaining = float(self.duration)
+
+    def time_remaining(self):
+        if self.deadline is None:
+            return self.remaining
+        return max(0.0, self.deadline - self.clock())
+
+    def seconds_left(self):
+        return int(math.ceil(self.time_remaining()))
+
+    def expired(self):
+        return self.deadline is not None and self.clock() >= self.deadline
+
+    def next_tick_delay(self):
+        remaining = self.time_remaining()
+        if remaining <= 0:
+            return 0.0
+        fraction = (remaining - math.floor(remaining)) or 1.0
+        return fraction + TICK_SLACK
+
+    def next_wakeup(self, visible=True):
+        if visible:
+            return self.next_tick_delay(), True
+        remaining = self.time_remaining()
+        if remaining > 2 * COARSE_LEAD:
+            return remaining - COARSE_LEAD, False
+        return remaining + TICK_SLACK, True
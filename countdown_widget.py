@@ -0,0 +1,206 @@
+import math
+
+from PyQt5.QtCore import QEvent, QRect, QRectF, QSize, Qt, QTimer
+from PyQt5.QtGui import QColor, QFontMetrics, QPainter, QPen, QPixmap, QRegion
+from PyQt5.QtWidgets import QWidget
+
+from countdown import monotonic
+
+
+GLYPHS = "0123456789:"
+RING_WIDTH = 4
+RING_COLOR = "#4CAF50"
+# Bounds on the ring animation interval. Within them the ring is redrawn
+# whenever its end has moved about half a pixel, so a long session costs
+# about one frame a second. It only runs while visible and running.
+RING_FRAME_MS = 40
+RING_MAX_FRAME_MS = 1000
+
+_glyphs = {}
+
+
+def glyph(char, font, color, ratio):
+    # Rendered once per font, colour and screen scale; every later paint is
+    # a pixmap blit with no text layout.
+    key = (char, font.key(), color.rgba(), ratio)
+    pixmap = _glyphs.get(key)
+    if pixmap is None:
+        metrics = QFontMetrics(font)
+        width = cell_width(char, metrics)
+        pixmap = QPixmap(math.ceil(width * ratio), math.ceil(metrics.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(QRectF(0, 0, width, metrics.height()), Qt.AlignCenter, char)
+        painter.end()
+        _glyphs[key] = pixmap
+    return pixmap
+
+
+def cell_width(char, metrics):
+    # Digits share the widest advance so the display never shifts sideways.
+    if char.isdigit():
+        return max(metrics.horizontalAdvance(digit) for digit in "0123456789")
+    return metrics.horizontalAdvance(char)
+
+
+class CountdownDisplay(QWidget):
+    def __init__(self, parent=None, clock=monotonic):
+        super().__init__(parent)
+        self.clock = clock
+        self.text = ""
+        self.cells = []
+        self.band = QRegion()
+        self.track = None
+        self.ring = False
+        self.duration = 0
+        self.remaining = 0.0
+        self.deadline = None
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.animation = QTimer(self)
+        self.animation.setInterval(RING_FRAME_MS)
+        self.animation.timeout.connect(self.update_ring)
+
+    def sizeHint(self):
+        metrics = QFontMetrics(self.font())
+        width = sum(cell_width(char, metrics) for char in "00:00")
+        return QSize(width + 16, metrics.height() + 16)
+
+    def set_time(self, seconds):
+        minutes, seconds = divmod(max(0, int(seconds)), 60)
+        self.set_text(f"{minutes:02d}:{seconds:02d}")
+
+    def set_text(self, text):
+        if text == self.text:
+            return
+        old = self.text
+        self.text = text
+        if len(old) != len(text):
+            self.relayout()
+            self.update()
+            return
+        for cell, before, after in zip(self.cells, old, text):
+            if before != after:
+                self.update(cell)
+
+    def set_ring(self, enabled):
+        if enabled != self.ring:
+            self.ring = enabled
+            self.sync_animation()
+            self.update()
+
+    def set_progress(self, remaining, duration, running):
+        self.duration = duration
+        self.remaining = remaining
+        self.deadline = self.clock() + remaining if running else None
+        if self.ring:
+            self.sync_animation()
+            self.update_ring()
+
+    def progress(self):
+        if not self.duration:
+            return 0.0
+        remaining = self.remaining if self.deadline is None else max(0.0, self.deadline - self.clock())
+        return min(1.0, 1.0 - remaining / self.duration)
+
+    def sync_animation(self):
+        animate = self.ring and self.deadline is not None and self.isVisible()
+        if not animate:
+            self.animation.stop()
+            return
+        rect = self.ring_rect()
+        perimeter = math.pi * (rect.width() + rect.height())
+        interval = self.duration * 1000 / (2 * perimeter) if perimeter else RING_MAX_FRAME_MS
+        self.animation.setInterval(int(min(RING_MAX_FRAME_MS, max(RING_FRAME_MS, interval))))
+        if not self.animation.isActive():
+            self.animation.start()
+
+    def ring_rect(self):
+        inset = RING_WIDTH / 2 + 2
+        return QRectF(self.rect()).adjusted(inset, inset, -inset, -inset)
+
+    def update_ring(self):
+        # Only the ring's band is repainted; the digit cells stay untouched.
+        self.update(self.band)
+
+    def ring_track(self):
+        # The faint full circle under the progress arc only changes with the
+        # size or the theme, so it is drawn once into a pixmap.
+        color = QColor(self.palette().color(self.foregroundRole()))
+        color.setAlpha(40)
+        key = (self.size(), color.rgba())
+        if self.track is None or self.track[0] != key:
+            ratio = self.devicePixelRatioF()
+            pixmap = QPixmap(math.ceil(self.width() * ratio), math.ceil(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(QPen(color, RING_WIDTH))
+            painter.drawEllipse(self.ring_rect())
+            painter.end()
+            self.track = (key, pixmap)
+        return self.track[1]
+
+    def relayout(self):
+        metrics = QFontMetrics(self.font())
+        widths = [cell_width(char, metrics) for char in self.text]
+        x = (self.width() - sum(widths)) // 2
+        y = (self.height() - metrics.height()) // 2
+        self.cells = []
+        for width in widths:
+            self.cells.append(QRect(x, y, width, metrics.height()))
+            x += width
+        # Plain rectangles keep clipping cheap; an elliptical band region
+        # repaints fewer pixels but slows antialiased drawing down more.
+        self.band = QRegion(self.rect())
+        for cell in self.cells:
+            self.band -= QRegion(cell)
+        self.track = None
+
+    def resizeEvent(self, event):
+        self.relayout()
+        super().resizeEvent(event)
+
+    def showEvent(self, event):
+        self.sync_animation()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.animation.stop()
+        super().hideEvent(event)
+
+    def prerender(self):
+        color = self.palette().color(self.foregroundRole())
+        for char in GLYPHS:
+            glyph(char, self.font(), color, self.devicePixelRatioF())
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.FontChange:
+            self.relayout()
+        if event.type() in (QEvent.FontChange, QEvent.PaletteChange, QEvent.StyleChange):
+            # A theme switch renders the new glyph set once, up front.
+            self.prerender()
+            self.update()
+        super().changeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.palette().color(self.backgroundRole()))
+        if self.ring:
+            painter.drawPixmap(0, 0, self.ring_track())
+            painter.setRenderHint(QPainter.Antialiasing)
+            rect = self.ring_rect()
+            pen = QPen(QColor(RING_COLOR), RING_WIDTH)
+            pen.setCapStyle(Qt.RoundCap)
+            painter.setPen(pen)
+            painter.drawArc(rect, 90 * 16, -int(self.progress() * 360 * 16))
+
+        color = self.palette().color(self.foregroundRole())
+        ratio = self.devicePixelRatioF()
+        font = self.font()
+        for cell, char in zip(self.cells, self.text):
+            if cell.intersects(event.rect()):
+                painter.drawPixmap(cell.topLeft(), glyph(char, font, color, ratio))
@@ -0,0 +1,153 @@
+from countdown import Countdown, monotonic
+
+
+MODES = ("work", "short_break", "long_break")
+
+MODE_LABELS = {
+    "work": "WORK TIME",
+    "short_break": "SHORT BREAK",
+    "long_break": "LONG BREAK",
+}
+
+
+def check_durations(*durations):
+    # A zero-length session would chain into the next one at the same
+    # deadline, so the auto-start loop in tick() could never catch up.
+    for duration in durations:
+        if not duration > 0:
+            raise ValueError(f"session durations must be positive, got {duration!r}")
+
+
+class TimerEngine:
+    __slots__ = ("clock", "countdown", "current_mode", "work_time", "short_break_time",
+                 "long_break_time", "auto_start_break", "auto_start_work",
+                 "auto_break_type", "listeners")
+
+    def __init__(self, clock=monotonic, work_time=25 * 60, short_break_time=5 * 60,
+                 long_break_time=15 * 60, auto_start_break=False, auto_start_work=False,
+                 auto_break_type="short"):
+        check_durations(work_time, short_break_time, long_break_time)
+        self.clock = clock
+        self.work_time = work_time
+        self.short_break_time = short_break_time
+        self.long_break_time = long_break_time
+        self.auto_start_break = auto_start_break
+        self.auto_start_work = auto_start_work
+        self.auto_break_type = auto_break_type
+        self.current_mode = "work"
+        self.countdown = Countdown(work_time, clock)
+        self.listeners = []
+
+    @property
+    def is_running(self):
+        return self.countdown.running
+
+    @property
+    def time_left(self):
+        return self.countdown.seconds_left()
+
+    @property
+    def deadline(self):
+        return self.countdown.deadline
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def emit(self, event):
+        for listener in self.listeners:
+            listener(event, self)
+
+    def duration(self, mode=None):
+        mode = mode or self.current_mode
+        if mode == "work":
+            return self.work_time
+        elif mode == "short_break":
+            return self.short_break_time
+        return self.long_break_time
+
+    def set_durations(self, work_time, short_break_time, long_break_time):
+        check_durations(work_time, short_break_time, long_break_time)
+        self.work_time = work_time
+        self.short_break_time = short_break_time
+        self.long_break_time = long_break_time
+
+    def next_mode(self):
+        if self.current_mode == "work":
+            if self.auto_start_break:
+                return "long_break" if self.auto_break_type == "long" else "short_break"
+        elif self.auto_start_work:
+            return "work"
+        return None
+
+    def start(self, now=None):
+        if self.countdown.running:
+            return
+        if self.countdown.remaining <= 0:
+            self.countdown.reset(self.duration())
+        self.countdown.start(now)
+        self.emit("start")
+
+    def pause(self):
+        if not self.countdown.running:
+            return
+        self.countdown.pause()
+        self.emit("pause")
+
+    def toggle(self):
+        if self.countdown.running:
+            self.pause()
+        else:
+            self.start()
+
+    def reset(self):
+        self.countdown.reset(self.duration())
+        self.emit("reset")
+
+    def change_mode(self, mode):
+        if mode not in MODES:
+            raise ValueError(f"unknown mode: {mode}")
+        self.current_mode = mode
+        self.countdown.reset(self.duration(mode))
+        self.emit("mode")
+
+    def restore(self, mode, remaining, running):
+        if mode not in MODES:
+            raise ValueError(f"unknown mode: {mode}")
+        self.current_mode = mode
+        self.countdown.reset(self.duration(mode))
+        self.countdown.remaining = max(0.0, float(remaining))
+        if running:
+            # A deadline that passed while we were gone is moved up to now:
+            # the next tick finishes that session once, and any auto-start
+            # chain carries on from now instead of replaying every session
+            # that would have run in the meantime.
+            self.countdown.deadline = self.clock() + self.countdown.remaining
+        self.emit("restore")
+
+    def tick(self):
+        finished = 0
+        while self.countdown.expired():
+            deadline = self.countdown.deadline
+            self.countdown.reset(0)
+            finished += 1
+            self.emit("finish")
+            mode = self.next_mode()
+            if mode is None:
+                break
+            self.change_mode(mode)
+            # Chain from the old deadline, not from whenever the tick ran,
+            # so a late tick never pushes the following sessions back.
+            self.start(now=deadline)
+        return finished
+
+    def run_until(self, when):
+        # Only meaningful with a clock that can be moved, such as VirtualClock.
+        finished = 0
+        while self.countdown.running and self.countdown.deadline <= when:
+            self.clock.advance_to(self.countdown.deadline)
+            finished += self.tick()
+        self.clock.advance_to(when)
+        return finished
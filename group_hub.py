@@ -0,0 +1,338 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from countdown import monotonic
+from engine import MODES, TimerEngine
+
+
+GROUP_COMMANDS = ("start", "pause", "toggle", "reset", "mode")
+
+DEFAULT_PORT = 8765
+PING_INTERVAL = 5.0
+JOIN_PINGS = 4
+OFFSET_SAMPLES = 8
+# Followers only re-apply the state when the clock offset moves this much.
+OFFSET_TOLERANCE = 0.005
+
+# A member whose socket buffer grows past this stops getting deltas and is
+# sent one full state once it has drained.
+MEMBER_BUFFER_LIMIT = 64 * 1024
+
+LISTEN_BACKLOG = 4096
+
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class Finishes:
+    # The host's finishes so far and the mode of the last one. A member
+    # whose own tick did not fire first sees only the state after a
+    # finish, so the count is how it learns that one happened.
+    __slots__ = ("count", "mode")
+
+    def __init__(self):
+        self.count = 0
+        self.mode = None
+
+    def on_engine_event(self, event, engine):
+        if event == "finish":
+            self.count += 1
+            self.mode = engine.current_mode
+
+
+def snapshot(engine, finishes=None):
+    # Keys are short because every change goes out to every member. The
+    # deadline "e" is on the host's monotonic clock; "p" is what is left
+    # while paused; "f" counts finishes and "fm" is the last one's mode.
+    running = engine.is_running
+    return {
+        "m": engine.current_mode,
+        "e": engine.deadline if running else None,
+        "p": None if running else engine.countdown.remaining,
+        "w": engine.work_time,
+        "s": engine.short_break_time,
+        "l": engine.long_break_time,
+        "ab": engine.auto_start_break,
+        "aw": engine.auto_start_work,
+        "bt": engine.auto_break_type,
+        "f": finishes.count if finishes is not None else 0,
+        "fm": finishes.mode if finishes is not None else None,
+    }
+
+
+def check_command(op, mode=None):
+    # Commands arrive from any member on the network, so they are checked
+    # here, before they can reach the host's engine.
+    if op not in GROUP_COMMANDS:
+        raise ValueError(f"unknown command: {op!r}")
+    if op == "mode" and mode not in MODES:
+        raise ValueError(f"unknown mode: {mode!r}")
+
+
+def apply_command(engine, op, mode=None):
+    if op == "start":
+        engine.start()
+    elif op == "pause":
+        engine.pause()
+    elif op == "toggle":
+        engine.toggle()
+    elif op == "reset":
+        engine.reset()
+    elif op == "mode":
+        engine.change_mode(mode)
+    else:
+        raise ValueError(f"unknown command: {op}")
+
+
+class Member:
+    __slots__ = ("stale",)
+
+    def __init__(self):
+        self.stale = False
+
+
+class GroupHub:
+    def __init__(self, clock=monotonic):
+        self.clock = clock
+        self.state = {}
+        self.version = 0
+        self.members = {}
+        self.on_command = None
+        self._changed = None
+
+    def full_message(self):
+        return encode(dict(self.state, t="s", v=self.version))
+
+    def publish(self, state):
+        delta = {key: value for key, value in state.items() if self.state.get(key, ...) != value}
+        if not delta:
+            return 0
+        self.state = dict(state)
+        self.version += 1
+        if self._changed is not None:
+            self._changed.set()
+
+        data = encode(dict(delta, t="d", v=self.version))
+        full = None
+        for writer, member in self.members.items():
+            if writer.transport.get_write_buffer_size() > MEMBER_BUFFER_LIMIT:
+                member.stale = True
+            elif member.stale:
+                full = full or self.full_message()
+                writer.write(full)
+                member.stale = False
+            else:
+                writer.write(data)
+        return len(self.members)
+
+    async def handle_member(self, reader, writer):
+        member = Member()
+        self.members[writer] = member
+        writer.write(self.full_message())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    self.handle_message(json.loads(line), writer, member)
+                except (KeyError, TypeError, ValueError) as exc:
+                    # Any member can send anything; a bad line gets an
+                    # error back and the connection carries on.
+                    writer.write(encode({"t": "x", "error": f"bad message: {exc}"}))
+        except (ConnectionError, ValueError):
+            # ValueError here is a line over the stream limit.
+            pass
+        finally:
+            del self.members[writer]
+            writer.close()
+
+    def handle_message(self, message, writer, member):
+        if not isinstance(message, dict):
+            raise ValueError("expected an object")
+        kind = message.get("t")
+        if kind == "p":
+            writer.write(encode({"t": "p", "c": float(message["c"]), "h": self.clock()}))
+            if member.stale and writer.transport.get_write_buffer_size() <= MEMBER_BUFFER_LIMIT:
+                writer.write(self.full_message())
+                member.stale = False
+        elif kind == "c" and self.on_command is not None:
+            check_command(message["op"], message.get("m"))
+            self.on_command(message["op"], message.get("m"))
+
+    async def drive(self, engine):
+        # Only for a headless host: finish sessions at their deadlines and
+        # run the auto-start chain. A windowed host ticks its own engine.
+        self._changed = asyncio.Event()
+        while True:
+            self._changed.clear()
+            delay = engine.deadline - self.clock() if engine.is_running else None
+            try:
+                await asyncio.wait_for(self._changed.wait(), delay)
+            except asyncio.TimeoutError:
+                engine.tick()
+
+    async def serve(self, host="", port=DEFAULT_PORT, engine=None):
+        # A deep accept backlog keeps a burst of joins from hitting SYN
+        # retransmits, which would add a whole second to their join time.
+        server = await asyncio.start_server(self.handle_member, host or None, port,
+                                            backlog=LISTEN_BACKLOG)
+        async with server:
+            if engine is not None:
+                await asyncio.gather(server.serve_forever(), self.drive(engine))
+            else:
+                await server.serve_forever()
+
+
+class GroupClient:
+    """Follows a hub and reports its state on this machine's clock.
+
+    The offset to the hub's clock comes from ping round trips; the sample
+    with the shortest round trip of the last few is the least disturbed.
+    """
+
+    def __init__(self, on_state=None, clock=monotonic):
+        self.on_state = on_state
+        self.clock = clock
+        self.state = {}
+        self.version = 0
+        self.offset = None
+        self.samples = []
+        self.writer = None
+        self.joined = None
+
+    def local_state(self):
+        # Remaining time as seen from here, with the hub clock mapped onto ours.
+        state = self.state
+        running = state.get("e") is not None
+        deadline = state["e"] - self.offset if running else None
+        remaining = deadline - self.clock() if running else state.get("p") or 0.0
+        return dict(state, running=running, deadline=deadline, remaining=remaining)
+
+    def command(self, op, mode=None):
+        check_command(op, mode)
+        self.writer.write(encode({"t": "c", "op": op, "m": mode}))
+
+    def ping(self):
+        self.writer.write(encode({"t": "p", "c": self.clock()}))
+
+    def handle(self, message):
+        kind = message.pop("t")
+        if kind == "p":
+            now = self.clock()
+            rtt = now - message["c"]
+            self.samples = (self.samples + [(rtt, message["h"] - (message["c"] + rtt / 2))])[-OFFSET_SAMPLES:]
+            offset = min(self.samples)[1]
+            changed = self.offset is None or abs(offset - self.offset) > OFFSET_TOLERANCE
+            if changed:
+                self.offset = offset
+            if self.joined is not None and not self.joined.done():
+                self.joined.set_result(now)
+            if not changed or not self.state:
+                return
+        elif kind == "s":
+            self.state = message
+        elif kind == "d":
+            self.state.update(message)
+        else:
+            return
+        self.version = self.state.get("v", self.version)
+        if self.offset is not None and self.on_state is not None:
+            self.on_state(self.local_state())
+
+    async def run(self, host, port):
+        reader, self.writer = await asyncio.open_connection(host, port)
+        self.joined = asyncio.get_running_loop().create_future()
+        pinger = asyncio.ensure_future(self.keep_pinging())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.handle(json.loads(line))
+        finally:
+            pinger.cancel()
+            self.writer.close()
+
+    async def keep_pinging(self):
+        for _ in range(JOIN_PINGS):
+            self.ping()
+            await asyncio.sleep(0.05)
+        while True:
+            await asyncio.sleep(PING_INTERVAL)
+            self.ping()
+
+
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Pomodoro cycles in lockstep across a team.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    host = subparsers.add_parser("host", help="run a headless hub that owns the group's timer")
+    host.add_argument("--listen", default=f":{DEFAULT_PORT}", metavar="[ADDR]:PORT")
+    host.add_argument("--work", type=int, default=25, help="minutes")
+    host.add_argument("--short-break", type=int, default=5, help="minutes")
+    host.add_argument("--long-break", type=int, default=15, help="minutes")
+    host.add_argument("--auto-start", action="store_true", help="chain work and breaks automatically")
+    host.add_argument("--break-type", choices=("short", "long"), default="short")
+    watch = subparsers.add_parser("watch", help="print the group's state as it changes")
+    watch.add_argument("address", metavar="HOST:PORT")
+    send = subparsers.add_parser("send", help="send one command to the group")
+    send.add_argument("address", metavar="HOST:PORT")
+    send.add_argument("op", choices=GROUP_COMMANDS)
+    send.add_argument("--mode", choices=("work", "short_break", "long_break"))
+    args = parser.parse_args(argv)
+
+    if args.command == "host":
+        address, _, port = args.listen.rpartition(":")
+        try:
+            engine = TimerEngine(work_time=args.work * 60, short_break_time=args.short_break * 60,
+                                 long_break_time=args.long_break * 60, auto_start_break=args.auto_start,
+                                 auto_start_work=args.auto_start, auto_break_type=args.break_type)
+        except ValueError as exc:
+            parser.error(str(exc))
+        hub = GroupHub()
+        finishes = Finishes()
+        hub.publish(snapshot(engine, finishes))
+        engine.add_listener(finishes.on_engine_event)
+        engine.add_listener(lambda event, engine: hub.publish(snapshot(engine, finishes)))
+        hub.on_command = lambda op, mode: apply_command(engine, op, mode)
+        try:
+            asyncio.run(hub.serve(address, int(port), engine))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    host, port = parse_address(args.address)
+    if args.command == "send":
+        async def send():
+            client = GroupClient()
+            task = asyncio.ensure_future(client.run(host, port))
+            while client.writer is None:
+                await asyncio.sleep(0.01)
+            client.command(args.op, args.mode)
+            await client.writer.drain()
+            task.cancel()
+        asyncio.run(send())
+        return 0
+
+    def show(state):
+        minutes, seconds = divmod(int(max(0.0, state["remaining"]) + 0.999), 60)
+        running = "running" if state["running"] else "paused"
+        print(f"v{state['v']} {state['m']} {minutes:02d}:{seconds:02d} {running}", flush=True)
+
+    try:
+        asyncio.run(GroupClient(show).run(host, port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import asyncio
+import sys
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from engine import MODES, check_durations
+from group_hub import Finishes, GroupClient, GroupHub, apply_command, snapshot
+
+
+class GroupSession(QObject):
+    # Emitted from the network thread; Qt queues the call onto the GUI thread.
+    invoke = pyqtSignal(object)
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self.hub = None
+        self.client = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = None
+        self.task = None
+        self.finishes = Finishes()
+        # A follower's view of the host's finish count, and the finishes
+        # its own engine ran that the host has not reported yet.
+        self.seen_finishes = None
+        self.local_finishes = 0
+        self.replaying = False
+        self.invoke.connect(self.call)
+
+    def call(self, function):
+        # Runs in a Qt slot, where an uncaught exception aborts the whole
+        # process, and what it runs came in over the network.
+        try:
+            function()
+        except (KeyError, TypeError, ValueError) as exc:
+            print(f"group session: ignoring bad message: {exc!r}", file=sys.stderr)
+
+    @property
+    def following(self):
+        return self.client is not None
+
+    def run(self, coroutine):
+        def target():
+            asyncio.set_event_loop(self.loop)
+            self.task = self.loop.create_task(coroutine)
+            try:
+                self.loop.run_until_complete(self.task)
+            except asyncio.CancelledError:
+                pass
+            except OSError as exc:
+                print(f"group session ended: {exc}", file=sys.stderr)
+        self.thread = threading.Thread(target=target, name="pomodora-group", daemon=True)
+        self.thread.start()
+
+    def host(self, address, port):
+        # This window's engine is the authoritative one; its transitions,
+        # including the auto-start chain, go out to every member.
+        engine = self.window.engine
+        self.hub = GroupHub(clock=engine.clock)
+        self.hub.publish(snapshot(engine, self.finishes))
+        self.hub.on_command = lambda op, mode: self.invoke.emit(lambda: apply_command(engine, op, mode))
+        engine.add_listener(self.finishes.on_engine_event)
+        engine.add_listener(self.on_engine_event)
+        self.run(self.hub.serve(address, port))
+
+    def join(self, host, port):
+        self.client = GroupClient(lambda state: self.invoke.emit(lambda: self.follow(state)),
+                                  clock=self.window.engine.clock)
+        self.window.engine.add_listener(self.on_local_event)
+        self.run(self.client.run(host, port))
+
+    def on_engine_event(self, event, engine):
+        self.loop.call_soon_threadsafe(self.hub.publish, snapshot(engine, self.finishes))
+
+    def on_local_event(self, event, engine):
+        if event == "finish" and not self.replaying:
+            self.local_finishes += 1
+
+    def follow(self, state):
+        engine = self.window.engine
+        # Everything is read before anything is applied, so a malformed
+        # state leaves the engine as it was.
+        durations = state["w"], state["s"], state["l"]
+        flags = bool(state["ab"]), bool(state["aw"]), state["bt"]
+        if state["m"] not in MODES or flags[2] not in ("short", "long"):
+            raise ValueError(f"bad group state: mode {state['m']!r}, break type {flags[2]!r}")
+        check_durations(*durations)
+        remaining = float(state["deadline"] - engine.clock() if state["running"] else state["remaining"])
+        finishes, finished_mode = int(state.get("f", 0)), state.get("fm")
+        if finished_mode is not None and finished_mode not in MODES:
+            raise ValueError(f"bad group state: finished mode {finished_mode!r}")
+        missed = 0
+        if self.seen_finishes is None or finishes < self.seen_finishes:
+            # Just joined, or the host started over: nothing to catch up on.
+            self.local_finishes = 0
+        elif finishes > self.seen_finishes:
+            missed = finishes - self.seen_finishes
+            matched = min(missed, self.local_finishes)
+            self.local_finishes -= matched
+            missed -= matched
+        elif not state["running"]:
+            # Stopped without a finish, so a local one was premature.
+            self.local_finishes = 0
+        self.seen_finishes = finishes
+        engine.set_durations(*durations)
+        engine.auto_start_break, engine.auto_start_work, engine.auto_break_type = flags
+        if missed and finished_mode is not None:
+            # The finish the local tick never saw: notification, history
+            # and hooks all run off this event.
+            self.replaying = True
+            try:
+                engine.restore(finished_mode, 0.0, False)
+                for _ in range(missed):
+                    engine.emit("finish")
+            finally:
+                self.replaying = False
+        engine.restore(state["m"], remaining, state["running"])
+
+    def command(self, op, mode=None):
+        self.loop.call_soon_threadsafe(self.client.command, op, mode)
+
+    def close(self):
+        if self.task is not None:
+            self.loop.call_soon_threadsafe(self.task.cancel)
+            self.thread.join(1.0)
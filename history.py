@@ -0,0 +1,190 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from engine import MODES
+from paths import data_dir
+
+
+EVENT_KINDS = ("start", "pause", "reset", "mode", "finish", "resume")
+
+MODE_CODES = {mode: code for code, mode in enumerate(MODES)}
+KIND_CODES = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts INTEGER NOT NULL,
+    user INTEGER NOT NULL DEFAULT 0,
+    mode INTEGER NOT NULL,
+    kind INTEGER NOT NULL,
+    seconds INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_mode_ts ON events (mode, ts);
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    user INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    focus_seconds INTEGER NOT NULL,
+    work_started INTEGER NOT NULL,
+    work_finished INTEGER NOT NULL,
+    breaks_finished INTEGER NOT NULL,
+    PRIMARY KEY (user, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hourly_rollup (
+    user INTEGER NOT NULL,
+    weekday INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    focus_seconds INTEGER NOT NULL,
+    PRIMARY KEY (user, weekday, hour)
+) WITHOUT ROWID;
+"""
+
+UPSERT_DAILY = """
+INSERT INTO daily_rollup VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (user, day) DO UPDATE SET
+    focus_seconds = focus_seconds + excluded.focus_seconds,
+    work_started = work_started + excluded.work_started,
+    work_finished = work_finished + excluded.work_finished,
+    breaks_finished = breaks_finished + excluded.breaks_finished
+"""
+
+UPSERT_HOURLY = """
+INSERT INTO hourly_rollup VALUES (?, ?, ?, ?)
+ON CONFLICT (user, weekday, hour) DO UPDATE SET
+    focus_seconds = focus_seconds + excluded.focus_seconds
+"""
+
+
+def default_path():
+    return os.path.join(data_dir(), "history.db")
+
+
+def local_day_hour(ts):
+    local = ts + time.localtime(ts).tm_gmtoff
+    day = local // 86400
+    # Day 0 (1970-01-01) was a Thursday; weekdays count from Monday.
+    return day, (day + 3) % 7, local % 86400 // 3600
+
+
+def rollup_rows(rows):
+    work = MODE_CODES["work"]
+    start = KIND_CODES["start"]
+    finish = KIND_CODES["finish"]
+    daily = {}
+    hourly = {}
+    for ts, user, mode, kind, seconds in rows:
+        if kind != start and kind != finish:
+            continue
+        day, _, _ = local_day_hour(ts)
+        totals = daily.setdefault((user, day), [0, 0, 0, 0])
+        if mode != work:
+            if kind == finish:
+                totals[3] += 1
+        elif kind == start:
+            totals[1] += 1
+        else:
+            totals[0] += seconds
+            totals[2] += 1
+            _, weekday, hour = local_day_hour(ts - seconds)
+            key = (user, weekday, hour)
+            hourly[key] = hourly.get(key, 0) + seconds
+    return ([key + tuple(totals) for key, totals in daily.items()],
+            [key + (seconds,) for key, seconds in hourly.items()])
+
+
+def connect(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class HistoryStore:
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        self.conn = connect(self.path)
+
+    def close(self):
+        self.conn.close()
+
+    def insert_many(self, rows):
+        daily, hourly = rollup_rows(rows)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO events (ts, user, mode, kind, seconds) VALUES (?, ?, ?, ?, ?)", rows)
+            self.conn.executemany(UPSERT_DAILY, daily)
+            self.conn.executemany(UPSERT_HOURLY, hourly)
+
+    def query(self, start, end, mode=None, user=None):
+        conditions = ["ts >= ?", "ts < ?"]
+        params = [int(start), int(end)]
+        if mode is not None:
+            conditions.append("mode = ?")
+            params.append(MODE_CODES[mode])
+        if user is not None:
+            conditions.append("user = ?")
+            params.append(user)
+        sql = "SELECT ts, user, mode, kind, seconds FROM events WHERE {} ORDER BY ts"
+        return self.conn.execute(sql.format(" AND ".join(conditions)), params).fetchall()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+class HistoryWriter(threading.Thread):
+    def __init__(self, path=None, batch_size=512, user=0):
+        super().__init__(name="pomodora-history", daemon=True)
+        self.path = path or default_path()
+        self.batch_size = batch_size
+        self.user = user
+        self.queue = queue.SimpleQueue()
+        self._stop_marker = object()
+
+    def record(self, kind, mode, seconds, ts=None, user=None):
+        self.queue.put((
+            int(time.time() if ts is None else ts),
+            self.user if user is None else user,
+            MODE_CODES[mode],
+            KIND_CODES[kind],
+            int(seconds),
+        ))
+
+    def on_engine_event(self, event, engine):
+        if event not in KIND_CODES:
+            return
+        if event == "finish":
+            seconds = engine.duration()
+        else:
+            seconds = engine.time_left
+            if event == "start" and engine.countdown.remaining < engine.duration():
+                event = "resume"
+        self.record(event, engine.current_mode, seconds)
+
+    def close(self):
+        self.queue.put(self._stop_marker)
+        self.join()
+
+    def run(self):
+        store = HistoryStore(self.path)
+        try:
+            stopping = False
+            while not stopping:
+                row = self.queue.get()
+                batch = []
+                # Drain whatever has piled up so one transaction covers it.
+                while row is not self._stop_marker:
+                    batch.append(row)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        row = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                stopping = row is self._stop_marker
+                if batch:
+                    store.insert_many(batch)
+        finally:
+            store.close()
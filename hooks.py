@@ -0,0 +1,360 @@
+import heapq
+import importlib
+import json
+import os
+import queue
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+
+from paths import config_dir
+
+
+HOOK_EVENTS = ("start", "pause", "reset", "mode", "finish")
+
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 2
+
+# Events waiting for one hook while it is busy. Past this the oldest one is
+# dropped, so a hook that cannot keep up gets the latest events rather than
+# an ever longer queue.
+HOOK_BACKLOG = 32
+
+# First retry delay in seconds, doubled for each further attempt.
+RETRY_DELAY = 1.0
+
+# A call still running this long after its timeout has its worker written
+# off and replaced, so a hung hook holds one thread, never the whole pool.
+STUCK_GRACE = 1.0
+
+STATS = ("ok", "failed", "timeouts", "retried", "dropped", "stuck")
+
+# Process groups are POSIX only. Elsewhere a timed-out command is killed on
+# its own, and any children it started are left running.
+PROCESS_GROUPS = hasattr(os, "killpg")
+
+
+def default_path():
+    return os.path.join(config_dir(), "hooks.json")
+
+
+class HookError(Exception):
+    pass
+
+
+class HookTimeout(HookError):
+    pass
+
+
+def shell_runner(command):
+    # The payload arrives as JSON on stdin, with the event and mode also in
+    # the environment for one-line scripts.
+    def run(payload, timeout):
+        env = dict(os.environ, POMODORA_EVENT=payload["event"], POMODORA_MODE=payload["mode"])
+        process = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   env=env, start_new_session=PROCESS_GROUPS)
+        try:
+            _, stderr = process.communicate(json.dumps(payload).encode(), timeout=timeout)
+        except subprocess.TimeoutExpired:
+            if PROCESS_GROUPS:
+                # Kill the whole process group so the script's children go too.
+                os.killpg(process.pid, signal.SIGKILL)
+                process.communicate()
+            else:
+                # Its children may still hold stderr open, so only the
+                # command itself is waited for.
+                process.kill()
+                process.wait()
+                process.stderr.close()
+            raise HookTimeout(f"timed out after {timeout:g} s") from None
+        if process.returncode:
+            message = stderr.decode(errors="replace").strip()[-200:]
+            raise HookError(f"exit status {process.returncode}: {message}")
+    return run
+
+
+def webhook_runner(url):
+    def run(payload, timeout):
+        request = urllib.request.Request(url, data=json.dumps(payload).encode(), method="POST",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+        except socket.timeout:
+            raise HookTimeout(f"timed out after {timeout:g} s") from None
+        except urllib.error.URLError as exc:
+            if isinstance(exc.reason, socket.timeout):
+                raise HookTimeout(f"timed out after {timeout:g} s") from None
+            raise HookError(str(exc.reason)) from None
+    return run
+
+
+def callable_runner(target):
+    # "package.module:function", called with the payload. A function cannot
+    # be interrupted, so its timeout is enforced by writing off its worker.
+    module, _, name = target.partition(":")
+    function = getattr(importlib.import_module(module), name)
+    return lambda payload, timeout: function(payload)
+
+
+class Hook:
+    __slots__ = ("name", "run", "events", "timeout", "retries", "backlog", "scheduled",
+                 "started", "stats")
+
+    def __init__(self, name, run, events=("finish",), timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES):
+        unknown = set(events).difference(HOOK_EVENTS)
+        if unknown:
+            raise ValueError(f"unknown hook events: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.run = run
+        self.events = frozenset(events)
+        self.timeout = timeout
+        self.retries = retries
+        self.backlog = deque()
+        self.scheduled = False
+        self.started = None
+        self.stats = dict.fromkeys(STATS, 0)
+
+
+def load_hooks(path=None):
+    """Hooks from hooks.json: a list of objects with a "name", one of
+    "command", "url" or "callable", and optional "events", "timeout" and
+    "retries". Entries that cannot be set up are reported and skipped.
+    """
+    path = path or default_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as exc:
+        print(f"hooks: cannot read {path}: {exc}", file=sys.stderr)
+        return []
+    hooks = []
+    for index, entry in enumerate(entries if isinstance(entries, list) else ()):
+        try:
+            if "command" in entry:
+                run = shell_runner(entry["command"])
+            elif "url" in entry:
+                run = webhook_runner(entry["url"])
+            elif "callable" in entry:
+                run = callable_runner(entry["callable"])
+            else:
+                raise ValueError("needs a command, url or callable")
+            hooks.append(Hook(entry.get("name", f"hook {index + 1}"), run,
+                              entry.get("events", ("finish",)),
+                              float(entry.get("timeout", DEFAULT_TIMEOUT)),
+                              int(entry.get("retries", DEFAULT_RETRIES))))
+        except (AttributeError, ImportError, TypeError, ValueError) as exc:
+            print(f"hooks: skipping entry {index + 1}: {exc}", file=sys.stderr)
+    return hooks
+
+
+def event_payload(event, engine, **extra):
+    return dict(event=event, mode=engine.current_mode, running=engine.is_running,
+                time_left=engine.time_left, duration=engine.duration(), ts=time.time(), **extra)
+
+
+class HookPool:
+    """Runs hooks on a fixed set of worker threads.
+
+    dispatch() only appends to per-hook backlogs and never waits, so the GUI
+    thread and the engine's auto-start chain are never held up by a hook.
+    Each hook runs one call at a time, in event order. Failed calls go to a
+    retry queue with exponential backoff; the supervisor thread re-queues
+    them when due and replaces workers stuck in calls far past their timeout.
+    """
+
+    def __init__(self, hooks, workers=DEFAULT_WORKERS, clock=time.monotonic):
+        self.hooks = list(hooks)
+        self.events = frozenset().union(*(hook.events for hook in self.hooks))
+        self.workers = workers
+        self.clock = clock
+        self.ready = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.retry_queue = []
+        self.retry_seq = 0
+        self.threads = set()
+        self.running = {}
+        self.closing = False
+        self.supervisor = None
+
+    def start(self):
+        with self.lock:
+            for _ in range(self.workers):
+                self.spawn()
+        self.supervisor = threading.Thread(target=self.supervise, name="pomodora-hooks", daemon=True)
+        self.supervisor.start()
+
+    def spawn(self):
+        thread = threading.Thread(target=self.work, name="pomodora-hook-worker", daemon=True)
+        self.threads.add(thread)
+        thread.start()
+
+    def on_engine_event(self, event, engine):
+        if event in self.events:
+            self.dispatch(event_payload(event, engine))
+
+    def dispatch(self, payload):
+        with self.lock:
+            if self.closing:
+                return
+            for hook in self.hooks:
+                if payload["event"] in hook.events:
+                    self.enqueue(hook, payload, 0)
+
+    def enqueue(self, hook, payload, attempt):
+        if len(hook.backlog) >= HOOK_BACKLOG:
+            hook.backlog.popleft()
+            hook.stats["dropped"] += 1
+        hook.backlog.append((payload, attempt))
+        if not hook.scheduled:
+            hook.scheduled = True
+            self.ready.put(hook)
+
+    def work(self):
+        me = threading.current_thread()
+        while True:
+            hook = self.ready.get()
+            if hook is None:
+                return
+            with self.lock:
+                if not hook.backlog:
+                    # Emptied by close() after it was queued.
+                    hook.scheduled = False
+                    continue
+                payload, attempt = hook.backlog.popleft()
+                hook.started = self.clock()
+                self.running[me] = hook
+                self.wakeup.notify()
+            try:
+                hook.run(payload, hook.timeout)
+                outcome = "ok"
+            except HookTimeout as exc:
+                outcome, error = "timeouts", exc
+            except Exception as exc:
+                outcome, error = "failed", exc
+            gave_up = False
+            with self.lock:
+                del self.running[me]
+                hook.started = None
+                hook.stats[outcome] += 1
+                if outcome != "ok":
+                    gave_up = not self.retry(hook, payload, attempt)
+                if hook.backlog and not self.closing:
+                    self.ready.put(hook)
+                else:
+                    hook.scheduled = False
+                written_off = me not in self.threads
+            if gave_up:
+                # Outside the lock: stderr may block, dispatch() must not.
+                print(f"hooks: {hook.name} gave up on {payload['event']}: {error}", file=sys.stderr)
+            if written_off:
+                # Replaced while stuck in this call; the replacement carries on.
+                return
+
+    def retry(self, hook, payload, attempt):
+        if attempt >= hook.retries or self.closing:
+            return False
+        due = self.clock() + RETRY_DELAY * 2 ** attempt
+        self.retry_seq += 1
+        heapq.heappush(self.retry_queue, (due, self.retry_seq, hook, payload, attempt + 1))
+        self.wakeup.notify()
+        return True
+
+    def supervise(self):
+        with self.lock:
+            while not self.closing:
+                now = self.clock()
+                while self.retry_queue and self.retry_queue[0][0] <= now:
+                    _, _, hook, payload, attempt = heapq.heappop(self.retry_queue)
+                    hook.stats["retried"] += 1
+                    self.enqueue(hook, payload, attempt)
+                wait = self.retry_queue[0][0] - now if self.retry_queue else None
+                for thread, hook in self.running.items():
+                    if thread not in self.threads:
+                        continue
+                    overdue = hook.started + hook.timeout + STUCK_GRACE - now
+                    if overdue <= 0:
+                        hook.stats["stuck"] += 1
+                        self.threads.discard(thread)
+                        self.spawn()
+                    elif wait is None or overdue < wait:
+                        wait = overdue
+                # Sleeps until the next retry or timeout is due; nothing
+                # wakes this thread while hooks are idle.
+                self.wakeup.wait(wait)
+
+    def stats(self):
+        with self.lock:
+            return {hook.name: dict(hook.stats) for hook in self.hooks}
+
+    def close(self, timeout=1.0):
+        # Calls already running get up to `timeout` to finish; anything
+        # still waiting or due for a retry is dropped.
+        with self.lock:
+            self.closing = True
+            self.retry_queue.clear()
+            for hook in self.hooks:
+                hook.backlog.clear()
+            self.wakeup.notify()
+            threads = list(self.threads)
+        for _ in threads:
+            self.ready.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        if self.supervisor is not None:
+            self.supervisor.join(max(0.0, deadline - time.monotonic()))
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fire the configured hooks once with a sample event.")
+    parser.add_argument("event", nargs="?", default="finish", choices=HOOK_EVENTS)
+    parser.add_argument("--mode", default="work", choices=("work", "short_break", "long_break"))
+    parser.add_argument("--config", default=None, help="hooks file, default ~/.config/pomodora/hooks.json")
+    args = parser.parse_args(argv)
+
+    hooks = load_hooks(args.config)
+    if not hooks:
+        print("no hooks configured", file=sys.stderr)
+        return 1
+    for hook in hooks:
+        hook.retries = 0
+    pool = HookPool(hooks)
+    pool.start()
+    pool.dispatch(dict(event=args.event, mode=args.mode, running=False, time_left=0,
+                       duration=25 * 60, ts=time.time()))
+    deadline = time.monotonic() + max(hook.timeout for hook in hooks) + STUCK_GRACE
+    while any(hook.scheduled for hook in hooks) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    pool.close()
+    failed = 0
+    for name, counts in pool.stats().items():
+        if counts["ok"]:
+            result = "ok"
+        elif counts["timeouts"]:
+            result = "timed out"
+        elif counts["failed"]:
+            result = "failed"
+        else:
+            result = "still running"
+        failed += result != "ok"
+        print(f"{name}: {result}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
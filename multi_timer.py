@@ -0,0 +1,289 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (QAbstractItemView, QCheckBox, QComboBox, QDialog, QHBoxLayout,
+                             QHeaderView, QLineEdit, QPushButton, QSpinBox, QTableView,
+                             QVBoxLayout)
+
+from countdown import monotonic
+from engine import MODE_LABELS, MODES, TimerEngine
+from timing_wheel import TimingWheel
+
+
+COLUMNS = ("Name", "Mode", "Time", "State")
+NAME, MODE, TIME, STATE = range(len(COLUMNS))
+
+# Every timer in the panel shares one tick. A tick expires whatever is due
+# in the timing wheel and re-reads the rows on screen, so its cost does not
+# grow with the number of timers. Hidden, the panel only needs expiries.
+TICK_MS = 250
+HIDDEN_TICK_MS = 1000
+ROW_HEIGHT = 26
+
+
+class TaskTimer:
+    __slots__ = ("name", "engine", "row", "shown")
+
+    def __init__(self, name, engine, row):
+        self.name = name
+        self.engine = engine
+        self.row = row
+        self.shown = None
+
+
+def format_time(seconds):
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class TimerTableModel(QAbstractTableModel):
+    finished = pyqtSignal(str, str)
+
+    def __init__(self, parent=None, clock=monotonic):
+        super().__init__(parent)
+        self.clock = clock
+        self.timers = []
+        self.wheel = TimingWheel(TICK_MS / 1000, start=clock())
+        # The wheel also holds stale entries, so it cannot say whether
+        # anything is still running.
+        self.running = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.timers)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        timer = self.timers[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == NAME:
+                return timer.name
+            if column == MODE:
+                return MODE_LABELS[timer.engine.current_mode].title()
+            if column == TIME:
+                # Rows are only drawn while on screen, so this also records
+                # what each visible row currently shows.
+                timer.shown = timer.engine.time_left
+                return format_time(timer.shown)
+            return "Running" if timer.engine.is_running else "Paused"
+        if role == Qt.TextAlignmentRole and column in (TIME, STATE):
+            return Qt.AlignCenter
+        return None
+
+    def add(self, name, **options):
+        engine = TimerEngine(clock=self.clock, **options)
+        row = len(self.timers)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.timers.append(TaskTimer(name, engine, row))
+        self.endInsertRows()
+        return engine
+
+    def remove(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        # Its wheel entries stay behind and are skipped once they expire.
+        timer = self.timers.pop(row)
+        timer.row = -1
+        self.running -= timer.engine.is_running
+        for timer in self.timers[row:]:
+            timer.row -= 1
+        self.endRemoveRows()
+
+    def command(self, row, op, mode=None):
+        timer = self.timers[row]
+        engine = timer.engine
+        deadline = engine.deadline
+        was_running = engine.is_running
+        if op == "start":
+            engine.start()
+        elif op == "pause":
+            engine.pause()
+        elif op == "toggle":
+            engine.toggle()
+        elif op == "reset":
+            engine.reset()
+        elif op == "mode":
+            engine.change_mode(mode)
+        else:
+            raise ValueError(f"unknown command: {op}")
+        self.running += engine.is_running - was_running
+        if engine.deadline is not None and engine.deadline != deadline:
+            self.wheel.schedule(engine.deadline, timer)
+        self.row_changed(row)
+
+    def expire(self, now=None):
+        if now is None:
+            now = self.clock()
+        finished = 0
+        for deadline, timer in self.wheel.advance(now):
+            engine = timer.engine
+            # Paused, reset, restarted or removed since it was scheduled.
+            if timer.row < 0 or engine.deadline != deadline:
+                continue
+            mode = engine.current_mode
+            if not engine.tick():
+                self.wheel.schedule(deadline, timer)
+                continue
+            finished += 1
+            self.row_changed(timer.row)
+            self.finished.emit(timer.name, mode)
+            if engine.is_running:
+                self.wheel.schedule(engine.deadline, timer)
+            else:
+                self.running -= 1
+        return finished
+
+    def refresh(self, first, last):
+        # Only rows on screen are compared; the others read their engine
+        # when they are scrolled into view. Runs of changed rows go out as
+        # one dataChanged each.
+        changed = 0
+        start = None
+        for row in range(first, last + 1):
+            timer = self.timers[row]
+            if timer.engine.time_left != timer.shown:
+                if start is None:
+                    start = row
+                continue
+            if start is not None:
+                changed += self.times_changed(start, row - 1)
+                start = None
+        if start is not None:
+            changed += self.times_changed(start, last)
+        return changed
+
+    def times_changed(self, first, last):
+        self.dataChanged.emit(self.index(first, TIME), self.index(last, TIME), [Qt.DisplayRole])
+        return last - first + 1
+
+    def row_changed(self, row):
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+
+class MultiTimerPanel(QDialog):
+    def __init__(self, parent=None, clock=monotonic):
+        super().__init__(parent)
+        self.setWindowTitle("Timers - Pomodora")
+        self.setMinimumSize(460, 480)
+
+        main_layout = QVBoxLayout(self)
+
+        add_layout = QHBoxLayout()
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText("Task name")
+        self.name_edit.returnPressed.connect(self.add_timer)
+        add_layout.addWidget(self.name_edit, 1)
+
+        self.duration_spins = []
+        for value, tip in ((25, "Work minutes"), (5, "Short break minutes"), (15, "Long break minutes")):
+            spin = QSpinBox()
+            spin.setRange(1, 120)
+            spin.setValue(value)
+            spin.setToolTip(tip)
+            add_layout.addWidget(spin)
+            self.duration_spins.append(spin)
+
+        self.auto_start_checkbox = QCheckBox("Auto")
+        self.auto_start_checkbox.setToolTip("Chain work sessions and short breaks automatically")
+        add_layout.addWidget(self.auto_start_checkbox)
+
+        add_btn = QPushButton("Add")
+        add_btn.clicked.connect(self.add_timer)
+        add_layout.addWidget(add_btn)
+        main_layout.addLayout(add_layout)
+
+        self.model = TimerTableModel(self, clock)
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.setAlternatingRowColors(True)
+        self.view.verticalHeader().hide()
+        # Fixed row heights let the view lay out only the rows on screen.
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        header = self.view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Fixed)
+        header.setSectionResizeMode(NAME, QHeaderView.Stretch)
+        header.resizeSection(MODE, 110)
+        self.view.doubleClicked.connect(lambda index: self.command("toggle", rows=[index.row()]))
+        main_layout.addWidget(self.view)
+
+        action_layout = QHBoxLayout()
+        for text, op in (("Start/Pause", "toggle"), ("Reset", "reset")):
+            btn = QPushButton(text)
+            btn.clicked.connect(lambda checked, op=op: self.command(op))
+            action_layout.addWidget(btn)
+
+        self.mode_combo = QComboBox()
+        for mode in MODES:
+            self.mode_combo.addItem(MODE_LABELS[mode].title(), mode)
+        self.mode_combo.setToolTip("Switch the selected timers to this mode")
+        self.mode_combo.activated.connect(
+            lambda index: self.command("mode", self.mode_combo.itemData(index)))
+        action_layout.addWidget(self.mode_combo)
+
+        remove_btn = QPushButton("Remove")
+        remove_btn.clicked.connect(self.remove_selected)
+        action_layout.addWidget(remove_btn)
+        main_layout.addLayout(action_layout)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+    def add_timer(self):
+        name = self.name_edit.text().strip() or f"Timer {self.model.rowCount() + 1}"
+        work, short_break, long_break = (spin.value() * 60 for spin in self.duration_spins)
+        auto = self.auto_start_checkbox.isChecked()
+        self.model.add(name, work_time=work, short_break_time=short_break,
+                       long_break_time=long_break, auto_start_break=auto, auto_start_work=auto)
+        self.name_edit.clear()
+
+    def selected_rows(self):
+        return sorted(index.row() for index in self.view.selectionModel().selectedRows())
+
+    def command(self, op, mode=None, rows=None):
+        for row in self.selected_rows() if rows is None else rows:
+            self.model.command(row, op, mode)
+        self.sync_tick()
+
+    def remove_selected(self):
+        for row in reversed(self.selected_rows()):
+            self.model.remove(row)
+        self.sync_tick()
+
+    def visible_rows(self):
+        first = self.view.rowAt(0)
+        if first < 0:
+            return None
+        last = self.view.rowAt(self.view.viewport().height() - 1)
+        return first, self.model.rowCount() - 1 if last < 0 else last
+
+    def tick(self):
+        self.model.expire()
+        if self.isVisible():
+            rows = self.visible_rows()
+            if rows is not None:
+                self.model.refresh(*rows)
+        self.sync_tick()
+
+    def sync_tick(self):
+        if not self.model.running:
+            self.timer.stop()
+            return
+        interval = TICK_MS if self.isVisible() else HIDDEN_TICK_MS
+        if not self.timer.isActive() or self.timer.interval() != interval:
+            self.timer.start(interval)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.sync_tick()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.sync_tick()
@@ -0,0 +1,38 @@
+import os
+
+
+APP_NAME = "pomodora"
+
+
+def runtime_dir():
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        path = os.path.join(base, APP_NAME)
+    else:
+        import tempfile
+        # Windows has no getuid, but its temp directory is per user already.
+        user = f"-{os.getuid()}" if hasattr(os, "getuid") else ""
+        path = os.path.join(tempfile.gettempdir(), APP_NAME + user)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def data_dir():
+    base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def config_dir():
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
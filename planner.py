@@ -0,0 +1,158 @@
+import argparse
+import sys
+
+from engine import MODES
+
+
+# When auto-start is off for a hand-off, the next session waits for the
+# user. The planner assumes they start it this many seconds later.
+MANUAL_GAP = 60
+
+DAY_START = 9 * 3600
+DAY_HOURS = 8
+
+
+def cycle(work, short_break, long_break, auto_start_break, auto_start_work, auto_break_type,
+          manual_gap=MANUAL_GAP):
+    # The engine follows every work session with the configured break type,
+    # so a day is one repeating period: work, hand-off, break, hand-off.
+    break_time = long_break if auto_break_type == "long" else short_break
+    to_break = 0 if auto_start_break else manual_gap
+    to_work = 0 if auto_start_work else manual_gap
+    return break_time, to_break, to_work
+
+
+def fitting(window, length, period):
+    # Sessions of this length, one per period, that finish within the window.
+    if window < length:
+        return 0
+    return (window - length) // period + 1
+
+
+def summarize(work, short_break, long_break, auto_start_break=False, auto_start_work=False,
+              auto_break_type="short", hours=DAY_HOURS, days=1, manual_gap=MANUAL_GAP):
+    """Counts and totals for a plan, in closed form.
+
+    Durations are in seconds. Only sessions that finish within each day
+    are counted, and every day starts with a fresh work session.
+    """
+    break_time, to_break, to_work = cycle(work, short_break, long_break, auto_start_break,
+                                          auto_start_work, auto_break_type, manual_gap)
+    period = work + to_break + break_time + to_work
+    window = int(hours * 3600)
+    works = fitting(window, work, period)
+    breaks = fitting(window - work - to_break, break_time, period)
+    manual = 0
+    if works:
+        manual = 1 + (0 if auto_start_work else works - 1) + (0 if auto_start_break else breaks)
+    last_work = (works - 1) * period + work if works else 0
+    last_break = (breaks - 1) * period + work + to_break + break_time if breaks else 0
+    return {
+        "period": period,
+        "work_sessions": works * days,
+        "breaks": breaks * days,
+        "break_mode": "long_break" if auto_break_type == "long" else "short_break",
+        "focus": works * work * days,
+        "break_time": breaks * break_time * days,
+        "manual_starts": manual * days,
+        "day_end": max(last_work, last_break),
+    }
+
+
+def schedule(work, short_break, long_break, auto_start_break=False, auto_start_work=False,
+             auto_break_type="short", hours=DAY_HOURS, days=1, manual_gap=MANUAL_GAP,
+             day_start=DAY_START):
+    """Every session of the plan as arrays of start, end and mode index.
+
+    Times are seconds from midnight of the first day; modes index MODES.
+    """
+    import numpy as np
+
+    plan = summarize(work, short_break, long_break, auto_start_break, auto_start_work,
+                     auto_break_type, hours, 1, manual_gap)
+    break_time, to_break, _ = cycle(work, short_break, long_break, auto_start_break,
+                                    auto_start_work, auto_break_type, manual_gap)
+    works, breaks = plan["work_sessions"], plan["breaks"]
+    # Work and break sessions alternate, so one day interleaves two
+    # arithmetic sequences and the other days are copies shifted by 24 h.
+    offsets = np.empty(works + breaks, dtype=np.int64)
+    offsets[0::2] = np.arange(works) * plan["period"]
+    offsets[1::2] = np.arange(breaks) * plan["period"] + work + to_break
+    lengths = np.empty_like(offsets)
+    lengths[0::2] = work
+    lengths[1::2] = break_time
+    modes = np.empty(len(offsets), dtype=np.int8)
+    modes[0::2] = MODES.index("work")
+    modes[1::2] = MODES.index(plan["break_mode"])
+
+    starts = (np.arange(days, dtype=np.int64)[:, None] * 86400 + day_start + offsets).ravel()
+    return {
+        "start": starts,
+        "end": starts + np.tile(lengths, days),
+        "mode": np.tile(modes, days),
+    }
+
+
+def format_duration(seconds):
+    minutes = int(seconds) // 60
+    return f"{minutes // 60}h{minutes % 60:02d}m"
+
+
+def format_clock(seconds):
+    minutes = int(seconds) // 60
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+def describe(plan, hours=DAY_HOURS):
+    # Short enough for the settings dialog's preview.
+    breaks = plan["break_mode"].split("_")[0]
+    return (f"{hours:g} h day: {plan['work_sessions']} work sessions, "
+            f"{format_duration(plan['focus'])} of focus\n"
+            f"{plan['breaks']} {breaks} breaks ({format_duration(plan['break_time'])}), "
+            f"{plan['manual_starts']} started by hand, "
+            f"done after {format_duration(plan['day_end'])}")
+
+
+def main(argv=None):
+    from config import ConfigStore
+
+    settings = ConfigStore().load()
+    parser = argparse.ArgumentParser(description="Preview a day or week of work and breaks for a timer "
+                                                 "configuration. Defaults come from the saved settings.")
+    parser.add_argument("--work", type=int, default=settings["work_time_min"], help="minutes")
+    parser.add_argument("--short-break", type=int, default=settings["short_break_min"], help="minutes")
+    parser.add_argument("--long-break", type=int, default=settings["long_break_min"], help="minutes")
+    parser.add_argument("--break-type", choices=("short", "long"), default=settings["auto_break_type"])
+    for name, setting, text in (("break", "auto_start_break", "breaks"),
+                                ("work", "auto_start_work", "work after breaks")):
+        parser.add_argument(f"--auto-{name}", dest=setting, action="store_true", help=f"auto-start {text}")
+        parser.add_argument(f"--no-auto-{name}", dest=setting, action="store_false")
+    parser.set_defaults(auto_start_break=settings["auto_start_break"],
+                        auto_start_work=settings["auto_start_work"])
+    parser.add_argument("--start", default="09:00", metavar="HH:MM", help="when each day starts")
+    parser.add_argument("--hours", type=float, default=DAY_HOURS, help="length of each day")
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--manual-gap", type=int, default=MANUAL_GAP,
+                        help="seconds before a session that is not auto-started begins")
+    parser.add_argument("--list", action="store_true", help="print every session")
+    args = parser.parse_args(argv)
+
+    hour, _, minute = args.start.partition(":")
+    options = dict(work=args.work * 60, short_break=args.short_break * 60,
+                   long_break=args.long_break * 60, auto_start_break=args.auto_start_break,
+                   auto_start_work=args.auto_start_work, auto_break_type=args.break_type,
+                   hours=args.hours, days=args.days, manual_gap=args.manual_gap)
+    plan = summarize(**options)
+    print(describe(summarize(**dict(options, days=1)), args.hours))
+    if args.days > 1:
+        print(f"Over {args.days} days: {plan['work_sessions']} work sessions, "
+              f"{format_duration(plan['focus'])} of focus, {plan['breaks']} breaks")
+    if args.list:
+        sessions = schedule(day_start=int(hour) * 3600 + int(minute or 0) * 60, **options)
+        for start, end, mode in zip(sessions["start"], sessions["end"], sessions["mode"]):
+            print(f"  day {start // 86400 + 1}  {format_clock(start)}-{format_clock(end)}  {MODES[mode]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,36 @@
-import sys
+import time
+STARTED_AT = time.perf_counter()
+
 import os
+import sys
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                             QPushButton, QLabel, QDialog, QRadioButton, 
-                            QCheckBox, QButtonGroup, QFrame, QScrollArea,
+                            QCheckBox, QButtonGroup, QScrollArea,
                             QSpinBox, QGridLayout, QGroupBox, QComboBox)
-from PyQt5.QtCore import QTimer, Qt, QTime, QUrl
-from PyQt5.QtGui import QFont, QPalette, QColor, QIcon
+from PyQt5.QtCore import QTimer, Qt, QEvent, QSize, QVariantAnimation, QEasingCurve
+from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import QSystemTrayIcon
 from PyQt5.QtCore import pyqtSignal
-from PyQt5.QtMultimedia import QSoundEffect
-import platform
+import math
+from engine import TimerEngine, MODE_LABELS
+from sounds import NotificationPlayer, SOUND_LABELS
+from themes import set_state, stylesheet
+from config import RANGES, ConfigStore
+from checkpoint import Checkpointer
+from countdown_widget import CountdownDisplay
+from planner import describe, summarize
+
+# Window sizes of the full and zen layouts, keyed by zen_mode.
+LAYOUT_SIZES = {False: QSize(320, 400), True: QSize(320, 240)}
+ZEN_RESIZE_MS = 120
 
 class SettingsDialog(QDialog):
     themeChanged = pyqtSignal(str)
     
     def __init__(self, parent=None, current_theme='dark', mute_enabled=False, 
                  work_time=25, short_break=5, long_break=15,
-                 auto_start_break=False, auto_start_work=False, auto_break_type="short"):
+                 auto_start_break=False, auto_start_work=False, auto_break_type="short",
+                 sound="chime", progress_ring=False):
         super().__init__(parent)
         self.setWindowTitle("Settings - Pomodora")
         self.setMinimumSize(350, 400)
@@ -36,16 +50,14 @@ class SettingsDialog(QDialog):
         self.dark_radio = QRadioButton("Dark Mode")
         self.light_radio = QRadioButton("Light Mode")
         
-        if current_theme == 'dark':
-            self.dark_radio.setChecked(True)
-        else:
-            self.light_radio.setChecked(True)
-            
         self.theme_group.addButton(self.dark_radio)
         self.theme_group.addButton(self.light_radio)
         
         theme_layout.addWidget(self.dark_radio)
         theme_layout.addWidget(self.light_radio)
+        
+        self.progress_ring_checkbox = QCheckBox("Show progress ring")
+        theme_layout.addWidget(self.progress_ring_checkbox)
         theme_group.setLayout(theme_layout)
         content_layout.addWidget(theme_group)
         
@@ -54,20 +66,17 @@ class SettingsDialog(QDialog):
         
         timer_layout.addWidget(QLabel("Work:"), 0, 0)
         self.work_time_spin = QSpinBox()
-        self.work_time_spin.setRange(1, 120)
-        self.work_time_spin.setValue(work_time)
+        self.work_time_spin.setRange(*RANGES["work_time_min"])
         timer_layout.addWidget(self.work_time_spin, 0, 1)
         
         timer_layout.addWidget(QLabel("Short Break:"), 1, 0)
         self.short_break_spin = QSpinBox()
-        self.short_break_spin.setRange(1, 30)
-        self.short_break_spin.setValue(short_break)
+        self.short_break_spin.setRange(*RANGES["short_break_min"])
         timer_layout.addWidget(self.short_break_spin, 1, 1)
         
         timer_layout.addWidget(QLabel("Long Break:"), 2, 0)
         self.long_break_spin = QSpinBox()
-        self.long_break_spin.setRange(1, 60)
-        self.long_break_spin.setValue(long_break)
+        self.long_break_spin.setRange(*RANGES["long_break_min"])
         timer_layout.addWidget(self.long_break_spin, 2, 1)
         
         timer_group.setLayout(timer_layout)
@@ -77,32 +86,53 @@ class SettingsDialog(QDialog):
         auto_layout = QVBoxLayout()
         
         self.auto_start_break = QCheckBox("Auto-start break after work timer")
-        self.auto_start_break.setChecked(auto_start_break)
         auto_layout.addWidget(self.auto_start_break)
         
         break_type_layout = QHBoxLayout()
         break_type_layout.addWidget(QLabel("Break type:"))
         self.break_type_combo = QComboBox()
         self.break_type_combo.addItems(["Short Break", "Long Break"])
-        if auto_break_type == "long":
-            self.break_type_combo.setCurrentIndex(1)
         break_type_layout.addWidget(self.break_type_combo)
         auto_layout.addLayout(break_type_layout)
         
         self.auto_start_work = QCheckBox("Auto-start work timer after break")
-        self.auto_start_work.setChecked(auto_start_work)
         auto_layout.addWidget(self.auto_start_work)
         
         auto_group.setLayout(auto_layout)
         content_layout.addWidget(auto_group)
         
+        plan_group = QGroupBox("Day Preview")
+        plan_layout = QVBoxLayout()
+        
+        self.plan_label = QLabel()
+        self.plan_label.setWordWrap(True)
+        plan_layout.addWidget(self.plan_label)
+        
+        plan_group.setLayout(plan_layout)
+        content_layout.addWidget(plan_group)
+        
+        # The plan is closed-form, so it is simply recomputed on every change,
+        # including each step while a spin box is being dragged.
+        for spin in (self.work_time_spin, self.short_break_spin, self.long_break_spin):
+            spin.valueChanged.connect(self.update_plan_preview)
+        self.auto_start_break.toggled.connect(self.update_plan_preview)
+        self.auto_start_work.toggled.connect(self.update_plan_preview)
+        self.break_type_combo.currentIndexChanged.connect(self.update_plan_preview)
+        
         sound_group = QGroupBox("Sound Settings")
         sound_layout = QVBoxLayout()
         
         self.mute_checkbox = QCheckBox("Mute Sound Notifications")
-        self.mute_checkbox.setChecked(mute_enabled)
         sound_layout.addWidget(self.mute_checkbox)
         
+        sound_choice_layout = QHBoxLayout()
+        sound_choice_layout.addWidget(QLabel("Sound:"))
+        self.sound_combo = QComboBox()
+        for name, label in SOUND_LABELS.items():
+            self.sound_combo.addItem(label, name)
+        sound_choice_layout.addWidget(self.sound_combo)
+        sound_layout.addLayout(sound_choice_layout)
+        
         sound_group.setLayout(sound_layout)
         content_layout.addWidget(sound_group)
         
@@ -135,6 +165,42 @@ class SettingsDialog(QDialog):
         self.dark_radio.toggled.connect(self.on_theme_change)
         self.light_radio.toggled.connect(self.on_theme_change)
         
+        self.load_values(current_theme, mute_enabled, work_time, short_break, long_break,
+                         auto_start_break, auto_start_work, auto_break_type, sound, progress_ring)
+        
+    def load_values(self, current_theme, mute_enabled, work_time, short_break, long_break,
+                    auto_start_break, auto_start_work, auto_break_type, sound="chime",
+                    progress_ring=False):
+        for radio in (self.dark_radio, self.light_radio):
+            radio.blockSignals(True)
+        if current_theme == 'dark':
+            self.dark_radio.setChecked(True)
+        else:
+            self.light_radio.setChecked(True)
+        for radio in (self.dark_radio, self.light_radio):
+            radio.blockSignals(False)
+        self.progress_ring_checkbox.setChecked(progress_ring)
+            
+        self.work_time_spin.setValue(work_time)
+        self.short_break_spin.setValue(short_break)
+        self.long_break_spin.setValue(long_break)
+        
+        self.auto_start_break.setChecked(auto_start_break)
+        self.break_type_combo.setCurrentIndex(1 if auto_break_type == "long" else 0)
+        self.auto_start_work.setChecked(auto_start_work)
+        
+        self.mute_checkbox.setChecked(mute_enabled)
+        self.sound_combo.setCurrentIndex(max(0, self.sound_combo.findData(sound)))
+        # Values that did not change emit nothing, so the preview is not
+        # left to the change signals.
+        self.update_plan_preview()
+        
+    def update_plan_preview(self):
+        plan = summarize(self.get_work_time() * 60, self.get_short_break_time() * 60,
+                         self.get_long_break_time() * 60, self.get_auto_start_break(),
+                         self.get_auto_start_work(), self.get_auto_break_type())
+        self.plan_label.setText(describe(plan))
+        
     def on_theme_change(self):
         theme = 'dark' if self.dark_radio.isChecked() else 'light'
         self.themeChanged.emit(theme)
@@ -142,6 +208,12 @@ class SettingsDialog(QDialog):
     def is_muted(self):
         return self.mute_checkbox.isChecked()
     
+    def get_sound(self):
+        return self.sound_combo.currentData()
+    
+    def get_progress_ring(self):
+        return self.progress_ring_checkbox.isChecked()
+    
     def get_work_time(self):
         return self.work_time_spin.value()
     
@@ -162,39 +234,74 @@ class SettingsDialog(QDialog):
 
 
 class PomodoroTimer(QWidget):
-    def __init__(self):
+    def __init__(self, profiler=None):
         super().__init__()
-        self.time_left = 25 * 60
-        self.is_running = False
-        self.current_mode = "work"
-        self.theme = "dark"
-        self.zen_mode = False
-        self.mute = False
-        
-        self.work_time_min = 25
-        self.short_break_min = 5
-        self.long_break_min = 15
-        
-        self.work_time = self.work_time_min * 60
-        self.short_break_time = self.short_break_min * 60
-        self.long_break_time = self.long_break_min * 60
+        if profiler is not None:
+            profiler.instrument(self)
+        self.config = ConfigStore()
+        settings = self.config.load()
         
-        self.auto_start_break = False
-        self.auto_start_work = False
-        self.auto_break_type = "short"
+        self.theme = settings["theme"]
+        self.applied_theme = None
+        self.zen_mode = False
+        self.mute = settings["mute"]
+        self.sound = settings["sound"]
+        self.progress_ring = settings["progress_ring"]
+        self.player = None
+        
+        self.work_time_min = settings["work_time_min"]
+        self.short_break_min = settings["short_break_min"]
+        self.long_break_min = settings["long_break_min"]
+        
+        self.engine = TimerEngine(
+            work_time=self.work_time_min * 60,
+            short_break_time=self.short_break_min * 60,
+            long_break_time=self.long_break_min * 60,
+            auto_start_break=settings["auto_start_break"],
+            auto_start_work=settings["auto_start_work"],
+            auto_break_type=settings["auto_break_type"]
+        )
+        self.engine.add_listener(self.on_engine_event)
+        
+        self.history = None
+        self.hooks = None
+        self.tray_icon = None
+        self.tray = None
+        self.settings_dialog = None
+        self.stats_dialog = None
+        self.timers_panel = None
+        self.control = None
+        self.state_stream = None
+        self.group = None
+        self.single_instance = False
+        self.startup_done = False
+        self.startup_report = None
         
         self.init_ui()
         self.apply_theme()
+        self.update_display()
+        
+        self.zen_resize_ms = ZEN_RESIZE_MS
+        self.resize_animation = QVariantAnimation(self)
+        self.resize_animation.setEasingCurve(QEasingCurve.OutCubic)
+        self.resize_animation.valueChanged.connect(self.setFixedSize)
+        self.resize_animation.finished.connect(self.finish_layout_state)
         
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.update_timer)
         
-        self.setup_tray()
+        # Pick up a session that was running or paused when the previous
+        # process ended, then record every later transition.
+        self.checkpoint = Checkpointer()
+        self.checkpoint.restore(self.engine)
+        self.engine.add_listener(self.checkpoint.on_engine_event)
         
     def init_ui(self):
         self.setWindowTitle("Pomodora")
         self.setWindowFlags(Qt.FramelessWindowHint)
-        self.setFixedSize(320, 400)
+        self.setFixedSize(LAYOUT_SIZES[False])
         
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(20, 20, 20, 20)
@@ -219,6 +326,13 @@ class PomodoroTimer(QWidget):
         title_layout.addWidget(title_area)
         title_layout.addStretch()
         
+        self.timers_btn = QPushButton("≡")
+        self.timers_btn.setFixedSize(30, 30)
+        self.timers_btn.setFont(QFont("Arial", 14))
+        self.timers_btn.setToolTip("Task timers")
+        self.timers_btn.clicked.connect(self.show_timers)
+        title_layout.addWidget(self.timers_btn)
+        
         self.close_btn = QPushButton("×")
         self.close_btn.setFixedSize(30, 30)
         self.close_btn.setFont(QFont("Arial", 16))
@@ -232,13 +346,15 @@ class PomodoroTimer(QWidget):
         self.mode_label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(self.mode_label)
         
-        self.time_display = QLabel("25:00")
+        self.time_display = CountdownDisplay()
         self.time_display.setFont(QFont("Arial", 48, QFont.Bold))
-        self.time_display.setAlignment(Qt.AlignCenter)
+        self.time_display.set_ring(self.progress_ring)
         main_layout.addWidget(self.time_display)
         
         control_layout = QHBoxLayout()
         self.start_btn = QPushButton("START")
+        self.start_btn.setObjectName("start_btn")
+        self.start_btn.setProperty("running", False)
         self.start_btn.setFixedHeight(40)
         self.start_btn.setFont(QFont("Arial", 10, QFont.Bold))
         self.start_btn.clicked.connect(self.toggle_timer)
@@ -252,7 +368,9 @@ class PomodoroTimer(QWidget):
         control_layout.addWidget(self.reset_btn)
         main_layout.addLayout(control_layout)
         
-        mode_layout = QHBoxLayout()
+        self.mode_bar = QWidget()
+        mode_layout = QHBoxLayout(self.mode_bar)
+        mode_layout.setContentsMargins(0, 0, 0, 0)
         self.work_btn = QPushButton("Work")
         self.short_break_btn = QPushButton("Short Break")
         self.long_break_btn = QPushButton("Long Break")
@@ -267,7 +385,7 @@ class PomodoroTimer(QWidget):
         mode_layout.addWidget(self.work_btn)
         mode_layout.addWidget(self.short_break_btn)
         mode_layout.addWidget(self.long_break_btn)
-        main_layout.addLayout(mode_layout)
+        main_layout.addWidget(self.mode_bar)
         
         feature_layout = QHBoxLayout()
         self.zen_btn = QPushButton("Zen Mode")
@@ -279,8 +397,13 @@ class PomodoroTimer(QWidget):
         self.settings_btn.setFixedHeight(35)
         self.settings_btn.clicked.connect(self.show_settings)
         
+        self.stats_btn = QPushButton("Stats")
+        self.stats_btn.setFixedHeight(35)
+        self.stats_btn.clicked.connect(self.show_stats)
+        
         feature_layout.addWidget(self.zen_btn)
         feature_layout.addWidget(self.settings_btn)
+        feature_layout.addWidget(self.stats_btn)
         main_layout.addLayout(feature_layout)
         
         self.footer_label = QLabel("by Supun Hewagamage • github.com/supunhg")
@@ -290,6 +413,11 @@ class PomodoroTimer(QWidget):
         
         self.setLayout(main_layout)
         
+        # Everything zen mode hides. Both layouts share this one widget tree,
+        # so switching never re-creates the native window.
+        self.full_only = [self.mode_label, self.reset_btn, self.mode_bar,
+                          self.settings_btn, self.stats_btn, self.footer_label]
+        
         self.oldPos = self.pos()
         
     def mousePressEvent(self, event):
@@ -304,261 +432,397 @@ class PomodoroTimer(QWidget):
             self.move(self.x() + delta.x(), self.y() + delta.y())
             self.oldPos = event.globalPos()
             
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.startup_done:
+            self.startup_done = True
+            if self.startup_report is not None:
+                self.startup_report.mark("first paint")
+            QTimer.singleShot(0, self.finish_startup)
+            
+    def finish_startup(self):
+        from history import HistoryWriter
+        
+        self.history = HistoryWriter()
+        self.history.start()
+        self.engine.add_listener(self.history.on_engine_event)
+        
+        self.player = NotificationPlayer(self)
+        self.player.preload(self.sound)
+        
+        self.setup_tray()
+        
+        from hooks import HookPool, load_hooks
+        hooks = load_hooks()
+        if hooks:
+            self.hooks = HookPool(hooks)
+            self.hooks.start()
+            self.engine.add_listener(self.hooks.on_engine_event)
+        
+        if self.single_instance:
+            from control_server import ControlServer
+            self.control = ControlServer(self)
+            self.control.listen()
+            
+            from state_stream import StateStream
+            self.state_stream = StateStream()
+            self.state_stream.start()
+            self.state_stream.on_engine_event("snapshot", self.engine)
+            self.engine.add_listener(self.state_stream.on_engine_event)
+        
+        if self.startup_report is not None:
+            self.startup_report.mark("deferred startup")
+            self.startup_report.finish()
+            
+    def closeEvent(self, event):
+        self.config.flush()
+        self.checkpoint.close()
+        if self.control is not None:
+            self.control.close()
+        if self.state_stream is not None:
+            self.state_stream.close()
+        if self.group is not None:
+            self.group.close()
+        if self.hooks is not None:
+            self.hooks.close()
+        if self.history is not None:
+            self.history.close()
+        super().closeEvent(event)
+        
     def setup_tray(self):
         self.tray_icon = QSystemTrayIcon(self)
         self.tray_icon.setToolTip("Pomodora Timer")
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            from tray_icons import TrayCountdown
+            self.tray = TrayCountdown(self.tray_icon)
+            self.update_tray()
+            self.tray_icon.show()
+            
+    def update_tray(self):
+        if self.tray is not None:
+            self.tray.update(self.theme, self.engine.current_mode,
+                             self.engine.countdown.time_remaining(), self.engine.duration())
         
     def apply_theme(self):
-        if self.theme == "dark":
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #1e1e1e;
-                    color: #ffffff;
-                }
-                QPushButton {
-                    background-color: #2d2d2d;
-                    color: #ffffff;
-                    border: none;
-                    border-radius: 5px;
-                    padding: 8px;
-                }
-                QPushButton:hover {
-                    background-color: #3d3d3d;
-                }
-                QPushButton:pressed {
-                    background-color: #4d4d4d;
-                }
-                QPushButton:checked {
-                    background-color: #3d3d3d;
-                    border: 1px solid #5d5d5d;
-                }
-                QPushButton#start_btn {
-                    background-color: #4CAF50;
-                }
-                QPushButton#start_btn:hover {
-                    background-color: #45a049;
-                }
-                QPushButton#pause_btn {
-                    background-color: #f44336;
-                }
-                QPushButton#pause_btn:hover {
-                    background-color: #e53935;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #f5f5f5;
-                    color: #333333;
-                }
-                QPushButton {
-                    background-color: #ffffff;
-                    color: #333333;
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    padding: 8px;
-                }
-                QPushButton:hover {
-                    background-color: #e8e8e8;
-                }
-                QPushButton:pressed {
-                    background-color: #d8d8d8;
-                }
-                QPushButton:checked {
-                    background-color: #e0e0e0;
-                    border: 1px solid #ccc;
-                }
-                QPushButton#start_btn {
-                    background-color: #4CAF50;
-                    color: white;
-                    border: none;
-                }
-                QPushButton#start_btn:hover {
-                    background-color: #45a049;
-                }
-                QPushButton#pause_btn {
-                    background-color: #f44336;
-                    color: white;
-                    border: none;
-                }
-                QPushButton#pause_btn:hover {
-                    background-color: #e53935;
-                }
-            """)
-        
-        if self.is_running:
-            self.start_btn.setObjectName("pause_btn")
+        if self.applied_theme == self.theme:
+            return
+        self.applied_theme = self.theme
+        self.setStyleSheet(stylesheet(self.theme))
+        
+    def on_engine_event(self, event, engine):
+        if engine.is_running:
+            self.schedule_tick()
         else:
-            self.start_btn.setObjectName("start_btn")
+            self.timer.stop()
+            
+        if event == "finish":
+            self.timer_finished()
+        elif event in ("mode", "restore"):
+            self.mode_label.setText(MODE_LABELS[engine.current_mode])
+            
+        self.time_display.set_progress(engine.countdown.time_remaining(), engine.duration(),
+                                       engine.is_running)
+        self.update_controls()
+        self.update_display()
+        self.update_tray()
+        
+    def update_controls(self):
+        running = self.engine.is_running
+        self.start_btn.setText("PAUSE" if running else "START")
+        set_state(self.start_btn, "running", running)
         
     def toggle_timer(self):
-        if self.is_running:
-            self.timer.stop()
-            self.start_btn.setText("START")
-            self.start_btn.setObjectName("start_btn")
+        if self.group is not None and self.group.following:
+            self.group.command("toggle")
         else:
-            self.timer.start(1000)
-            self.start_btn.setText("PAUSE")
-            self.start_btn.setObjectName("pause_btn")
-        self.is_running = not self.is_running
-        self.style().unpolish(self.start_btn)
-        self.style().polish(self.start_btn)
+            self.engine.toggle()
+        
+    def start_timer(self):
+        if self.group is not None and self.group.following:
+            self.group.command("start")
+        else:
+            self.engine.start()
+        
+    def pause_timer(self):
+        if self.group is not None and self.group.following:
+            self.group.command("pause")
+        else:
+            self.engine.pause()
+        
+    def ui_visible(self):
+        return self.isVisible() and not self.isMinimized()
+        
+    def schedule_tick(self):
+        delay, precise = self.engine.countdown.next_wakeup(self.ui_visible())
+        if not precise and self.tray is not None:
+            # Hidden, but the tray icon still changes every few dozen seconds.
+            change = self.tray.next_change(self.engine.countdown.time_remaining(), self.engine.duration())
+            if change is not None:
+                delay = min(delay, change)
+        self.timer.setTimerType(Qt.PreciseTimer if precise else Qt.VeryCoarseTimer)
+        self.timer.start(int(math.ceil(delay * 1000)))
         
     def update_timer(self):
-        if self.time_left > 0:
-            self.time_left -= 1
+        if not self.engine.tick():
+            self.schedule_tick()
+        if self.ui_visible():
             self.update_display()
+        self.update_tray()
+            
+    def visibility_changed(self):
+        if not self.engine.is_running:
+            return
+        if self.ui_visible():
+            self.update_timer()
         else:
-            self.timer_finished()
+            self.schedule_tick()
+            
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.visibility_changed()
+        
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.visibility_changed()
+        
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.visibility_changed()
             
     def update_display(self):
-        minutes = self.time_left // 60
-        seconds = self.time_left % 60
-        self.time_display.setText(f"{minutes:02d}:{seconds:02d}")
+        self.time_display.set_time(self.engine.time_left)
         
     def reset_timer(self):
-        self.timer.stop()
-        self.is_running = False
-        self.start_btn.setText("START")
-        self.start_btn.setObjectName("start_btn")
-        self.style().unpolish(self.start_btn)
-        self.style().polish(self.start_btn)
-        
-        if self.current_mode == "work":
-            self.time_left = self.work_time
-        elif self.current_mode == "short_break":
-            self.time_left = self.short_break_time
+        if self.group is not None and self.group.following:
+            self.group.command("reset")
         else:
-            self.time_left = self.long_break_time
-            
-        self.update_display()
+            self.engine.reset()
         
     def change_mode(self, mode):
-        self.current_mode = mode
-        self.timer.stop()
-        self.is_running = False
-        self.start_btn.setText("START")
-        self.start_btn.setObjectName("start_btn")
-        self.style().unpolish(self.start_btn)
-        self.style().polish(self.start_btn)
-        
-        if mode == "work":
-            self.time_left = self.work_time
-            self.mode_label.setText("WORK TIME")
-        elif mode == "short_break":
-            self.time_left = self.short_break_time
-            self.mode_label.setText("SHORT BREAK")
+        if self.group is not None and self.group.following:
+            self.group.command("mode", mode)
         else:
-            self.time_left = self.long_break_time
-            self.mode_label.setText("LONG BREAK")
-            
-        self.update_display()
+            self.engine.change_mode(mode)
         
     def timer_finished(self):
-        self.timer.stop()
-        self.is_running = False
-        self.start_btn.setText("START")
-        self.start_btn.setObjectName("start_btn")
-        self.style().unpolish(self.start_btn)
-        self.style().polish(self.start_btn)
+        self.notify(f"{self.mode_label.text()} finished!")
+        
+    def task_finished(self, name, mode):
+        self.notify(f"{name}: {MODE_LABELS[mode]} finished!")
+        if self.hooks is not None:
+            self.hooks.dispatch({"event": "finish", "mode": mode, "task": name, "ts": time.time()})
         
+    def notify(self, message):
         if not self.mute:
             self.play_notification_sound()
         
-        mode_text = self.mode_label.text()
+        if self.tray_icon is None:
+            self.setup_tray()
+            
         self.tray_icon.showMessage(
             "Pomodora Timer",
-            f"{mode_text} finished!",
+            message,
             QSystemTrayIcon.Information,
             3000
         )
         
-        if self.current_mode == "work" and self.auto_start_break:
-            break_type = "long_break" if self.auto_break_type == "long" else "short_break"
-            self.change_mode(break_type)
-            self.toggle_timer()
-        elif (self.current_mode == "short_break" or self.current_mode == "long_break") and self.auto_start_work:
-            self.change_mode("work")
-            self.toggle_timer()
-            
     def play_notification_sound(self):
-        QApplication.beep()
-        if platform.system() == "Linux":
-            os.system('paplay /usr/share/sounds/freedesktop/stereo/complete.oga 2>/dev/null &')
+        if self.player is None:
+            QApplication.beep()
+        else:
+            self.player.play(self.sound)
             
     def toggle_zen_mode(self):
         self.zen_mode = self.zen_btn.isChecked()
-        
-        pos = self.pos()
-        
-        if self.zen_mode:
-            self.mode_label.hide()
-            self.reset_btn.hide()
-            self.work_btn.hide()
-            self.short_break_btn.hide()
-            self.long_break_btn.hide()
-            self.settings_btn.hide()
-            self.footer_label.hide()
+        self.set_layout_state(self.zen_mode)
+        
+    def set_layout_state(self, zen):
+        size = LAYOUT_SIZES[zen]
+        self.resize_animation.stop()
+        if not self.zen_resize_ms or not self.isVisible():
+            self.show_full_widgets(not zen)
+            self.setFixedSize(size)
+            return
+        # Collapse the content before shrinking; when growing, the extra
+        # widgets appear once there is room for them.
+        if zen:
+            self.show_full_widgets(False)
+        self.resize_animation.setDuration(self.zen_resize_ms)
+        self.resize_animation.setStartValue(self.size())
+        self.resize_animation.setEndValue(size)
+        self.resize_animation.start()
+        
+    def finish_layout_state(self):
+        if not self.zen_mode:
+            self.show_full_widgets(True)
             
-            self.setWindowFlags(Qt.FramelessWindowHint)
-            self.setFixedSize(320, 240)
-        else:
-            self.mode_label.show()
-            self.reset_btn.show()
-            self.work_btn.show()
-            self.short_break_btn.show()
-            self.long_break_btn.show()
-            self.settings_btn.show()
-            self.footer_label.show()
-            
-            self.setWindowFlags(Qt.FramelessWindowHint)
-            self.setFixedSize(320, 400)
-        
-        self.show()
-        self.move(pos)
+    def show_full_widgets(self, visible):
+        # One repaint for the whole swap instead of one per widget.
+        self.setUpdatesEnabled(False)
+        for widget in self.full_only:
+            widget.setVisible(visible)
+        self.setUpdatesEnabled(True)
             
     def show_settings(self):
-        dialog = SettingsDialog(
-            self, 
+        values = (
             self.theme, 
             self.mute,
             self.work_time_min,
             self.short_break_min,
             self.long_break_min,
-            self.auto_start_break,
-            self.auto_start_work,
-            self.auto_break_type
+            self.engine.auto_start_break,
+            self.engine.auto_start_work,
+            self.engine.auto_break_type,
+            self.sound,
+            self.progress_ring
         )
-        dialog.themeChanged.connect(self.change_theme)
+        if self.settings_dialog is None:
+            self.settings_dialog = SettingsDialog(self, *values)
+            self.settings_dialog.themeChanged.connect(self.change_theme)
+        else:
+            self.settings_dialog.load_values(*values)
+        dialog = self.settings_dialog
         
         if dialog.exec_():
             self.mute = dialog.is_muted()
+            self.sound = dialog.get_sound()
+            if self.player is not None:
+                self.player.preload(self.sound)
             
             self.work_time_min = dialog.get_work_time()
             self.short_break_min = dialog.get_short_break_time()
             self.long_break_min = dialog.get_long_break_time()
             
-            self.work_time = self.work_time_min * 60
-            self.short_break_time = self.short_break_min * 60
-            self.long_break_time = self.long_break_min * 60
+            self.engine.set_durations(
+                self.work_time_min * 60,
+                self.short_break_min * 60,
+                self.long_break_min * 60
+            )
+            
+            self.engine.auto_start_break = dialog.get_auto_start_break()
+            self.engine.auto_start_work = dialog.get_auto_start_work()
+            self.engine.auto_break_type = dialog.get_auto_break_type()
             
-            self.auto_start_break = dialog.get_auto_start_break()
-            self.auto_start_work = dialog.get_auto_start_work()
-            self.auto_break_type = dialog.get_auto_break_type()
+            self.progress_ring = dialog.get_progress_ring()
+            self.time_display.set_ring(self.progress_ring)
             
-            if not self.is_running:
+            self.config.update(
+                mute=self.mute,
+                sound=self.sound,
+                work_time_min=self.work_time_min,
+                short_break_min=self.short_break_min,
+                long_break_min=self.long_break_min,
+                auto_start_break=self.engine.auto_start_break,
+                auto_start_work=self.engine.auto_start_work,
+                auto_break_type=self.engine.auto_break_type,
+                progress_ring=self.progress_ring
+            )
+            
+            if not self.engine.is_running:
                 self.reset_timer()
         
+    def show_timers(self):
+        from multi_timer import MultiTimerPanel
+        
+        if self.timers_panel is None:
+            self.timers_panel = MultiTimerPanel(self)
+            self.timers_panel.model.finished.connect(self.task_finished)
+        self.timers_panel.show()
+        self.timers_panel.raise_()
+        self.timers_panel.activateWindow()
+        
+    def show_stats(self):
+        from stats_view import StatsDialog
+        
+        if self.stats_dialog is None:
+            self.stats_dialog = StatsDialog(self, self.history.path)
+        self.stats_dialog.refresh()
+        self.stats_dialog.exec_()
+        
     def change_theme(self, theme):
         self.theme = theme
         self.apply_theme()
+        self.update_tray()
+        self.config.update(theme=theme)
         
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
+def main(argv=None):
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Pomodora - a minimalistic Pomodoro timer")
+    parser.add_argument("--startup-timing", action="store_true",
+                        help="report time to first paint and per-module import cost, then exit")
+    parser.add_argument("--startup-budget", type=float, default=None, metavar="MS",
+                        help="with --startup-timing, exit non-zero if first paint takes longer")
+    parser.add_argument("--profile", action="store_true",
+                        help="record tick jitter, handler durations and event-loop lag "
+                             "(also enabled by POMODORA_PROFILE=1)")
+    parser.add_argument("--profile-port", type=int, default=None, metavar="PORT",
+                        help="port for the local metrics endpoint while profiling, 0 to disable")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--group-host", metavar="[ADDR]:PORT",
+                       help="share this timer's cycles with a team that joins on this address")
+    group.add_argument("--group-join", metavar="HOST:PORT",
+                       help="follow a team timer hosted elsewhere")
+    args, qt_args = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    
+    # A second launch brings the running window forward instead of opening
+    # another one. Startup timing always measures a fresh window.
+    instance_lock = None
+    if not args.startup_timing:
+        import control
+        if control.SINGLE_INSTANCE:
+            instance_lock = control.acquire_instance_lock()
+            if instance_lock is None:
+                if control.show_running_instance() is None:
+                    print("another pomodora instance is starting but not answering", file=sys.stderr)
+                    return 1
+                return 0
+    
+    app = QApplication([sys.argv[0]] + qt_args)
     app.setApplicationName("Pomodora")
     
-    window = PomodoroTimer()
+    report = None
+    if args.startup_timing:
+        from startup_timing import StartupReport
+        report = StartupReport(STARTED_AT, app, budget_ms=args.startup_budget)
+        report.mark("imports")
+        
+    profiler = None
+    if args.profile or os.environ.get("POMODORA_PROFILE", "") not in ("", "0"):
+        from profiling import DEFAULT_PORT, Profiler
+        port = DEFAULT_PORT if args.profile_port is None else args.profile_port
+        profiler = Profiler(port=port)
+        
+    window = PomodoroTimer(profiler)
+    window.startup_report = report
+    window.single_instance = instance_lock is not None
+    if args.group_host or args.group_join:
+        from group_hub import parse_address
+        from group_session import GroupSession
+        window.group = GroupSession(window)
+        if args.group_host:
+            address, _, port = args.group_host.rpartition(":")
+            window.group.host(address, int(port))
+        else:
+            window.group.join(*parse_address(args.group_join))
     window.show()
+    if report is not None:
+        report.mark("window constructed")
+    if profiler is not None:
+        profiler.start()
+        print(f"profiling to {profiler.path}"
+              + (f", metrics on http://127.0.0.1:{profiler.port}/metrics" if profiler.port else ""),
+              file=sys.stderr)
     
-    sys.exit(app.exec_())
\ No newline at end of file
+    status = app.exec_()
+    if profiler is not None:
+        profiler.stop()
+    if report is not None:
+        status = report.print_report()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+import bisect
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+from PyQt5.QtCore import QTimer, Qt
+
+from paths import cache_dir
+
+
+# Upper bucket bounds in milliseconds; anything slower lands in the last,
+# open-ended bucket. Memory per histogram is fixed whatever the run length.
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+HANDLERS = ("update_timer", "timer_finished", "apply_theme", "toggle_zen_mode")
+
+PROBE_INTERVAL_MS = 250
+EXPORT_INTERVAL_S = 60
+DEFAULT_PORT = 9464
+
+
+def log_path():
+    return os.path.join(cache_dir(), "profile.log")
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "low", "high")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.low = None
+        self.high = None
+
+    def record(self, value):
+        self.counts[bisect.bisect_left(BUCKETS_MS, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.low is None or value < self.low:
+            self.low = value
+        if self.high is None or value > self.high:
+            self.high = value
+
+    def percentile(self, q):
+        # Reported as the upper bound of the bucket holding the q-th value.
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.high
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total, 3),
+            "min_ms": self.low,
+            "max_ms": self.high,
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "buckets": list(self.counts),
+        }
+
+
+class Profiler:
+    def __init__(self, port=DEFAULT_PORT, path=None, clock=time.perf_counter):
+        self.clock = clock
+        self.port = port
+        self.path = path or log_path()
+        self.histograms = {name: Histogram() for name in
+                           ("tick_jitter", "coarse_wakeup_jitter", "loop_lag")
+                           + tuple(f"handler.{name}" for name in HANDLERS)}
+        self.started_at = clock()
+        self.tick_due = None
+        self.tick_precise = True
+        self.probe = None
+        self.probe_due = None
+        self.last_export = None
+        self.logger = None
+        self.server = None
+
+    def instrument(self, window):
+        # Wrap the handlers on this one instance only, before any signal is
+        # connected to them; without a profiler nothing is wrapped at all.
+        for name in HANDLERS:
+            setattr(window, name, self.timed(name, getattr(window, name)))
+        update_timer = window.update_timer
+        schedule_tick = window.schedule_tick
+
+        @functools.wraps(update_timer)
+        def tick(*args):
+            if self.tick_due is not None and not window.timer.isActive():
+                jitter = (self.clock() - self.tick_due) * 1000
+                key = "tick_jitter" if self.tick_precise else "coarse_wakeup_jitter"
+                self.histograms[key].record(max(0.0, jitter))
+                self.tick_due = None
+            return update_timer(*args)
+
+        @functools.wraps(schedule_tick)
+        def schedule(*args):
+            result = schedule_tick(*args)
+            self.tick_due = self.clock() + window.timer.interval() / 1000
+            self.tick_precise = window.timer.timerType() == Qt.PreciseTimer
+            return result
+
+        window.update_timer = tick
+        window.schedule_tick = schedule
+
+    def timed(self, name, handler):
+        histogram = self.histograms[f"handler.{name}"]
+        clock = self.clock
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                histogram.record((clock() - started) * 1000)
+        return wrapper
+
+    def start(self):
+        self.logger = logging.getLogger("pomodora.profile")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(RotatingFileHandler(self.path, maxBytes=1 << 20, backupCount=3))
+        self.last_export = self.clock()
+
+        # Event-loop lag: how late a periodic precise timer runs compared to
+        # when it was due.
+        self.probe = QTimer()
+        self.probe.setTimerType(Qt.PreciseTimer)
+        self.probe.timeout.connect(self.on_probe)
+        self.probe_due = self.clock() + PROBE_INTERVAL_MS / 1000
+        self.probe.start(PROBE_INTERVAL_MS)
+
+        if self.port:
+            try:
+                self.server = ThreadingHTTPServer(("127.0.0.1", self.port), self.request_handler())
+            except OSError as exc:
+                # Most likely another instance has the port. The log file
+                # still gets everything, so profiling carries on without it.
+                print(f"profiling: no metrics endpoint on port {self.port}: {exc}", file=sys.stderr)
+                self.port = None
+                return
+            self.port = self.server.server_address[1]
+            threading.Thread(target=self.server.serve_forever, name="pomodora-metrics", daemon=True).start()
+
+    def stop(self):
+        if self.probe is not None:
+            self.probe.stop()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.logger is not None:
+            self.export()
+            for handler in list(self.logger.handlers):
+                handler.close()
+                self.logger.removeHandler(handler)
+
+    def on_probe(self):
+        now = self.clock()
+        self.histograms["loop_lag"].record(max(0.0, (now - self.probe_due) * 1000))
+        self.probe_due = now + PROBE_INTERVAL_MS / 1000
+        if now - self.last_export >= EXPORT_INTERVAL_S:
+            self.export()
+
+    def snapshot(self):
+        return {
+            "uptime_s": round(self.clock() - self.started_at, 3),
+            "buckets_ms": list(BUCKETS_MS),
+            "histograms": {name: histogram.snapshot() for name, histogram in self.histograms.items()},
+        }
+
+    def export(self):
+        self.last_export = self.clock()
+        self.logger.info(json.dumps({"ts": round(time.time(), 3), **self.snapshot()}))
+
+    def prometheus(self):
+        lines = []
+        for name, histogram in self.histograms.items():
+            metric = "pomodora_" + name.replace(".", "_") + "_ms"
+            lines.append(f"# TYPE {metric} histogram")
+            counts = list(histogram.counts)
+            cumulative = 0
+            for bound, count in zip(BUCKETS_MS + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{metric}_sum {histogram.total:.3f}")
+            lines.append(f"{metric}_count {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def request_handler(self):
+        profiler = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = profiler.prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(profiler.snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MetricsHandler
@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+
+from countdown import monotonic
+from engine import TimerEngine
+from paths import runtime_dir
+from timing_wheel import TimingWheel
+
+
+ENGINE_OPTIONS = ("work_time", "short_break_time", "long_break_time",
+                  "auto_start_break", "auto_start_work", "auto_break_type")
+
+SESSION_COMMANDS = ("start", "pause", "toggle", "reset", "mode")
+
+WATCHER_BUFFER_LIMIT = 1 << 20
+
+
+def default_socket_path():
+    return os.path.join(runtime_dir(), "sessions.sock")
+
+
+def session_state(session_id, engine):
+    return {
+        "id": session_id,
+        "mode": engine.current_mode,
+        "running": engine.is_running,
+        "time_left": engine.time_left,
+    }
+
+
+class SessionServer:
+    def __init__(self, clock=monotonic, resolution=0.01):
+        self.clock = clock
+        self.sessions = {}
+        self.watchers = {}
+        self.wheel = TimingWheel(resolution, start=clock())
+        self.on_expire = None
+        self._wakeup = None
+
+    def get(self, session_id):
+        try:
+            return self.sessions[session_id]
+        except KeyError:
+            raise KeyError(f"no such session: {session_id}") from None
+
+    def create(self, session_id, **options):
+        if session_id in self.sessions:
+            raise ValueError(f"session already exists: {session_id}")
+        unknown = set(options).difference(ENGINE_OPTIONS)
+        if unknown:
+            raise ValueError(f"unknown session options: {', '.join(sorted(unknown))}")
+        engine = TimerEngine(clock=self.clock, **options)
+        self.sessions[session_id] = engine
+        return engine
+
+    def delete(self, session_id):
+        self.get(session_id)
+        self.watchers.pop(session_id, None)
+        return self.sessions.pop(session_id)
+
+    def command(self, session_id, op, mode=None):
+        engine = self.get(session_id)
+        deadline = engine.deadline
+        if op == "start":
+            engine.start()
+        elif op == "pause":
+            engine.pause()
+        elif op == "toggle":
+            engine.toggle()
+        elif op == "reset":
+            engine.reset()
+        elif op == "mode":
+            engine.change_mode(mode)
+        else:
+            raise ValueError(f"unknown command: {op}")
+        if engine.deadline is not None and engine.deadline != deadline:
+            self._schedule(session_id, engine)
+        return engine
+
+    def _schedule(self, session_id, engine):
+        self.wheel.schedule(engine.deadline, session_id)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def expire(self, now=None):
+        if now is None:
+            now = self.clock()
+        finished = 0
+        for deadline, session_id in self.wheel.advance(now):
+            engine = self.sessions.get(session_id)
+            # Entries are never removed from the wheel; anything paused,
+            # reset or restarted since it was scheduled is simply stale.
+            if engine is None or engine.deadline != deadline:
+                continue
+            mode = engine.current_mode
+            if not engine.tick():
+                continue
+            finished += 1
+            if self.on_expire is not None:
+                self.on_expire(session_id, deadline, now)
+            if session_id in self.watchers:
+                self._notify(session_id, mode, engine)
+            if engine.is_running:
+                self._schedule(session_id, engine)
+        return finished
+
+    def _notify(self, session_id, finished_mode, engine):
+        message = dict(session_state(session_id, engine), event="finish", finished=finished_mode)
+        line = json.dumps(message).encode() + b"\n"
+        for writer in list(self.watchers[session_id]):
+            if writer.transport.get_write_buffer_size() > WATCHER_BUFFER_LIMIT:
+                self._drop_watcher(writer)
+                writer.close()
+            else:
+                writer.write(line)
+
+    def _drop_watcher(self, writer):
+        for session_id in list(self.watchers):
+            writers = self.watchers[session_id]
+            writers.discard(writer)
+            if not writers:
+                del self.watchers[session_id]
+
+    def handle_request(self, request, writer=None):
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        op = request.get("op")
+        session_id = request.get("id")
+        if op == "create":
+            engine = self.create(session_id, **request.get("options", {}))
+        elif op == "delete":
+            self.delete(session_id)
+            return {"ok": True}
+        elif op == "list":
+            return {"ok": True, "sessions": list(self.sessions)}
+        elif op == "stats":
+            return {"ok": True, "sessions": len(self.sessions), "scheduled": len(self.wheel)}
+        elif op == "status":
+            engine = self.get(session_id)
+        elif op == "watch":
+            engine = self.get(session_id)
+            if writer is None:
+                raise ValueError("watch needs a connection")
+            self.watchers.setdefault(session_id, set()).add(writer)
+        elif op in SESSION_COMMANDS:
+            engine = self.command(session_id, op, request.get("mode"))
+        else:
+            raise ValueError(f"unknown op: {op}")
+        return {"ok": True, "session": session_state(session_id, engine)}
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = self.handle_request(json.loads(line), writer)
+                except (KeyError, ValueError, TypeError) as exc:
+                    response = {"ok": False, "error": exc.args[0] if exc.args else str(exc)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # ValueError here is a line over the stream limit.
+            pass
+        finally:
+            self._drop_watcher(writer)
+            writer.close()
+
+    async def run_expiry(self):
+        self._wakeup = asyncio.Event()
+        while True:
+            if not len(self.wheel):
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            next_tick = (self.wheel.now_tick + 1) * self.wheel.resolution
+            await asyncio.sleep(max(0.0, next_tick - self.clock()))
+            self.expire()
+
+    async def serve(self, path):
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self.handle_client, path)
+        os.chmod(path, 0o600)
+        expiry = asyncio.ensure_future(self.run_expiry())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def request(path, payload, timeout=5.0):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host many Pomodoro sessions in one process.")
+    parser.add_argument("--socket", default=None, help="Unix socket path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("serve", help="run the session server")
+    client = subparsers.add_parser("client", help="send one request to a running server")
+    client.add_argument("op", choices=("create", "delete", "list", "stats", "status") + SESSION_COMMANDS)
+    client.add_argument("id", nargs="?")
+    client.add_argument("--mode", choices=("work", "short_break", "long_break"))
+    client.add_argument("--options", type=json.loads, default={},
+                        help='engine options for create, e.g. \'{"work_time": 1500}\'')
+    args = parser.parse_args(argv)
+    path = args.socket or default_socket_path()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(SessionServer().serve(path))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    payload = {"op": args.op, "id": args.id}
+    if args.mode:
+        payload["mode"] = args.mode
+    if args.options:
+        payload["options"] = args.options
+    response = request(path, payload)
+    print(json.dumps(response))
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import array
+import math
+import os
+import wave
+
+from PyQt5.QtCore import QUrl
+from PyQt5.QtWidgets import QApplication
+
+from paths import cache_dir
+
+
+SAMPLE_RATE = 22050
+
+# Each sound is a list of (frequency in Hz, seconds); a frequency of 0 is a rest.
+SOUNDS = {
+    "chime": ((880, 0.15), (1320, 0.35)),
+    "bell": ((660, 0.9),),
+    "digital": ((1000, 0.08), (0, 0.06), (1000, 0.08), (0, 0.06), (1000, 0.08)),
+}
+
+SOUND_LABELS = {
+    "chime": "Chime",
+    "bell": "Bell",
+    "digital": "Digital",
+}
+
+
+def render_sound(path, notes, volume=0.6):
+    samples = array.array("h")
+    for frequency, seconds in notes:
+        count = int(SAMPLE_RATE * seconds)
+        for i in range(count):
+            if not frequency:
+                samples.append(0)
+                continue
+            t = i / SAMPLE_RATE
+            envelope = math.exp(-4.0 * t / seconds) * min(1.0, i / 200)
+            samples.append(int(32767 * volume * envelope * math.sin(2 * math.pi * frequency * t)))
+    temp_path = path + ".tmp"
+    with wave.open(temp_path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes(samples.tobytes())
+    os.replace(temp_path, path)
+
+
+def sound_path(name):
+    directory = os.path.join(cache_dir(), "sounds")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.wav")
+    if not os.path.exists(path):
+        render_sound(path, SOUNDS[name])
+    return path
+
+
+class NotificationPlayer:
+    def __init__(self, parent=None):
+        try:
+            from PyQt5.QtMultimedia import QSoundEffect
+        except ImportError:
+            QSoundEffect = None
+        self.sound_effect_class = QSoundEffect
+        self.parent = parent
+        self.effects = {}
+
+    @property
+    def available(self):
+        return self.sound_effect_class is not None
+
+    def preload(self, name):
+        if not self.available or name not in SOUNDS:
+            return None
+        effect = self.effects.get(name)
+        if effect is None:
+            # QSoundEffect decodes the file once and keeps the samples, so
+            # replaying a cached effect does no file or decoder work.
+            effect = self.sound_effect_class(self.parent)
+            effect.setSource(QUrl.fromLocalFile(sound_path(name)))
+            self.effects[name] = effect
+        return effect
+
+    def play(self, name):
+        effect = self.preload(name)
+        if effect is None or effect.status() == self.sound_effect_class.Error:
+            QApplication.beep()
+            return False
+        effect.stop()
+        effect.play()
+        return True
@@ -0,0 +1,79 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def import_costs(module):
+    # Measured in a fresh interpreter so modules already loaded by this
+    # process do not hide their cost.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    costs = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            costs.append((name, (len(indent) - 1) // 2, int(self_us), int(cumulative_us)))
+    return costs
+
+
+class StartupReport:
+    def __init__(self, started_at, app, budget_ms=None):
+        self.started_at = started_at
+        self.app = app
+        self.budget_ms = budget_ms
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def elapsed_ms(self, name):
+        for mark, at in self.marks:
+            if mark == name:
+                return (at - self.started_at) * 1000
+        return None
+
+    def finish(self):
+        self.app.quit()
+
+    def print_report(self, module="pomodora", limit=12):
+        print("Startup timeline (ms since pomodora.py began importing):")
+        for name, at in self.marks:
+            print(f"  {name:<20} {(at - self.started_at) * 1000:8.1f}")
+
+        costs = import_costs(module)
+        direct = []
+        children = []
+        total = 0
+        # -X importtime lists every module after its own imports.
+        for cost in costs:
+            if cost[1] == 1:
+                children.append(cost)
+            elif cost[1] == 0:
+                if cost[0] == module:
+                    direct = sorted(children, key=lambda child: -child[3])
+                    total = cost[3]
+                children = []
+        print(f"\nImport cost of '{module}': {total / 1000:.1f} ms, by direct import (cumulative):")
+        for name, _, _, cumulative in direct[:limit]:
+            print(f"  {name:<28} {cumulative / 1000:8.1f} ms")
+        heaviest = sorted(costs, key=lambda cost: -cost[2])[:limit]
+        print("\nHeaviest modules by self time:")
+        for name, _, self_us, _ in heaviest:
+            print(f"  {name:<28} {self_us / 1000:8.1f} ms")
+
+        first_paint = self.elapsed_ms("first paint")
+        if self.budget_ms is not None and first_paint is not None:
+            verdict = "within" if first_paint <= self.budget_ms else "OVER"
+            print(f"\nFirst paint {first_paint:.1f} ms is {verdict} the {self.budget_ms:g} ms budget")
+            return 0 if first_paint <= self.budget_ms else 1
+        return 0
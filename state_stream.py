@@ -0,0 +1,222 @@
+import json
+import math
+import os
+import selectors
+import socket
+import threading
+import time
+
+from countdown import TICK_SLACK, monotonic
+from paths import runtime_dir
+
+
+def default_socket_path():
+    return os.path.join(runtime_dir(), "state.sock")
+
+
+class Subscriber:
+    __slots__ = ("sock", "out", "pending", "writing")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.out = b""
+        # Only the newest line waits behind the one being written, so a slow
+        # reader holds at most two lines however far behind it falls.
+        self.pending = None
+        self.writing = False
+
+
+class StateStream:
+    """Publishes timer state as newline-delimited JSON to local subscribers.
+
+    publish() only swaps in a snapshot and wakes the fan-out thread, so the
+    GUI thread never waits on a subscriber. Between transitions the thread
+    emits a "tick" line each second from the stored deadline by itself.
+    """
+
+    def __init__(self, path=None, clock=monotonic):
+        self.path = path or default_socket_path()
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.state = None
+        self.seq = 0
+        self.subscribers = {}
+        self.selector = selectors.DefaultSelector()
+        self.wake_r, self.wake_w = socket.socketpair()
+        self.wake_r.setblocking(False)
+        self.wake_w.setblocking(False)
+        self.listener = None
+        self.thread = None
+        self.closed = False
+
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self.listener.listen(128)
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ, None)
+        self.selector.register(self.wake_r, selectors.EVENT_READ, None)
+        self.thread = threading.Thread(target=self.run, name="pomodora-state-stream", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.closed = True
+        self.wake()
+        if self.thread is not None:
+            self.thread.join()
+        for subscriber in list(self.subscribers.values()):
+            subscriber.sock.close()
+        self.subscribers.clear()
+        if self.listener is not None:
+            self.listener.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        self.wake_r.close()
+        self.wake_w.close()
+        self.selector.close()
+
+    def wake(self):
+        try:
+            self.wake_w.send(b"\0")
+        except BlockingIOError:
+            pass
+
+    def publish(self, event, mode, running, remaining, duration):
+        deadline = self.clock() + remaining if running else None
+        with self.lock:
+            self.seq += 1
+            self.state = (self.seq, event, mode, running, remaining, deadline, duration)
+        self.wake()
+
+    def on_engine_event(self, event, engine):
+        self.publish(event, engine.current_mode, engine.is_running,
+                     engine.countdown.time_remaining(), engine.duration())
+
+    def render(self, state, event=None):
+        seq, transition, mode, running, remaining, deadline, duration = state
+        if running:
+            remaining = max(0.0, deadline - self.clock())
+        return json.dumps({
+            "seq": seq,
+            "event": event or transition,
+            "mode": mode,
+            "running": running,
+            "time_left": int(math.ceil(remaining)),
+            "duration": duration,
+            "ends_at": round(time.time() + remaining, 3) if running else None,
+        }).encode() + b"\n"
+
+    def seconds_left(self, state):
+        if state[3]:
+            return int(math.ceil(max(0.0, state[5] - self.clock())))
+        return int(math.ceil(state[4]))
+
+    def next_tick(self, state):
+        # Aimed just past the moment the displayed whole second changes.
+        remaining = state[5] - self.clock()
+        if remaining <= 0:
+            return None
+        return ((remaining - math.floor(remaining)) or 1.0) + TICK_SLACK
+
+    def run(self):
+        sent_seq = 0
+        sent_left = None
+        while not self.closed:
+            with self.lock:
+                state = self.state
+            timeout = None
+            if state is not None and state[3] and self.subscribers:
+                timeout = self.next_tick(state)
+
+            joined = []
+            for key, mask in self.selector.select(timeout):
+                if key.fileobj is self.listener:
+                    joined.extend(self.accept())
+                elif key.fileobj is self.wake_r:
+                    try:
+                        while self.wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    self.service(key.data, mask)
+
+            with self.lock:
+                state = self.state
+            if state is None:
+                continue
+            seconds_left = self.seconds_left(state)
+            if state[0] != sent_seq:
+                line = self.render(state)
+            elif seconds_left != sent_left and self.subscribers:
+                line = self.render(state, "tick")
+            elif joined:
+                # Newcomers get the current state straight away rather than
+                # waiting for the next change.
+                line = self.render(state)
+                for subscriber in joined:
+                    subscriber.pending = line
+                    self.flush(subscriber)
+                continue
+            else:
+                continue
+            sent_seq, sent_left = state[0], seconds_left
+            for subscriber in list(self.subscribers.values()):
+                subscriber.pending = line
+                self.flush(subscriber)
+
+    def accept(self):
+        joined = []
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except BlockingIOError:
+                return joined
+            sock.setblocking(False)
+            subscriber = Subscriber(sock)
+            self.subscribers[sock.fileno()] = subscriber
+            self.selector.register(sock, selectors.EVENT_READ, subscriber)
+            joined.append(subscriber)
+
+    def service(self, subscriber, mask):
+        if mask & selectors.EVENT_READ:
+            # Subscribers have nothing to say; reading only detects hang-ups.
+            try:
+                if not subscriber.sock.recv(4096):
+                    self.drop(subscriber)
+                    return
+            except BlockingIOError:
+                pass
+            except OSError:
+                self.drop(subscriber)
+                return
+        if mask & selectors.EVENT_WRITE:
+            self.flush(subscriber)
+
+    def flush(self, subscriber):
+        while True:
+            if not subscriber.out:
+                if not subscriber.pending:
+                    break
+                subscriber.out, subscriber.pending = subscriber.pending, None
+            try:
+                sent = subscriber.sock.send(subscriber.out)
+            except BlockingIOError:
+                break
+            except OSError:
+                self.drop(subscriber)
+                return
+            subscriber.out = subscriber.out[sent:]
+        writing = bool(subscriber.out)
+        if writing != subscriber.writing:
+            subscriber.writing = writing
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if writing else 0)
+            self.selector.modify(subscriber.sock, events, subscriber)
+
+    def drop(self, subscriber):
+        self.selector.unregister(subscriber.sock)
+        del self.subscribers[subscriber.sock.fileno()]
+        subscriber.sock.close()
@@ -0,0 +1,137 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGridLayout,
+                             QGroupBox, QLabel, QPushButton, QWidget)
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QColor, QPainter
+
+from analytics import Analytics, WEEKDAYS, format_day, format_duration
+
+
+ACCENT = "#4CAF50"
+
+
+class DailyBars(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.days = []
+        self.values = []
+        self.setMinimumHeight(90)
+
+    def set_data(self, days, values):
+        self.days = days
+        self.values = values
+        self.update()
+
+    def paintEvent(self, event):
+        if not self.values:
+            return
+        painter = QPainter(self)
+        text_color = self.palette().color(self.foregroundRole())
+        peak = max(self.values) or 1
+        label_height = 16
+        slot = self.width() / len(self.values)
+        for i, (day, value) in enumerate(zip(self.days, self.values)):
+            height = (self.height() - label_height) * value / peak
+            bar = QRectF(i * slot + slot * 0.2, self.height() - label_height - height, slot * 0.6, height)
+            painter.fillRect(bar, QColor(ACCENT))
+            painter.setPen(text_color)
+            painter.drawText(QRectF(i * slot, self.height() - label_height, slot, label_height),
+                             Qt.AlignCenter, format_day(day)[:2])
+
+
+class HeatmapWidget(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.grid = None
+        self.setMinimumHeight(7 * 20)
+
+    def set_grid(self, grid):
+        self.grid = grid
+        self.update()
+
+    def paintEvent(self, event):
+        if self.grid is None:
+            return
+        painter = QPainter(self)
+        painter.setPen(self.palette().color(self.foregroundRole()))
+        label_width = self.fontMetrics().horizontalAdvance("Wed") + 8
+        cell_width = (self.width() - label_width) / 24
+        cell_height = self.height() / 7
+        peak = self.grid.max() or 1
+        for weekday, row in enumerate(self.grid):
+            top = weekday * cell_height
+            painter.drawText(QRectF(0, top, label_width, cell_height),
+                             Qt.AlignVCenter | Qt.AlignLeft, WEEKDAYS[weekday])
+            for hour, value in enumerate(row):
+                color = QColor(ACCENT)
+                color.setAlpha(int(25 + 230 * value / peak) if value else 12)
+                painter.fillRect(QRectF(label_width + hour * cell_width + 1, top + 1,
+                                        cell_width - 2, cell_height - 2), color)
+
+
+class StatsDialog(QDialog):
+    def __init__(self, parent=None, history_path=None, user=0):
+        super().__init__(parent)
+        self.setWindowTitle("Statistics - Pomodora")
+        self.setMinimumSize(400, 600)
+        self.setModal(True)
+        self.history_path = history_path
+        self.user = user
+
+        main_layout = QVBoxLayout(self)
+
+        summary_group = QGroupBox("Summary")
+        summary_layout = QGridLayout()
+        self.summary_labels = {}
+        rows = (("today", "Focus today:"), ("week", "Focus this week:"),
+                ("completion", "Completion ratio:"), ("streak", "Current streak:"),
+                ("longest", "Longest streak:"))
+        for row, (key, text) in enumerate(rows):
+            summary_layout.addWidget(QLabel(text), row, 0)
+            value = QLabel("-")
+            value.setAlignment(Qt.AlignRight)
+            summary_layout.addWidget(value, row, 1)
+            self.summary_labels[key] = value
+        summary_group.setLayout(summary_layout)
+        main_layout.addWidget(summary_group)
+
+        daily_group = QGroupBox("Last 7 Days")
+        daily_layout = QVBoxLayout()
+        self.daily_bars = DailyBars()
+        daily_layout.addWidget(self.daily_bars)
+        daily_group.setLayout(daily_layout)
+        main_layout.addWidget(daily_group)
+
+        heatmap_group = QGroupBox("Focus by Hour of Day")
+        heatmap_layout = QVBoxLayout()
+        self.heatmap = HeatmapWidget()
+        heatmap_layout.addWidget(self.heatmap)
+        heatmap_group.setLayout(heatmap_layout)
+        main_layout.addWidget(heatmap_group, 1)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        close_btn = QPushButton("Close")
+        close_btn.setMinimumWidth(80)
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(close_btn)
+
+        main_layout.addLayout(button_layout)
+
+    def refresh(self):
+        analytics = Analytics(self.history_path)
+        try:
+            summary = analytics.summary(self.user, days=28)
+        finally:
+            analytics.close()
+
+        focus = summary["daily_focus"]
+        self.summary_labels["today"].setText(format_duration(focus[-1]))
+        self.summary_labels["week"].setText(format_duration(summary["weekly_focus"][-1]))
+        self.summary_labels["completion"].setText(f"{summary['completion_ratio'] * 100:.0f}%")
+        self.summary_labels["streak"].setText(f"{summary['current_streak']} days")
+        self.summary_labels["longest"].setText(f"{summary['longest_streak']} days")
+
+        first_day = summary["first_day"] + len(focus) - 7
+        self.daily_bars.set_data(list(range(first_day, first_day + 7)), [int(v) for v in focus[-7:]])
+        self.heatmap.set_grid(summary["heatmap"])
@@ -0,0 +1,138 @@
+import random
+
+import pytest
+
+from checkpoint import RECORD, SLOTS, Checkpointer, decode, encode, read_checkpoint
+from countdown import VirtualClock
+from engine import MODES, TimerEngine
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("running", [False, True])
+def test_encode_decode_round_trip(mode, running):
+    record = encode(42, mode, running, 123.25, 1.7e9 if running else 0.0)
+    assert len(record) == RECORD.size
+    assert decode(record) == {
+        "seq": 42,
+        "mode": mode,
+        "running": running,
+        "remaining": 123.25,
+        "deadline": 1.7e9 if running else 0.0,
+    }
+
+
+def test_decode_rejects_damaged_records():
+    record = encode(7, "work", True, 60.0, 1000.0)
+    for offset in range(len(record)):
+        damaged = bytearray(record)
+        damaged[offset] ^= 0x01
+        assert decode(bytes(damaged)) is None
+    assert decode(record[:-1]) is None
+    assert decode(bytes(RECORD.size)) is None
+
+
+def test_latest_slot_wins_over_torn_write(tmp_path):
+    path = str(tmp_path / "session.ckpt")
+    checkpointer = Checkpointer(path, wall_clock=lambda: 1000.0)
+    checkpointer.save("work", True, 300.0)
+    checkpointer.save("short_break", False, 120.0)
+    assert read_checkpoint(path)["mode"] == "short_break"
+    checkpointer.close()
+
+    # Tear the newer slot; the older one is used instead.
+    with open(path, "r+b") as f:
+        f.seek(0)
+        f.write(b"\xff" * 8)
+    state = read_checkpoint(path)
+    assert (state["seq"], state["mode"], state["deadline"]) == (1, "work", 1300.0)
+
+
+def test_restore_into_engine(tmp_path):
+    path = str(tmp_path / "session.ckpt")
+    wall = [1000.0]
+    checkpointer = Checkpointer(path, wall_clock=lambda: wall[0])
+    engine = TimerEngine(clock=VirtualClock())
+    engine.add_listener(checkpointer.on_engine_event)
+    engine.change_mode("long_break")
+    engine.start()
+    checkpointer.close()
+
+    wall[0] += 60
+    restored = TimerEngine(clock=VirtualClock())
+    Checkpointer(path, wall_clock=lambda: wall[0]).restore(restored)
+    assert restored.current_mode == "long_break"
+    assert restored.is_running
+    assert restored.countdown.time_remaining() == 15 * 60 - 60
+
+
+def saved_states(path, count, seed):
+    rng = random.Random(seed)
+    checkpointer = Checkpointer(path, wall_clock=lambda: 1000.0)
+    states = []
+    for _ in range(count):
+        state = (rng.choice(MODES), rng.random() < 0.5, float(rng.randrange(1, 3600)))
+        checkpointer.save(*state)
+        states.append(state)
+    checkpointer.close()
+    return states
+
+
+def as_saved(state):
+    mode, running, remaining = state
+    return mode, running, remaining, 1000.0 + remaining if running else 0.0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_write_cut_short_at_any_byte(tmp_path, seed):
+    # A process killed mid-write leaves the newest slot holding a prefix of
+    # the new record over the old one. Whatever the cut, the reader gets
+    # either the new state or the last one fully written.
+    path = str(tmp_path / "session.ckpt")
+    states = saved_states(path, 5, seed)
+    with open(path, "rb") as f:
+        committed = f.read()
+    seq = len(states) + 1
+    new_state = ("long_break", True, 42.0)
+    record = encode(seq, *as_saved(new_state))
+    offset = (seq % SLOTS) * RECORD.size
+    for cut in range(RECORD.size + 1):
+        with open(path, "wb") as f:
+            f.write(committed[:offset] + record[:cut] + committed[offset + cut:])
+        state = read_checkpoint(path)
+        loaded = (state["mode"], state["running"], state["remaining"], state["deadline"])
+        if cut == RECORD.size:
+            assert (state["seq"], loaded) == (seq, as_saved(new_state))
+        else:
+            assert (state["seq"], loaded) == (seq - 1, as_saved(states[-1]))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_corrupt_newest_slot_falls_back(tmp_path, seed):
+    path = str(tmp_path / "session.ckpt")
+    states = saved_states(path, 4, seed)
+    newest = (len(states) % SLOTS) * RECORD.size
+    with open(path, "rb") as f:
+        data = f.read()
+    for offset in range(newest, newest + RECORD.size):
+        damaged = bytearray(data)
+        damaged[offset] ^= 0xFF
+        with open(path, "wb") as f:
+            f.write(damaged)
+        state = read_checkpoint(path)
+        assert state["seq"] == len(states) - 1
+        assert (state["mode"], state["running"], state["remaining"], state["deadline"]) == as_saved(states[-2])
+
+
+def test_both_slots_corrupt(tmp_path):
+    path = str(tmp_path / "session.ckpt")
+    saved_states(path, 2, 0)
+    with open(path, "rb") as f:
+        damaged = bytearray(f.read())
+    for slot in range(SLOTS):
+        damaged[slot * RECORD.size] ^= 0xFF
+    with open(path, "wb") as f:
+        f.write(damaged)
+    assert read_checkpoint(path) is None
+    engine = TimerEngine(clock=VirtualClock())
+    assert Checkpointer(path).restore(engine) is None
+    assert engine.current_mode == "work" and not engine.is_running
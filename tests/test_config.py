@@ -0,0 +1,52 @@
+import json
+import os
+
+from config import DEFAULTS, ConfigStore
+
+
+def test_clamps_and_validates_on_load(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"work_time_min": 0, "short_break_min": 500, "long_break_min": 20,
+                                "theme": "pink", "sound": "bell", "auto_break_type": "medium",
+                                "mute": "yes"}))
+    values = ConfigStore(str(path)).load()
+    assert values["work_time_min"] == 1
+    assert values["short_break_min"] == 30
+    assert values["long_break_min"] == 20
+    assert values["sound"] == "bell"
+    for key in ("theme", "auto_break_type", "mute"):
+        assert values[key] == DEFAULTS[key]
+
+
+def test_failed_write_keeps_the_writer_alive(tmp_path, capsys):
+    path = tmp_path / "missing" / "settings.json"
+    store = ConfigStore(str(path), delay=0.01)
+    store.update(theme="light")
+    store.flush()
+    assert store.writes == 0
+    assert "cannot write" in capsys.readouterr().err
+
+    os.mkdir(tmp_path / "missing")
+    store.update(theme="dark")
+    store.flush()
+    assert store.writes == 1
+    assert json.loads(path.read_text())["theme"] == "dark"
+    assert os.listdir(tmp_path / "missing") == ["settings.json"]
+
+
+def test_background_write_failure_is_reported(tmp_path, capsys):
+    # A directory in the way makes the final rename fail, even for root.
+    path = tmp_path / "settings.json"
+    path.mkdir()
+    store = ConfigStore(str(path), delay=0.01)
+    store.update(theme="light")
+    thread = store._thread
+    thread.join(timeout=0.5)
+    assert thread.is_alive()
+    assert "cannot write" in capsys.readouterr().err
+    assert os.listdir(tmp_path) == ["settings.json"]
+
+    path.rmdir()
+    store.update(theme="dark")
+    store.flush()
+    assert json.loads(path.read_text())["theme"] == "dark"
@@ -0,0 +1,89 @@
+import pytest
+
+from countdown import VirtualClock
+from engine import TimerEngine
+
+
+def make_engine(**options):
+    clock = VirtualClock()
+    engine = TimerEngine(clock=clock, work_time=100, short_break_time=20, long_break_time=50, **options)
+    events = []
+    engine.add_listener(lambda event, engine: events.append((event, engine.current_mode)))
+    return clock, engine, events
+
+
+def test_auto_start_chain_follows_deadlines():
+    clock, engine, events = make_engine(auto_start_break=True, auto_start_work=True)
+    engine.start()
+    # One late tick finishes both sessions that ended before it.
+    clock.advance(125)
+    assert engine.tick() == 2
+    assert engine.current_mode == "work"
+    assert engine.deadline == 220
+    assert [event for event, _ in events] == ["start", "finish", "mode", "start",
+                                              "finish", "mode", "start"]
+
+
+def test_chain_stops_without_auto_start():
+    clock, engine, events = make_engine(auto_start_break=True)
+    engine.start()
+    assert engine.run_until(1000) == 2
+    assert engine.current_mode == "short_break"
+    assert not engine.is_running
+    assert engine.time_left == 0
+
+
+def test_long_break_type():
+    clock, engine, _ = make_engine(auto_start_break=True, auto_break_type="long")
+    engine.start()
+    engine.run_until(100)
+    assert engine.current_mode == "long_break"
+    assert engine.deadline == 150
+
+
+@pytest.mark.parametrize("durations", [(0, 20, 50), (100, -1, 50), (100, 20, 0.0)])
+def test_non_positive_durations_rejected(durations):
+    with pytest.raises(ValueError):
+        TimerEngine(clock=VirtualClock(), work_time=durations[0], short_break_time=durations[1],
+                    long_break_time=durations[2])
+    _, engine, _ = make_engine()
+    with pytest.raises(ValueError):
+        engine.set_durations(*durations)
+    assert (engine.work_time, engine.short_break_time, engine.long_break_time) == (100, 20, 50)
+
+
+def test_restore_running_session():
+    clock, engine, events = make_engine()
+    clock.advance(10)
+    engine.restore("short_break", 15, True)
+    assert engine.current_mode == "short_break"
+    assert engine.deadline == 25
+    assert events == [("restore", "short_break")]
+
+
+def test_restore_paused_session():
+    clock, engine, _ = make_engine()
+    engine.restore("long_break", 30.5, False)
+    assert not engine.is_running
+    assert engine.countdown.time_remaining() == 30.5
+    engine.start()
+    assert engine.deadline == 30.5
+
+
+def test_restore_past_deadline_finishes_once():
+    clock, engine, events = make_engine(auto_start_break=True, auto_start_work=True)
+    clock.advance(1000)
+    engine.restore("work", -3 * 86400, True)
+    assert engine.tick() == 1
+    # The chain carries on from the restore, not from the old deadline.
+    assert engine.current_mode == "short_break"
+    assert engine.deadline == 1020
+    assert [event for event, _ in events].count("finish") == 1
+
+
+def test_restore_rejects_unknown_mode():
+    _, engine, _ = make_engine()
+    with pytest.raises(ValueError):
+        engine.restore("lunch", 10, False)
+
+
@@ -0,0 +1,41 @@
+import asyncio
+import json
+
+import pytest
+
+from group_hub import GroupHub
+
+
+async def exchange(hub, lines, replies):
+    server = await asyncio.start_server(hub.handle_member, "127.0.0.1", 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        await reader.readline()
+        for line in lines:
+            writer.write(line + b"\n")
+        received = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for _ in range(replies)]
+        writer.close()
+        return received
+
+
+@pytest.mark.parametrize("line", [b"[]", b"1", b"null", b"not json", b'{"t": "p"}',
+                                  b'{"t": "p", "c": "x"}', b'{"t": "c"}', b'{"t": "c", "op": "stop"}',
+                                  b'{"t": "c", "op": "mode", "m": "lunch"}'])
+def test_bad_lines_get_an_error_and_keep_the_connection(line):
+    hub = GroupHub(clock=lambda: 10.0)
+    hub.publish({"m": "work"})
+    commands = []
+    hub.on_command = lambda op, mode: commands.append((op, mode))
+    error, pong = asyncio.run(exchange(hub, [line, b'{"t": "p", "c": 1.5}'], 2))
+    assert error["t"] == "x"
+    assert pong == {"t": "p", "c": 1.5, "h": 10.0}
+    assert commands == []
+
+
+def test_valid_command_reaches_the_host():
+    hub = GroupHub()
+    hub.publish({"m": "work"})
+    commands = []
+    hub.on_command = lambda op, mode: commands.append((op, mode))
+    asyncio.run(exchange(hub, [b'{"t": "c", "op": "mode", "m": "long_break"}', b'{"t": "p", "c": 0}'], 1))
+    assert commands == [("mode", "long_break")]
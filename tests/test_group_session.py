@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt5.QtCore")
+
+from countdown import VirtualClock
+from engine import TimerEngine
+from group_hub import Finishes, snapshot
+from group_session import GroupSession
+
+
+class Window(QtCore.QObject):
+    def __init__(self, clock, **options):
+        super().__init__()
+        self.engine = TimerEngine(clock=clock, work_time=100, short_break_time=20, **options)
+        self.events = []
+        self.engine.add_listener(lambda event, engine: self.events.append((event, engine.current_mode)))
+
+
+def follower_state(host, finishes, clock):
+    # What GroupClient.local_state() hands over with no clock offset.
+    state = snapshot(host, finishes)
+    running = state["e"] is not None
+    return dict(state, running=running, deadline=state["e"] if running else None,
+                remaining=state["e"] - clock() if running else state["p"])
+
+
+def setup():
+    clock = VirtualClock()
+    host = TimerEngine(clock=clock, work_time=100, short_break_time=20, auto_start_break=True)
+    finishes = Finishes()
+    host.add_listener(finishes.on_engine_event)
+    window = Window(clock)
+    session = GroupSession(window)
+    session.window.engine.add_listener(session.on_local_event)
+    host.start()
+    session.follow(follower_state(host, finishes, clock))
+    return clock, host, finishes, window, session
+
+
+def finishes_seen(window):
+    return [mode for event, mode in window.events if event == "finish"]
+
+
+def test_finish_reaches_follower_whose_tick_did_not_fire():
+    clock, host, finishes, window, session = setup()
+    clock.advance(100)
+    host.tick()
+    # The host's state after the finish arrives before the local tick.
+    session.follow(follower_state(host, finishes, clock))
+    assert finishes_seen(window) == ["work"]
+    assert window.engine.current_mode == "short_break"
+    assert window.engine.is_running
+    window.engine.tick()
+    assert finishes_seen(window) == ["work"]
+
+
+def test_local_finish_is_not_repeated():
+    clock, host, finishes, window, session = setup()
+    clock.advance(100)
+    window.engine.tick()
+    host.tick()
+    session.follow(follower_state(host, finishes, clock))
+    assert finishes_seen(window) == ["work"]
+    assert window.engine.current_mode == "short_break"
+
+
+def test_joining_does_not_replay_old_finishes():
+    clock, host, finishes, window, session = setup()
+    clock.advance(100)
+    host.tick()
+    late = Window(clock)
+    GroupSession(late).follow(follower_state(host, finishes, clock))
+    assert finishes_seen(late) == []
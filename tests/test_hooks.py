@@ -0,0 +1,31 @@
+import sys
+
+import pytest
+
+import hooks
+from hooks import HookError, HookTimeout, shell_runner
+
+
+PAYLOAD = {"event": "finish", "mode": "work"}
+
+
+def test_shell_hook_gets_the_payload(tmp_path):
+    out = tmp_path / "out"
+    shell_runner(f'{sys.executable} -c "import sys; open(sys.argv[1], \'w\').write(sys.stdin.read())" {out}')(
+        PAYLOAD, 5.0)
+    assert '"event": "finish"' in out.read_text()
+
+
+def test_shell_hook_failure():
+    with pytest.raises(HookError):
+        shell_runner("exit 3")(PAYLOAD, 5.0)
+
+
+@pytest.mark.parametrize("process_groups", [True, False])
+def test_shell_hook_timeout(monkeypatch, process_groups):
+    if process_groups and not hooks.PROCESS_GROUPS:
+        pytest.skip("no process groups here")
+    # Without process groups, as on Windows, the command alone is killed.
+    monkeypatch.setattr(hooks, "PROCESS_GROUPS", process_groups)
+    with pytest.raises(HookTimeout):
+        shell_runner(f'{sys.executable} -c "import time; time.sleep(30)"')(PAYLOAD, 0.2)
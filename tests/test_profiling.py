@@ -0,0 +1,31 @@
+import json
+import os
+import socket
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt5.QtCore")
+
+from profiling import Profiler
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_busy_metrics_port_leaves_the_log(app, tmp_path, capsys):
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        profiler = Profiler(port=taken.getsockname()[1], path=str(tmp_path / "profile.log"))
+        profiler.start()
+        try:
+            assert profiler.port is None
+            assert profiler.server is None
+        finally:
+            profiler.stop()
+    assert "no metrics endpoint" in capsys.readouterr().err
+    with open(tmp_path / "profile.log") as f:
+        assert "histograms" in json.loads(f.readline())
@@ -0,0 +1,37 @@
+import asyncio
+import json
+
+import pytest
+
+from session_server import SessionServer
+
+
+async def exchange(server, lines):
+    listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+    async with listener:
+        reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+        replies = []
+        for line in lines:
+            writer.write(line + b"\n")
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.close()
+        return replies
+
+
+@pytest.mark.parametrize("line", [b"[]", b"1", b'"create"', b"null", b'{"op": "create", "id": "a", "options": []}',
+                                  b'{"op": "status", "id": "missing"}', b'{"op": "launch"}'])
+def test_bad_requests_get_an_error_and_keep_the_connection(line):
+    server = SessionServer()
+    error, listed = asyncio.run(exchange(server, [line, b'{"op": "list"}']))
+    assert error["ok"] is False
+    assert listed == {"ok": True, "sessions": []}
+
+
+def test_create_and_start():
+    server = SessionServer()
+    created, started = asyncio.run(exchange(server, [
+        b'{"op": "create", "id": "a", "options": {"work_time": 60}}',
+        b'{"op": "start", "id": "a"}',
+    ]))
+    assert created["ok"] and started["ok"]
+    assert started["session"]["running"]
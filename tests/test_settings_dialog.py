@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from planner import describe, summarize
+from pomodora import SettingsDialog
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_plan_preview_on_open(app):
+    dialog = SettingsDialog(None, "dark", False, 1, 1, 1)
+    assert dialog.plan_label.text() == describe(summarize(60, 60, 60))
+
+
+def test_plan_preview_follows_reload(app):
+    dialog = SettingsDialog(None, "dark", False, 25, 5, 15)
+    dialog.load_values("dark", False, 50, 10, 30, True, True, "long")
+    assert dialog.plan_label.text() == describe(summarize(50 * 60, 10 * 60, 30 * 60, True, True, "long"))
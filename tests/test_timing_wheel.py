@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from timing_wheel import SLOTS, TimingWheel
+
+
+RESOLUTION = 0.25
+
+
+def reference_expired(pending, now):
+    # Brute force: everything whose deadline rounds up to a tick at or
+    # before now's tick, the same contract the wheel keeps.
+    tick = int(now // RESOLUTION)
+    due = [entry for entry in pending if -(-entry[0] // RESOLUTION) <= tick]
+    for entry in due:
+        pending.remove(entry)
+    return due
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    wheel = TimingWheel(RESOLUTION, start=0.0, levels=3)
+    pending = []
+    now = 0.0
+    item = 0
+    for _ in range(400):
+        for _ in range(rng.randrange(4)):
+            # Mostly near deadlines, some past the top level's span, some
+            # already due.
+            horizon = rng.choice((2.0, 60.0, 3600.0, SLOTS ** 3 * RESOLUTION * 2))
+            deadline = now + rng.uniform(-1.0, horizon)
+            wheel.schedule(deadline, item)
+            pending.append((deadline, item))
+            item += 1
+        now += rng.choice((0.1, RESOLUTION, 3.0, 500.0))
+        expected = reference_expired(pending, now)
+        expired = wheel.advance(now)
+        assert sorted(expired) == sorted(expected)
+        assert all(deadline <= now for deadline, _ in expired)
+        assert len(wheel) == len(pending)
+
+
+def test_never_expires_early():
+    wheel = TimingWheel(1.0)
+    wheel.schedule(10.5, "a")
+    assert wheel.advance(10.0) == []
+    assert wheel.advance(11.0) == [(10.5, "a")]
+    assert len(wheel) == 0
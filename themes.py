@@ -0,0 +1,86 @@
+THEMES = {
+    "dark": {
+        "background": "#1e1e1e",
+        "text": "#ffffff",
+        "button": "#2d2d2d",
+        "button_border": "none",
+        "hover": "#3d3d3d",
+        "pressed": "#4d4d4d",
+        "checked": "#3d3d3d",
+        "checked_border": "#5d5d5d",
+    },
+    "light": {
+        "background": "#f5f5f5",
+        "text": "#333333",
+        "button": "#ffffff",
+        "button_border": "1px solid #ddd",
+        "hover": "#e8e8e8",
+        "pressed": "#d8d8d8",
+        "checked": "#e0e0e0",
+        "checked_border": "#ccc",
+    },
+}
+
+STYLESHEET_TEMPLATE = """
+    QWidget {{
+        background-color: {background};
+        color: {text};
+    }}
+    QPushButton {{
+        background-color: {button};
+        color: {text};
+        border: {button_border};
+        border-radius: 5px;
+        padding: 8px;
+    }}
+    QPushButton:hover {{
+        background-color: {hover};
+    }}
+    QPushButton:pressed {{
+        background-color: {pressed};
+    }}
+    QPushButton:checked {{
+        background-color: {checked};
+        border: 1px solid {checked_border};
+    }}
+    QPushButton#start_btn {{
+        background-color: #4CAF50;
+        color: white;
+        border: none;
+    }}
+    QPushButton#start_btn:hover {{
+        background-color: #45a049;
+    }}
+    QPushButton#start_btn[running="true"] {{
+        background-color: #f44336;
+    }}
+    QPushButton#start_btn[running="true"]:hover {{
+        background-color: #e53935;
+    }}
+"""
+
+_stylesheets = {}
+
+
+def colors(theme):
+    return THEMES.get(theme, THEMES["dark"])
+
+
+def stylesheet(theme):
+    sheet = _stylesheets.get(theme)
+    if sheet is None:
+        sheet = _stylesheets[theme] = STYLESHEET_TEMPLATE.format(**colors(theme))
+    return sheet
+
+
+def set_state(widget, name, value):
+    # Dynamic properties only take effect after a re-polish, and re-polishing
+    # just this widget leaves the rest of the tree alone.
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+    return True
@@ -0,0 +1,90 @@
+import math
+
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+
+
+class TimingWheel:
+    """Hierarchical timing wheel holding opaque (deadline, item) entries.
+
+    Level 0 has one slot per tick; each level above covers 64 slots of the
+    level below and is cascaded down as the wheel turns. Scheduling and
+    expiring are O(1) per entry. Entries cannot be removed: callers that
+    need cancellation compare the expired deadline with their own state and
+    drop stale entries.
+    """
+
+    def __init__(self, resolution=0.01, start=0.0, levels=5):
+        self.resolution = resolution
+        self.levels = levels
+        self.now_tick = self._to_tick(start)
+        self.wheels = [[[] for _ in range(SLOTS)] for _ in range(levels)]
+        self.span = 1 << (SLOT_BITS * levels)
+        self.count = 0
+        self.level0_count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _to_tick(self, when):
+        return int(math.floor(when / self.resolution))
+
+    def schedule(self, deadline, item):
+        # Round up so an entry never expires before its deadline.
+        tick = int(math.ceil(deadline / self.resolution))
+        self._insert(tick, (deadline, item))
+        self.count += 1
+
+    def _insert(self, tick, entry):
+        delta = tick - self.now_tick
+        if delta < SLOTS:
+            if delta < 0:
+                tick = self.now_tick
+            self.wheels[0][tick & SLOT_MASK].append(entry)
+            self.level0_count += 1
+            return
+        if delta >= self.span:
+            tick = self.now_tick + self.span - 1
+            delta = self.span - 1
+        level = 1
+        while delta >= 1 << (SLOT_BITS * (level + 1)):
+            level += 1
+        self.wheels[level][(tick >> (SLOT_BITS * level)) & SLOT_MASK].append(entry)
+
+    def _cascade(self):
+        for level in range(1, self.levels):
+            if self.now_tick & ((1 << (SLOT_BITS * level)) - 1):
+                break
+            slots = self.wheels[level]
+            index = (self.now_tick >> (SLOT_BITS * level)) & SLOT_MASK
+            bucket = slots[index]
+            if bucket:
+                slots[index] = []
+                for entry in bucket:
+                    self._insert(int(math.ceil(entry[0] / self.resolution)), entry)
+
+    def advance(self, now):
+        """Turn the wheel up to ``now`` and return the expired entries."""
+        target = self._to_tick(now)
+        expired = []
+        level0 = self.wheels[0]
+        while self.now_tick <= target:
+            index = self.now_tick & SLOT_MASK
+            bucket = level0[index]
+            if bucket:
+                level0[index] = []
+                self.level0_count -= len(bucket)
+                self.count -= len(bucket)
+                expired.extend(bucket)
+            if self.now_tick == target:
+                break
+            if self.level0_count == 0:
+                # Nothing can expire before the next cascade boundary.
+                self.now_tick = min(target, (self.now_tick | SLOT_MASK) + 1)
+            else:
+                self.now_tick += 1
+            if not self.now_tick & SLOT_MASK:
+                self._cascade()
+        return expired
@@ -0,0 +1,135 @@
+import math
+from collections import OrderedDict
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QIcon, QPainter, QPen, QPixmap
+
+from engine import MODE_LABELS
+from themes import colors
+
+
+MODE_COLORS = {
+    "work": "#f44336",
+    "short_break": "#4CAF50",
+    "long_break": "#2196F3",
+}
+
+ICON_SIZE = 32
+# The icon fills in steps of 1/PROGRESS_BUCKETS of the session, so it
+# changes every 37.5 seconds in a 25 minute session whatever the length.
+PROGRESS_BUCKETS = 40
+
+# Each cached icon is one ICON_SIZE x ICON_SIZE ARGB pixmap: 4 KiB at 32 px,
+# so a full cache of 128 holds 512 KiB. The three modes of one theme need
+# 3 * (PROGRESS_BUCKETS + 1) = 123 icons, so after the first cycle every
+# update is a cache hit; a theme switch ages the old set out.
+CACHE_CAPACITY = 128
+
+# Wake a little after a change is due so the icon shows the new value.
+CHANGE_SLACK = 0.05
+
+
+def progress_bucket(remaining, duration):
+    fraction = 1.0 - remaining / duration if duration else 0.0
+    return max(0, min(PROGRESS_BUCKETS, int(fraction * PROGRESS_BUCKETS)))
+
+
+def icon_key(theme, mode, remaining, duration):
+    return theme, mode, progress_bucket(remaining, duration)
+
+
+def minutes_left(remaining):
+    return max(0, math.ceil(remaining / 60))
+
+
+def tooltip(mode, remaining):
+    return f"{MODE_LABELS[mode].title()}: {minutes_left(remaining)} min left"
+
+
+def seconds_until_change(remaining, duration):
+    if remaining <= 0 or not duration:
+        return None
+    bucket = progress_bucket(remaining, duration)
+    until = remaining - duration * (1.0 - (bucket + 1) / PROGRESS_BUCKETS)
+    # The tooltip's minute count drops at every whole minute left.
+    until = min(until, remaining - (minutes_left(remaining) - 1) * 60)
+    return max(0.0, until) + CHANGE_SLACK
+
+
+def render_icon(theme, mode, bucket, size=ICON_SIZE):
+    palette = colors(theme)
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+
+    # A disc in the theme's background, its elapsed part filled like a pie
+    # in the mode's colour, inside a ring that keeps it visible on any panel.
+    ring = size / 12
+    rect = QRectF(ring / 2, ring / 2, size - ring, size - ring)
+    painter.setPen(QPen(QColor(palette["text"]), ring))
+    painter.setBrush(QColor(palette["background"]))
+    painter.drawEllipse(rect)
+    if bucket:
+        inner = rect.adjusted(ring, ring, -ring, -ring)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(MODE_COLORS.get(mode, MODE_COLORS["work"])))
+        painter.drawPie(inner, 90 * 16, -int(bucket * 360 * 16 / PROGRESS_BUCKETS))
+    painter.end()
+    return QIcon(pixmap)
+
+
+class TrayIconCache:
+    def __init__(self, capacity=CACHE_CAPACITY, size=ICON_SIZE):
+        self.capacity = capacity
+        self.size = size
+        self.icons = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.icons)
+
+    def memory_bytes(self):
+        return len(self.icons) * self.size * self.size * 4
+
+    def get(self, key):
+        icon = self.icons.get(key)
+        if icon is not None:
+            self.hits += 1
+            self.icons.move_to_end(key)
+            return icon
+        self.misses += 1
+        icon = self.icons[key] = render_icon(*key, size=self.size)
+        if len(self.icons) > self.capacity:
+            self.icons.popitem(last=False)
+            self.evictions += 1
+        return icon
+
+
+class TrayCountdown:
+    def __init__(self, tray_icon, cache=None):
+        self.tray_icon = tray_icon
+        self.cache = cache if cache is not None else TrayIconCache()
+        self.key = None
+        self.tip = None
+        self.updates = 0
+
+    def update(self, theme, mode, remaining, duration):
+        # The minutes go in the tooltip rather than the icon key, so the
+        # cache still holds one icon per progress step.
+        tip = tooltip(mode, remaining)
+        if tip != self.tip:
+            self.tip = tip
+            self.tray_icon.setToolTip(tip)
+        key = icon_key(theme, mode, remaining, duration)
+        if key == self.key:
+            return False
+        self.key = key
+        self.tray_icon.setIcon(self.cache.get(key))
+        self.updates += 1
+        return True
+
+    def next_change(self, remaining, duration):
+        return seconds_until_change(remaining, duration)